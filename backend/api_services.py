@@ -1,12 +1,28 @@
+import asyncio
+import json
 import logging
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
 from fastapi import APIRouter, HTTPException, status, Query
-# from config import settings # Ensure this file exists, otherwise comment out
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from config import settings
 from literature.service import LiteratureService
 from ideas.service import IdeaService
+from ideas.fallback import fallback_ideas
 from quality_filter.relevance_filter import quality_filter
+from util.concurrency import run_blocking
+from util.deadline import Deadline, deadline_scope
+from util.cache import get_cache
+from util.http_client import get_http_client
+from util.llm_cache import get_llm_cache
+from util.llm_factory import llm_registry_stats
+from util.openalex_works import SharedWorksQuery
+from util.rate_limit import get_scheduler
 
 # --- IMPORT VENUE DISCOVERY SERVICE ---
 from venue_discovery.service import discover_venues
+from venue_discovery.mock_data import get_mock_venues
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -35,6 +51,397 @@ from test_run import generate_summary
 literature_service = LiteratureService()
 idea_service = IdeaService()
 
+
+async def _timed(phase: str, awaitable: Awaitable[Any], timings: Dict[str, float]) -> Any:
+    """Await `awaitable` and record its wall-clock duration (ms) under `phase`."""
+    start = time.perf_counter()
+    try:
+        return await awaitable
+    finally:
+        timings[phase] = round((time.perf_counter() - start) * 1000, 1)
+
+
+async def _within_budget(
+    phase: str,
+    deadline: Deadline,
+    timings: Dict[str, float],
+    func,
+    *args: Any,
+    min_remaining_s: float = 0.0,
+    timeout_s: Optional[float] = None,
+    **kwargs: Any,
+) -> Any:
+    """Run a blocking phase call on the executor, bounded by the request's remaining budget.
+
+    The deadline is made current for the call, so the worker thread (and every
+    outbound HTTP timeout inside it) sees it. Raises TimeoutError if less than
+    `min_remaining_s` is left before the call starts, or if the budget (or the
+    per-call `timeout_s`, when given) runs out while it is in flight.
+    """
+    remaining = deadline.remaining()
+    if remaining <= min_remaining_s:
+        raise TimeoutError(f"{phase}: only {remaining:.2f}s of budget left")
+    timeout = remaining if timeout_s is None else min(timeout_s, remaining)
+    with deadline_scope(deadline):
+        return await asyncio.wait_for(_timed(phase, run_blocking(func, *args, **kwargs), timings), timeout=timeout)
+
+
+def _truncate(text: str, max_chars: int = 400) -> str:
+    """Truncate to `max_chars` on a word boundary (used for paper summaries)."""
+    if not text:
+        return ""
+    s = str(text).strip()
+    if len(s) <= max_chars:
+        return s
+    t = s[: max_chars - 3]
+    if " " in t:
+        t = t.rsplit(" ", 1)[0]
+    return t + "..."
+
+
+def _papers_text(papers: List[Any]) -> str:
+    # Build papers_text with single newlines between papers
+    papers_lines = []
+    for idx, p in enumerate(papers, start=1):
+        if not isinstance(p, dict):
+            title = str(p)
+            summary = ""
+            source = "OpenAlex"
+            year = ""
+        else:
+            title = p.get("title") or p.get("paper_title") or "Untitled"
+            summary = p.get("summary") or p.get("abstract") or ""
+            source = p.get("source") or p.get("venue") or p.get("journal") or p.get("conference") or "OpenAlex"
+            year = str(p.get("year") or p.get("pub_year") or "")
+
+        papers_lines.append(f"{idx}) Title: {title}")
+        papers_lines.append(f"   Summary: {_truncate(summary, max_chars=400)}")
+        papers_lines.append(f"   Source: {source} | Year: {year}")
+
+    return "\n".join(papers_lines) if papers_lines else "No papers found."
+
+
+def _papers_struct(papers: List[Any]) -> List[Dict[str, Any]]:
+    # Build structured papers list for JSON output (ensure required fields)
+    papers_struct = []
+    for p in papers:
+        if not isinstance(p, dict):
+            papers_struct.append({
+                "title": str(p),
+                "summary": "",
+                "year": "",
+                "source": "OpenAlex",
+                "cited_by_count": 0,
+            })
+        else:
+            # Ensure cited_by_count is an integer (OpenAlex uses 'cited_by_count')
+            cited_raw = p.get("cited_by_count") if p.get("cited_by_count") is not None else p.get("cited_by")
+            try:
+                cited_val = int(cited_raw or 0)
+            except Exception:
+                cited_val = 0
+            papers_struct.append({
+                "title": p.get("title") or p.get("paper_title") or "Untitled",
+                "summary": p.get("summary") or p.get("abstract") or "",
+                "year": p.get("year") or p.get("pub_year") or "",
+                "source": p.get("source") or p.get("venue") or p.get("journal") or p.get("conference") or "OpenAlex",
+                "cited_by_count": cited_val,
+            })
+    return papers_struct
+
+
+def _resolve_venues(result: Any, domain: str, degraded: Dict[str, bool]) -> Tuple[List[str], List[str]]:
+    """(conferences, journals) from the venue phase result, substituting fallbacks on failure."""
+    if isinstance(result, TimeoutError):
+        logger.warning("Venue discovery ran out of budget; using mock venues")
+        degraded["venues"] = True
+        result = get_mock_venues(domain)
+    elif isinstance(result, BaseException):
+        logger.error("Venue discovery failed; continuing with empty venues", exc_info=result)
+        degraded["venues"] = True
+        result = {"conferences": [], "journals": []}
+
+    return result.get("conferences", []) or [], result.get("journals", []) or []
+
+
+def _resolve_papers(result: Any, degraded: Dict[str, bool]) -> List[Any]:
+    """Top 5 papers from the literature phase result, substituting fallbacks on failure."""
+    if isinstance(result, BaseException):
+        logger.error("Literature retrieval failed or ran out of budget; using fallback", exc_info=result)
+        degraded["papers"] = True
+        try:
+            result = literature_service.fetch("", limit=5)
+        except Exception:
+            result = []
+
+    if not isinstance(result, list):
+        result = []
+    return result[:5]
+
+
+async def _generate_ideas(
+    domain: str,
+    venues: List[str],
+    papers: List[Any],
+    request: GenerateRequest,
+    deadline: Deadline,
+    timings: Dict[str, float],
+    degraded: Dict[str, bool],
+    on_token: Optional[Callable[[str], None]] = None,
+) -> List[str]:
+    """Phase 5: idea generation, falling back to canned ideas when out of budget."""
+    try:
+        return await _within_budget(
+            "ideas", deadline, timings,
+            idea_service.generate, domain=domain, venues=venues, papers=papers,
+            use_cache=request.use_llm_cache, on_token=on_token,
+            min_remaining_s=settings.GENERATE_MIN_LLM_BUDGET_S,
+            timeout_s=settings.GENERATE_IDEAS_TIMEOUT_S,
+        ) or []
+    except TimeoutError:
+        logger.warning("Idea generation ran out of budget; using fallback ideas")
+        degraded["ideas"] = True
+        return fallback_ideas(domain)
+    except Exception:
+        logger.exception("Idea generation failed; using fallback")
+        degraded["ideas"] = True
+        try:
+            return await _within_budget("ideas_retry", deadline, timings, idea_service.generate, domain=domain, venues=[], papers=[], use_cache=request.use_llm_cache) or []
+        except TimeoutError:
+            return fallback_ideas(domain)
+        except Exception:
+            return []
+
+
+async def _generate_overview(
+    domain: str,
+    request: GenerateRequest,
+    deadline: Deadline,
+    timings: Dict[str, float],
+    degraded: Dict[str, bool],
+) -> str:
+    """Phase 6: overview (single, short sentence under 30 words requested of the LLM)."""
+    overview_prompt = f"Write a single, short sentence under 30 words summarizing the domain, discovered venues, and example papers for '{domain}'."
+    try:
+        ov = await _within_budget(
+            "overview", deadline, timings,
+            generate_summary, text=overview_prompt, local_llm=getattr(request, "local_llm", False), provider=getattr(request, "provider", "unknown"),
+            use_cache=request.use_llm_cache,
+            min_remaining_s=settings.GENERATE_MIN_LLM_BUDGET_S,
+            timeout_s=settings.GENERATE_OVERVIEW_TIMEOUT_S,
+        )
+        if isinstance(ov, dict):
+            overview_text = ov.get("answer") or ov.get("summary") or ov.get("text") or ""
+        elif isinstance(ov, str):
+            overview_text = ov
+        else:
+            overview_text = str(ov)
+    except TimeoutError:
+        logger.warning("Overview generation ran out of budget; leaving it empty")
+        degraded["overview"] = True
+        overview_text = ""
+    except Exception:
+        logger.exception("Overview generation failed")
+        degraded["overview"] = True
+        overview_text = ""
+
+    # Do not truncate the overview; rely on LLM prompt to keep it short
+    return overview_text.strip()
+
+
+async def _generate_combined(
+    domain: str,
+    venues: List[str],
+    papers: List[Any],
+    request: GenerateRequest,
+    deadline: Deadline,
+    timings: Dict[str, float],
+    degraded: Dict[str, bool],
+    on_token: Optional[Callable[[str], None]] = None,
+) -> Tuple[List[str], str]:
+    """Phases 5 + 6 in one LLM call (llm_mode="combined"); returns (ideas, overview)."""
+    try:
+        ideas, overview = await _within_budget(
+            "ideas_overview", deadline, timings,
+            idea_service.generate_combined, domain=domain, venues=venues, papers=papers,
+            use_cache=request.use_llm_cache, on_token=on_token,
+            local_llm=getattr(request, "local_llm", False), provider=getattr(request, "provider", None),
+            min_remaining_s=settings.GENERATE_MIN_LLM_BUDGET_S,
+            timeout_s=max(settings.GENERATE_IDEAS_TIMEOUT_S, settings.GENERATE_OVERVIEW_TIMEOUT_S),
+        )
+    except TimeoutError:
+        logger.warning("Combined idea/overview generation ran out of budget; using fallbacks")
+        degraded["ideas"] = degraded["overview"] = True
+        return fallback_ideas(domain), ""
+    except Exception:
+        logger.exception("Combined idea/overview generation failed; using fallbacks")
+        degraded["ideas"] = degraded["overview"] = True
+        return fallback_ideas(domain), ""
+
+    if not overview:
+        degraded["overview"] = True
+    return ideas or [], overview
+
+
+async def _generate_events(request: GenerateRequest, stream_tokens: bool = False) -> AsyncIterator[Tuple[str, Any]]:
+    """
+    Run the /generate pipeline, yielding (event, data) as each phase completes.
+
+    Events: `domain`; `venues` and `papers` in whichever order they finish;
+    `ideas_token` chunks (only with `stream_tokens` and an LLM wrapper that
+    supports streaming); `ideas` and `overview`, again in completion order; and
+    finally `done`, whose data is the complete GenerateResponse.
+    """
+    deadline = Deadline(request.budget_s or settings.GENERATE_BUDGET_S)
+    logger.info("Generating content for question: %s", request.question)
+
+    # Phase 2: normalize input
+    domain_raw = (request.question or "").strip()
+    domain = domain_raw.lower()
+
+    timings: Dict[str, float] = {}
+    degraded = {"venues": False, "papers": False, "ideas": False, "overview": False}
+    pipeline_start = time.perf_counter()
+    yield "domain", {"domain": domain}
+
+    # Phase 3 + Phase 4: venues and papers depend only on the normalized
+    # domain, so fetch them concurrently and emit each as soon as it lands.
+    # Both read the same OpenAlex /works response (one round-trip per request).
+    works = SharedWorksQuery(domain)
+    pending = {
+        asyncio.ensure_future(_within_budget("venues", deadline, timings, discover_venues, domain, works=works)): "venues",
+        asyncio.ensure_future(_within_budget("papers", deadline, timings, literature_service.fetch, domain, limit=5, works=works)): "papers",
+    }
+    conferences: List[str] = []
+    journals: List[str] = []
+    papers: List[Any] = []
+    try:
+        while pending:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                phase = pending.pop(task)
+                try:
+                    result = task.result()
+                except Exception as e:
+                    result = e
+                if phase == "venues":
+                    conferences, journals = _resolve_venues(result, domain, degraded)
+                    yield "venues", {"conferences": conferences[:5], "journals": journals[:5]}
+                else:
+                    papers = _resolve_papers(result, degraded)
+                    yield "papers", {"papers": _papers_struct(papers)}
+    finally:
+        for task in pending:
+            task.cancel()
+
+    # Phase 5 + Phase 6: ideas and the overview are independent LLM calls, so
+    # run them concurrently (LLM time is max(ideas, overview), not the sum).
+    # Each has its own timeout and fallback; one failing never cancels the
+    # other. Idea tokens are relayed from the worker thread as they arrive.
+    on_token = None
+    tokens: Optional["asyncio.Queue[str]"] = None
+    if stream_tokens:
+        loop = asyncio.get_running_loop()
+        tokens = asyncio.Queue()
+        on_token = lambda text: loop.call_soon_threadsafe(tokens.put_nowait, text)
+
+    venues = list(dict.fromkeys(conferences + journals))
+    if request.llm_mode == "combined":
+        # One JSON-structured LLM call answers both phases
+        llm_pending = {
+            asyncio.ensure_future(_generate_combined(
+                domain, venues, papers, request, deadline, timings, degraded, on_token=on_token,
+            )): "combined",
+        }
+    else:
+        llm_pending = {
+            asyncio.ensure_future(_generate_ideas(
+                domain, venues, papers, request, deadline, timings, degraded, on_token=on_token,
+            )): "ideas",
+            asyncio.ensure_future(_generate_overview(domain, request, deadline, timings, degraded)): "overview",
+        }
+    ideas_list: List[str] = []
+    overview_text = ""
+    getter: Optional["asyncio.Future[str]"] = None
+    try:
+        while llm_pending:
+            waiters = set(llm_pending)
+            if tokens is not None:
+                getter = getter or asyncio.ensure_future(tokens.get())
+                waiters.add(getter)
+            done, _ = await asyncio.wait(waiters, return_when=asyncio.FIRST_COMPLETED)
+            if getter is not None and getter in done:
+                yield "ideas_token", {"text": getter.result()}
+                getter = None
+                continue
+            for task in done:
+                phase = llm_pending.pop(task)
+                if phase == "overview":
+                    overview_text = task.result()
+                    yield "overview", {"overview": overview_text}
+                    continue
+
+                # Tokens scheduled just before the worker finished
+                while tokens is not None and not tokens.empty():
+                    yield "ideas_token", {"text": tokens.get_nowait()}
+                if phase == "combined":
+                    ideas, overview_text = task.result()
+                else:
+                    ideas = task.result()
+                # Ensure exactly 5 ideas and format as numbered list '1. Idea'
+                ideas_list = (ideas or [])[:5]
+                while len(ideas_list) < 5:
+                    ideas_list.append("(no idea generated)")
+                yield "ideas", {"ideas": ideas_list}
+                if phase == "combined":
+                    yield "overview", {"overview": overview_text}
+    finally:
+        if getter is not None:
+            getter.cancel()
+        for task in llm_pending:
+            task.cancel()
+
+    timings["total"] = round((time.perf_counter() - pipeline_start) * 1000, 1)
+    logger.info("Phase timings (ms) for '%s': %s", domain, timings)
+
+    # Assembly: exact template requested
+    conf_str = ", ".join(conferences[:5]) if conferences else "None"
+    jour_str = ", ".join(journals[:5]) if journals else "None"
+    ideas_text = "\n".join(f"{i}. {' '.join(str(ideas_list[i-1]).split())}" for i in range(1, 6))
+    answer = (
+        f"Input Domain: {domain}\n\n"
+        f"Discovered Venues:\n"
+        f"Conferences: {conf_str}\n"
+        f"Journals: {jour_str}\n\n"
+        f"Example Papers:\n"
+        f"{_papers_text(papers)}\n\n"
+        f"Research Ideas:\n"
+        f"{ideas_text}\n\n"
+        f"Overview:\n"
+        f"{overview_text}"
+    )
+
+    structured = {
+        "domain": domain,
+        "overview": overview_text,
+        "venues": {"conferences": conferences[:5], "journals": journals[:5]},
+        "papers": _papers_struct(papers),
+        "ideas": ideas_list[:5],
+        "timings_ms": timings,
+        "budget_s": deadline.budget_s,
+        "degraded": degraded,
+        "llm_mode": request.llm_mode,
+    }
+
+    yield "done", GenerateResponse(
+        originalQuestion=request.question,
+        providerUsed=str(getattr(request, "provider", "unknown")),
+        usedLocalLLM=bool(getattr(request, "local_llm", False)),
+        answer=answer,
+        structured_data=structured,
+    )
+
+
 @api_router.post(
     "/generate",
     response_model=GenerateResponse,
@@ -51,167 +458,27 @@ async def generate_content(request: GenerateRequest) -> GenerateResponse:
     Pipeline steps implemented here:
       - Phase 2: Input normalization (lightweight normalization)
       - Phase 3: Venue discovery (discover_venues)
-      - Phase 4: Literature retrieval (literature_service.fetch)
-      - Phase 5: Idea generation (idea_service.generate)
+      - Phase 4: Literature retrieval (literature_service.fetch), run concurrently with Phase 3
+      - Phase 5: Idea generation (idea_service.generate), run concurrently with the overview LLM call
       - Phase 6: Assemble a structured `answer` string for frontend rendering
-    """
-    try:
-        logger.info("Generating content for question: %s", request.question)
-
-        # Phase 2: normalize input
-        domain_raw = (request.question or "").strip()
-        domain = domain_raw.lower()
 
-        # Phase 3: discover venues
-        try:
-            venues_data = discover_venues(domain)
-        except Exception:
-            logger.exception("Venue discovery failed; continuing with empty venues")
-            venues_data = {"conferences": [], "journals": []}
-
-        conferences = venues_data.get("conferences", []) or []
-        journals = venues_data.get("journals", []) or []
-        # Format conf_str and jour_str: comma-joined or 'None'
-        conf_str = ", ".join(conferences[:5]) if conferences else "None"
-        jour_str = ", ".join(journals[:5]) if journals else "None"
-
-        # Phase 4: literature (fetch 5)
-        try:
-            papers = literature_service.fetch(domain, limit=5)
-        except Exception:
-            logger.exception("Literature retrieval failed; using fallback")
-            try:
-                papers = literature_service.fetch("", limit=5)
-            except Exception:
-                papers = []
-
-        if not isinstance(papers, list):
-            papers = []
-        papers = papers[:5]
-
-        # Helper: truncate to 400 chars for paper summaries
-        def truncate(text: str, max_chars: int = 400) -> str:
-            if not text:
-                return ""
-            s = str(text).strip()
-            if len(s) <= max_chars:
-                return s
-            t = s[: max_chars - 3]
-            if " " in t:
-                t = t.rsplit(" ", 1)[0]
-            return t + "..."
-
-        # Build papers_text with single newlines between papers
-        papers_lines = []
-        for idx, p in enumerate(papers, start=1):
-            if not isinstance(p, dict):
-                title = str(p)
-                summary = ""
-                source = "OpenAlex"
-                year = ""
-            else:
-                title = p.get("title") or p.get("paper_title") or "Untitled"
-                summary = p.get("summary") or p.get("abstract") or ""
-                source = p.get("source") or p.get("venue") or p.get("journal") or p.get("conference") or "OpenAlex"
-                year = str(p.get("year") or p.get("pub_year") or "")
-
-            papers_lines.append(f"{idx}) Title: {title}")
-            papers_lines.append(f"   Summary: {truncate(summary, max_chars=400)}")
-            papers_lines.append(f"   Source: {source} | Year: {year}")
-
-        papers_text = "\n".join(papers_lines) if papers_lines else "No papers found."
-
-    # Phase 5: idea generation
-        try:
-            ideas = idea_service.generate(domain=domain, venues=list(dict.fromkeys(conferences + journals)), papers=papers) or []
-        except Exception:
-            logger.exception("Idea generation failed; using fallback")
-            try:
-                ideas = idea_service.generate(domain=domain, venues=[], papers=[]) or []
-            except Exception:
-                ideas = []
-
-        # Ensure exactly 5 ideas and format as numbered list '1. Idea'
-        ideas_list = (ideas or [])[:5]
-        while len(ideas_list) < 5:
-            ideas_list.append("(no idea generated)")
-        ideas_lines = [f"{i}. {' '.join(str(ideas_list[i-1]).split())}" for i in range(1, 6)]
-        ideas_text = "\n".join(ideas_lines)
-
-        # Phase 6: overview (single, short sentence under 30 words requested of the LLM)
-        overview_prompt = f"Write a single, short sentence under 30 words summarizing the domain, discovered venues, and example papers for '{domain}'."
-        overview_text = ""
-        try:
-            ov = generate_summary(text=overview_prompt, local_llm=getattr(request, "local_llm", False), provider=getattr(request, "provider", "unknown"))
-            if isinstance(ov, dict):
-                overview_text = ov.get("answer") or ov.get("summary") or ov.get("text") or ""
-            elif isinstance(ov, str):
-                overview_text = ov
-            else:
-                overview_text = str(ov)
-        except Exception:
-            logger.exception("Overview generation failed")
-            overview_text = ""
-
-        # Do not truncate the overview; rely on LLM prompt to keep it short
-        overview_text = overview_text.strip()
-
-        # Assembly: exact template requested
-        # Build structured papers list for JSON output (ensure required fields)
-        papers_struct = []
-        for p in papers:
-            if not isinstance(p, dict):
-                papers_struct.append({
-                    "title": str(p),
-                    "summary": "",
-                    "year": "",
-                    "source": "OpenAlex",
-                    "cited_by_count": 0,
-                })
-            else:
-                # Ensure cited_by_count is an integer (OpenAlex uses 'cited_by_count')
-                cited_raw = p.get("cited_by_count") if p.get("cited_by_count") is not None else p.get("cited_by")
-                try:
-                    cited_val = int(cited_raw or 0)
-                except Exception:
-                    cited_val = 0
-                papers_struct.append({
-                    "title": p.get("title") or p.get("paper_title") or "Untitled",
-                    "summary": p.get("summary") or p.get("abstract") or "",
-                    "year": p.get("year") or p.get("pub_year") or "",
-                    "source": p.get("source") or p.get("venue") or p.get("journal") or p.get("conference") or "OpenAlex",
-                    "cited_by_count": cited_val,
-                })
-
-        answer = (
-            f"Input Domain: {domain}\n\n"
-            f"Discovered Venues:\n"
-            f"Conferences: {conf_str}\n"
-            f"Journals: {jour_str}\n\n"
-            f"Example Papers:\n"
-            f"{papers_text}\n\n"
-            f"Research Ideas:\n"
-            f"{ideas_text}\n\n"
-            f"Overview:\n"
-            f"{overview_text}"
-        )
+    Every phase does blocking HTTP or LLM I/O, so each one is offloaded to the
+    bounded pipeline executor (util.concurrency.run_blocking) to keep the event
+    loop free for other in-flight requests.
 
-        structured = {
-            "domain": domain,
-            "overview": overview_text,
-            "venues": {"conferences": conferences[:5], "journals": journals[:5]},
-            "papers": papers_struct,
-            "ideas": ideas_list[:5],
-        }
-
-        response = GenerateResponse(
-            originalQuestion=request.question,
-            providerUsed=str(getattr(request, "provider", "unknown")),
-            usedLocalLLM=bool(getattr(request, "local_llm", False)),
-            answer=answer,
-            structured_data=structured,
-        )
+    The whole pipeline runs under a latency budget (`request.budget_s`, default
+    settings.GENERATE_BUDGET_S) that also caps every outbound HTTP timeout. A phase
+    that cannot finish in time is replaced by its fallback (mock venues/papers,
+    fallback ideas, empty overview) and flagged in `structured_data.degraded`.
 
+    POST /generate/stream runs the same pipeline and emits each phase as a
+    Server-Sent Event.
+    """
+    try:
+        response = None
+        async for event, data in _generate_events(request):
+            if event == "done":
+                response = data
         return response
 
     except HTTPException:
@@ -223,6 +490,42 @@ async def generate_content(request: GenerateRequest) -> GenerateResponse:
             detail=f"Error generating content: {str(e)}",
         )
 
+
+def _sse(event: str, data: Any) -> str:
+    """Format one Server-Sent Event with a JSON payload."""
+    return f"event: {event}\ndata: {json.dumps(jsonable_encoder(data))}\n\n"
+
+
+@api_router.post(
+    "/generate/stream",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"text/event-stream": {}}, "description": "Pipeline phases as Server-Sent Events"}},
+)
+async def generate_content_stream(request: GenerateRequest) -> StreamingResponse:
+    """
+    Streaming variant of /generate: POST {settings.API_V1_STR}/generate/stream
+
+    Emits `domain`, `venues`, `papers`, `ideas_token` (LLM output as it is
+    generated, when the wrapper supports streaming), `ideas` and `overview`
+    events as each phase completes, then `done` carrying the same payload as
+    /generate (including `structured_data`). Failures end the stream with an
+    `error` event.
+    """
+    async def events() -> AsyncIterator[str]:
+        try:
+            async for event, data in _generate_events(request, stream_tokens=True):
+                yield _sse(event, data)
+        except Exception as e:
+            logger.exception("Error streaming content")
+            yield _sse("error", {"detail": f"Error generating content: {str(e)}"})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        # Disable proxy buffering so events reach the client as they are sent
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
 def llm_call(prompt: str) -> str:
     return """
 1. Stability Analysis of Hybrid Dynamical Systems
@@ -230,6 +533,22 @@ def llm_call(prompt: str) -> str:
 3. Learning-Based Reduced Order Models for PDEs
 """
 
+@api_router.get("/diagnostics", tags=["LS API Services"])
+def diagnostics():
+    """
+    Runtime counters for tuning: outbound HTTP connection reuse per host,
+    provider response cache hit/miss/eviction counts, rate-limiter queues and
+    LLM result cache savings (time and tokens) and pooled LLM clients.
+    """
+    return {
+        "http": get_http_client().stats(),
+        "cache": get_cache().stats(),
+        "rate_limits": get_scheduler().stats(),
+        "llm_cache": get_llm_cache().stats(),
+        "llm_clients": llm_registry_stats(),
+    }
+
+
 print("registering /literature route")
 @api_router.get("/literature", tags=["LS API Services"])
 def literature_retrieval(
@@ -6,6 +6,10 @@ file = Path(__file__).resolve()
 parent, root = file.parent, file.parents[1]
 sys.path.append(str(root))
 
+# Time the rest of the boot (per-module breakdown with LS_IMPORT_PROFILE=1)
+from util import import_profile
+import_profile.start()
+
 from typing import Any
 from fastapi import APIRouter, FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
@@ -16,6 +20,9 @@ import logging
 # be shown and the process will exit so the root cause is visible (no silent fallback).
 from api_services import api_router
 from config import settings
+from util.concurrency import shutdown_executor
+
+import_profile.stop()
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
@@ -87,6 +94,15 @@ async def _log_registered_routes():
         # Avoid failing startup just for logging
         pass
 
+@app.on_event("startup")
+async def _log_import_profile():
+    logger.info(import_profile.format_report(import_profile.report()))
+
+@app.on_event("shutdown")
+async def _shutdown_pipeline_executor():
+    # Release the worker threads used to offload blocking provider / LLM calls
+    shutdown_executor()
+
 if __name__ == "__main__":
     import uvicorn
     # Run the server on port 8001
@@ -8,6 +8,9 @@ class GenerateRequest(BaseModel):
     question: str = Field(..., description="Question for content generation")
     local_llm: bool = Field(False, description="Whether to use a local LLM (default: False)")
     provider: Literal["gemini", "mistral"] = Field("gemini", description="Cloud provider to use when local_llm is False")
+    budget_s: Optional[float] = Field(None, gt=0, le=300, description="End-to-end latency budget in seconds (default: server setting)")
+    use_llm_cache: bool = Field(True, description="Serve identical LLM prompts from the result cache (set False to force fresh calls)")
+    llm_mode: Literal["split", "combined"] = Field("split", description="split: separate ideas and overview LLM calls; combined: one JSON-structured call for both")
 
     @field_validator("question")
     def validate_question(cls, value: str) -> str:
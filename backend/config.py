@@ -17,6 +17,14 @@ class Settings(BaseSettings):
 
     PROJECT_NAME: str = "Literature Surveyor Platform APIs"
 
+    # End-to-end latency budget for POST /generate (seconds); requests may override it
+    GENERATE_BUDGET_S: float = 45.0
+    # LLM phases are skipped (fallback output) when less than this much budget is left
+    GENERATE_MIN_LLM_BUDGET_S: float = 2.0
+    # Per-call caps for the concurrent idea and overview LLM calls (also bounded by the budget)
+    GENERATE_IDEAS_TIMEOUT_S: float = 30.0
+    GENERATE_OVERVIEW_TIMEOUT_S: float = 20.0
+
     class Config:
         case_sensitive = True
 
@@ -0,0 +1,128 @@
+"""
+Parsing for the combined ideas + overview LLM response.
+
+The combined prompt asks for {"ideas": [...], "overview": "..."}, but models
+wrap JSON in code fences, add commentary, or stop mid-object. `CombinedParser`
+scans the output incrementally as it streams, emitting each idea as soon as
+its string closes and salvaging whatever is complete if the JSON never is.
+An idea is a string, or an object's first string "title" / "idea" / "text"
+field; other elements are skipped by both parsers. Anything it
+cannot read is left to the caller's plain-text fallback.
+"""
+import json
+import re
+from typing import Optional
+
+_FENCE = re.compile(r"^```(?:json)?\s*|\s*```\s*$", re.IGNORECASE)
+# Fields holding the idea text when a model returns ideas as objects
+IDEA_FIELDS = ("title", "idea", "text")
+
+
+def _idea_text(element) -> str:
+    """Whitespace-normalized idea text of one "ideas" element; "" when unreadable."""
+    if isinstance(element, dict):
+        element = next((v for k, v in element.items() if k in IDEA_FIELDS and isinstance(v, str)), None)
+    return " ".join(element.split()) if isinstance(element, str) else ""
+
+
+class CombinedParser:
+    """Incremental scanner for string values under "ideas" and "overview"."""
+
+    def __init__(self) -> None:
+        self.ideas: list[str] = []
+        self.overview: str = ""
+        self._stack: list[str] = []      # open containers: "{" or "["
+        self._keys: list[Optional[str]] = []  # current key per open object
+        self._expect_key = False
+        self._in_string = False
+        self._escape = False
+        self._chars: list[str] = []
+        self._element_read = False  # current object element of "ideas" already gave its idea
+
+    def feed(self, chunk: str) -> list[str]:
+        """Consume the next piece of output; return ideas completed by it."""
+        new: list[str] = []
+        for ch in chunk:
+            if self._in_string:
+                self._chars.append(ch)
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    self._close_string(new)
+            elif ch == '"':
+                self._in_string = True
+                self._chars = ['"']
+            elif ch == "{":
+                self._stack.append("{")
+                self._keys.append(None)
+                self._expect_key = True
+                if len(self._stack) == 3:
+                    self._element_read = False
+            elif ch == "[":
+                self._stack.append("[")
+            elif ch in "}]":
+                if self._stack:
+                    if self._stack.pop() == "{":
+                        self._keys.pop()
+                self._expect_key = False
+            elif ch == ":":
+                self._expect_key = False
+            elif ch == ",":
+                self._expect_key = bool(self._stack) and self._stack[-1] == "{"
+        return new
+
+    def _close_string(self, new: list[str]) -> None:
+        try:
+            value = json.loads("".join(self._chars))
+        except ValueError:
+            return
+        if not self._stack:
+            return
+        if self._stack[-1] == "{":
+            if self._expect_key:
+                self._keys[-1] = value
+            elif self._keys[-1] == "overview" and len(self._stack) == 1:
+                self.overview = value.strip()
+            elif self._in_idea_object() and self._keys[-1] in IDEA_FIELDS and not self._element_read:
+                # First idea field of an object element: {"title": "..."}
+                self._element_read = True
+                self._add_idea(value, new)
+            return
+        # Strings directly inside the top-level "ideas" array
+        if len(self._stack) == 2 and self._keys[0] == "ideas":
+            self._add_idea(value, new)
+
+    def _in_idea_object(self) -> bool:
+        return self._stack == ["{", "[", "{"] and self._keys[0] == "ideas"
+
+    def _add_idea(self, value: str, new: list[str]) -> None:
+        idea = _idea_text(value)
+        if idea:
+            self.ideas.append(idea)
+            new.append(idea)
+
+
+def parse_combined(text: str) -> tuple[list[str], str]:
+    """(ideas, overview) from a complete combined response; empty when unreadable."""
+    body = _FENCE.sub("", (text or "").strip())
+    start = body.find("{")
+    if start < 0:
+        return [], ""
+
+    try:
+        data = json.loads(body[start:body.rfind("}") + 1])
+    except ValueError:
+        data = None
+    if isinstance(data, dict):
+        ideas = data.get("ideas")
+        overview = data.get("overview")
+        ideas = [idea for idea in map(_idea_text, ideas) if idea] if isinstance(ideas, list) else []
+        return ideas, overview.strip() if isinstance(overview, str) else ""
+
+    # Malformed or truncated JSON: keep every string that did close
+    parser = CombinedParser()
+    parser.feed(body[start:])
+    return parser.ideas, parser.overview
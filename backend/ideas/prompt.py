@@ -1,3 +1,6 @@
+from util.system_prompt import LITERATURE_SYSTEM_PROMPT
+
+
 def build_prompt(domain: str, venues: list[str], papers: list[dict]) -> str:
     venue_text = ", ".join(venues)
 
@@ -42,3 +45,22 @@ OUTPUT FORMAT:
 4. <idea>
 5. <idea>
 """
+
+
+def build_combined_prompt(domain: str, venues: list[str], papers: list[dict]) -> str:
+    """One prompt asking for the five ideas and the overview as a single JSON object."""
+    task = build_prompt(domain, venues, papers).split("OUTPUT FORMAT:")[0].rstrip()
+
+    return f"""{LITERATURE_SYSTEM_PROMPT.strip()}
+
+For this request, the JSON output format below replaces the bullet-point format.
+{task}
+
+OVERVIEW:
+Also write a single, short sentence under 30 words summarizing the domain,
+the target venues and the context papers.
+
+OUTPUT FORMAT:
+Return ONLY a JSON object, with no code fences or commentary:
+{{"ideas": ["<idea>", "<idea>", "<idea>", "<idea>", "<idea>"], "overview": "<sentence>"}}
+"""
@@ -1,25 +1,105 @@
 import re
-from util.llm_factory import get_llm
-from .prompt import build_prompt
+from typing import Callable, Optional
+
+from util.llm_factory import deadline_kwargs, get_llm
+from util.llm_cache import invoke_cached
+from .prompt import build_combined_prompt, build_prompt
 from .fallback import fallback_ideas
+from .combined import CombinedParser, parse_combined
 
 class IdeaService:
     REQUIRED_COUNT = 5
 
-    def generate(self, domain: str, venues: list[str], papers: list[dict]) -> list[str]:
+    def generate(
+        self,
+        domain: str,
+        venues: list[str],
+        papers: list[dict],
+        use_cache: bool = True,
+        on_token: Optional[Callable[[str], None]] = None,
+    ) -> list[str]:
+        """Return exactly REQUIRED_COUNT ideas.
+
+        With `on_token`, the completion is streamed and each text chunk is passed
+        to it as it arrives (when the LLM wrapper supports streaming).
+        """
         ideas: list[str] = []
 
         try:
             llm = get_llm()
             prompt = build_prompt(domain, venues, papers)
-            raw = llm.invoke(prompt)
+            invoke = None
+            if on_token is not None and hasattr(llm, "stream"):
+                invoke = lambda: self._stream(llm, prompt, on_token)
+            # Identical prompts (same domain, venues, papers) are served from the LLM cache
+            text = invoke_cached(
+                llm,
+                prompt,
+                extract=lambda raw: raw.content if hasattr(raw, "content") else str(raw),
+                use_cache=use_cache,
+                invoke=invoke,
+            )
+            ideas = self._parse(text or "")
+
+        except Exception:
+            ideas = []
+
+        return self._fill(domain, ideas)
+
+    def generate_combined(
+        self,
+        domain: str,
+        venues: list[str],
+        papers: list[dict],
+        use_cache: bool = True,
+        on_token: Optional[Callable[[str], None]] = None,
+        local_llm: bool = False,
+        provider: Optional[str] = None,
+        temperature: float = 0.3,
+    ) -> tuple[list[str], str]:
+        """Return (ideas, overview) from a single JSON-structured LLM call.
 
-            text = raw.content if hasattr(raw, "content") else str(raw)
-            ideas = self._parse(text)
+        With `on_token`, each idea is passed to it as soon as its string is
+        complete in the streamed output. Unreadable JSON falls back to the
+        line-based `_parse`; missing ideas are filled from `fallback_ideas`.
+        `local_llm` / `provider` / `temperature` select the model like
+        `generate_summary`; if the local LLM is unavailable its error note is
+        returned as the overview.
+        """
+        ideas: list[str] = []
+        overview = ""
+
+        try:
+            llm = get_llm(local_llm=local_llm, provider=provider, temperature=temperature)
+            if isinstance(llm, str):
+                return self._fill(domain, ideas), llm
+            prompt = build_combined_prompt(domain, venues, papers)
+            invoke = None
+            if on_token is not None and hasattr(llm, "stream"):
+                parser = CombinedParser()
+
+                def relay(piece: str) -> None:
+                    for idea in parser.feed(piece):
+                        on_token(f"{len(parser.ideas)}. {idea}\n")
+
+                invoke = lambda: self._stream(llm, prompt, relay)
+            text = invoke_cached(
+                llm,
+                prompt,
+                extract=lambda raw: raw.content if hasattr(raw, "content") else str(raw),
+                use_cache=use_cache,
+                invoke=invoke,
+            ) or ""
+            ideas, overview = parse_combined(text)
+            if not ideas:
+                ideas = self._parse(text)
 
         except Exception:
             ideas = []
 
+        return self._fill(domain, ideas), overview
+
+    def _fill(self, domain: str, ideas: list[str]) -> list[str]:
         # Enforce EXACTLY 5 ideas
         if len(ideas) < self.REQUIRED_COUNT:
             fillers = fallback_ideas(domain)
@@ -30,6 +110,16 @@ class IdeaService:
 
         return ideas[:self.REQUIRED_COUNT]
 
+    def _stream(self, llm, prompt: str, on_token: Callable[[str], None]) -> str:
+        """Stream the completion, forwarding each chunk to `on_token`; return the full text."""
+        parts: list[str] = []
+        for chunk in llm.stream(prompt, **deadline_kwargs(llm)):
+            piece = chunk.content if hasattr(chunk, "content") else chunk
+            if isinstance(piece, str) and piece:
+                parts.append(piece)
+                on_token(piece)
+        return "".join(parts)
+
     def _parse(self, text: str) -> list[str]:
         lines = text.splitlines()
         ideas = []
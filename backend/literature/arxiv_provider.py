@@ -1,9 +1,11 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Dict, List
+from typing import Dict, List, Optional
 import xml.etree.ElementTree as ET
-import requests
+
+from util.cache import cached
+from util.http_client import HttpClient, get_http_client
 
 Paper = Dict[str, object]  # {"title": str, "summary": str, "year": int}
 
@@ -16,22 +18,28 @@ class ArxivProvider:
         &max_results=<limit>
     """
     BASE_URL = "https://export.arxiv.org/api/query"
+    MAX_RESULTS = 100  # above 5 only for LiteratureService large-pool re-ranking
 
-    def __init__(self, timeout_s: int = 10) -> None:
+    def __init__(self, timeout_s: int = 10, client: Optional[HttpClient] = None) -> None:
         self.timeout_s = timeout_s
+        self._client = client
+
+    @property
+    def client(self) -> HttpClient:
+        return self._client or get_http_client()
 
+    @cached("arxiv", "query")
     def search(self, query: str, limit: int = 5) -> List[Paper]:
         query = (query or "").strip()
         if not query:
             return []
 
-        limit = max(1, min(int(limit), 5))
+        limit = max(1, min(int(limit), self.MAX_RESULTS))
 
         params = {"search_query": f"all:{query}", "start": 0, "max_results": limit}
-        headers = {"User-Agent": "literature-surveyor/phase4"}
 
         try:
-            resp = requests.get(self.BASE_URL, params=params, headers=headers, timeout=self.timeout_s)
+            resp = self.client.get(self.BASE_URL, params=params, timeout=self.timeout_s)
             resp.raise_for_status()
             xml_text = resp.text
         except Exception:
@@ -0,0 +1,388 @@
+"""
+CPU-only dense retrieval over every paper the providers have returned.
+
+Papers are embedded with a signed hashing vectorizer (unigrams + bigrams,
+sublinear tf, L2-normalized): no model download, deterministic across
+processes, and fast enough to embed queries inline. The vectors live in a
+float16 (or float32) .npy matrix opened with `mmap_mode="r"`, so every worker
+shares one copy through the page cache.
+
+Search is a matrix multiply: flat indexes stream the matrix in row blocks and
+keep a running top-k with `argpartition`, scoring a whole batch of queries per
+block. For large corpora, `nlist` > 0 builds an IVF layout: rows are grouped by
+nearest k-means centroid and a query only scans its `nprobe` closest lists.
+
+    python -m literature.dense_index build INDEX_DIR --from-cache [records.jsonl ...]
+    python -m literature.dense_index search INDEX_DIR "graph neural networks"
+    python -m literature.dense_index bench --docs 100000 1000000
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import mmap
+import os
+import sqlite3
+import sys
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+if __package__ in (None, ""):
+    sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from literature.local_index import dedupe_papers, read_records, swap_into_place, tokenize
+from util.cache import CACHE_DIR
+
+logger = logging.getLogger(__name__)
+
+Paper = Dict[str, object]
+
+FORMAT_VERSION = 1
+DEFAULT_DIM = 256
+DEFAULT_NPROBE = 8
+# Rows scored per matrix multiply (bounds the temporary float32 block)
+BLOCK_ROWS = 65536
+# Rows sampled to train IVF centroids
+IVF_TRAIN_ROWS = 50000
+IVF_ITERATIONS = 10
+TITLE_WEIGHT = 2
+
+# Provider: answers are used only when the top hits are at least this similar
+DENSE_MIN_SCORE = float(os.getenv("LS_DENSE_MIN_SCORE", "0.2"))
+
+
+class HashingVectorizer:
+    """Stateless text -> unit vector embedding via signed feature hashing."""
+
+    def __init__(self, dim: int = DEFAULT_DIM, bigrams: bool = True) -> None:
+        self.dim = dim
+        self.bigrams = bigrams
+
+    def _features(self, text: str) -> List[str]:
+        tokens = tokenize(text)
+        if self.bigrams:
+            tokens += [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+        return tokens
+
+    def transform(self, texts: Sequence[str]) -> np.ndarray:
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            counts: Dict[int, float] = {}
+            for feature in self._features(text):
+                # crc32 is stable across processes (str hashes are salted)
+                h = zlib.crc32(feature.encode("utf-8"))
+                col = h % self.dim
+                counts[col] = counts.get(col, 0.0) + (1.0 if h & 0x80000000 else -1.0)
+            for col, value in counts.items():
+                out[row, col] = np.sign(value) * (1.0 + np.log(abs(value))) if value else 0.0
+        norms = np.linalg.norm(out, axis=1, keepdims=True)
+        np.divide(out, norms, out=out, where=norms > 0)
+        return out
+
+
+def paper_text(paper: Paper) -> str:
+    return " ".join([str(paper["title"])] * TITLE_WEIGHT + [str(paper.get("summary") or ""), str(paper.get("source") or "")])
+
+
+def cached_provider_records(cache_path: Optional[Path] = None) -> Iterator[Dict[str, Any]]:
+    """Every paper / work record stored in the provider response cache (util.cache)."""
+    cache_path = cache_path or CACHE_DIR / "provider_cache.sqlite3"
+    conn = sqlite3.connect(f"file:{cache_path}?mode=ro", uri=True)
+    try:
+        for (blob,) in conn.execute("SELECT value FROM cache"):
+            try:
+                value = json.loads(zlib.decompress(blob))
+            except Exception:
+                continue
+            if isinstance(value, list):
+                yield from (v for v in value if isinstance(v, dict))
+    finally:
+        conn.close()
+
+
+def _topk(scores: np.ndarray, ids: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Best `k` columns per row of `scores` (unsorted), with their ids."""
+    if scores.shape[1] > k:
+        part = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        return np.take_along_axis(scores, part, axis=1), ids[part]
+    return scores, np.broadcast_to(ids, scores.shape)
+
+
+def _merge(best: Tuple[np.ndarray, np.ndarray], new: Tuple[np.ndarray, np.ndarray], k: int) -> Tuple[np.ndarray, np.ndarray]:
+    scores = np.concatenate([best[0], new[0]], axis=1)
+    ids = np.concatenate([best[1], new[1]], axis=1)
+    if scores.shape[1] > k:
+        part = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        return np.take_along_axis(scores, part, axis=1), np.take_along_axis(ids, part, axis=1)
+    return scores, ids
+
+
+def _kmeans(sample: np.ndarray, nlist: int, iterations: int = IVF_ITERATIONS, seed: int = 0) -> np.ndarray:
+    """Spherical k-means centroids (unit vectors) for IVF partitioning."""
+    rng = np.random.default_rng(seed)
+    centroids = sample[rng.choice(len(sample), size=nlist, replace=False)].copy()
+    for _ in range(iterations):
+        labels = np.argmax(sample @ centroids.T, axis=1)
+        for c in range(nlist):
+            members = sample[labels == c]
+            if len(members):
+                centroids[c] = members.sum(axis=0)
+            else:
+                centroids[c] = sample[rng.integers(len(sample))]
+        centroids /= np.maximum(np.linalg.norm(centroids, axis=1, keepdims=True), 1e-12)
+    return centroids.astype(np.float32)
+
+
+def write_index(
+    out_dir: Path,
+    vectors: np.ndarray,
+    papers: Sequence[Paper],
+    dtype: str = "float16",
+    nlist: int = 0,
+    vectorizer: Optional[HashingVectorizer] = None,
+) -> Dict[str, Any]:
+    """Write unit `vectors` (one row per paper) as an index, IVF-ordered if `nlist` > 0."""
+    out_dir = Path(out_dir)
+    tmp_dir = out_dir.with_name(out_dir.name + ".building")
+    if tmp_dir.exists():
+        import shutil
+
+        shutil.rmtree(tmp_dir)
+    tmp_dir.mkdir(parents=True)
+
+    n, dim = vectors.shape
+    order = np.arange(n)
+    if nlist:
+        nlist = min(nlist, n)
+        rng = np.random.default_rng(0)
+        sample_idx = rng.choice(n, size=min(n, IVF_TRAIN_ROWS), replace=False)
+        centroids = _kmeans(np.asarray(vectors[np.sort(sample_idx)], dtype=np.float32), nlist)
+        labels = np.concatenate([
+            np.argmax(np.asarray(vectors[i:i + BLOCK_ROWS], dtype=np.float32) @ centroids.T, axis=1)
+            for i in range(0, n, BLOCK_ROWS)
+        ])
+        order = np.argsort(labels, kind="stable")
+        offsets = np.concatenate([[0], np.cumsum(np.bincount(labels, minlength=nlist))]).astype(np.int64)
+        np.save(tmp_dir / "ivf_centroids.npy", centroids)
+        np.save(tmp_dir / "ivf_offsets.npy", offsets)
+
+    matrix = np.lib.format.open_memmap(tmp_dir / "vectors.npy", mode="w+", dtype=dtype, shape=(n, dim))
+    for i in range(0, n, BLOCK_ROWS):
+        rows = order[i:i + BLOCK_ROWS]
+        matrix[i:i + len(rows)] = vectors[rows] if nlist else vectors[i:i + len(rows)]
+    matrix.flush()
+    del matrix
+
+    docs_off = np.zeros(n + 1, dtype=np.uint64)
+    with open(tmp_dir / "docs.bin", "wb") as f:
+        for row, doc in enumerate(order):
+            blob = json.dumps(papers[doc], ensure_ascii=False).encode("utf-8")
+            f.write(blob)
+            docs_off[row + 1] = docs_off[row] + len(blob)
+    np.save(tmp_dir / "docs_off.npy", docs_off)
+
+    vectorizer = vectorizer or HashingVectorizer(dim)
+    meta = {
+        "version": FORMAT_VERSION,
+        "docs": n,
+        "dim": dim,
+        "dtype": dtype,
+        "bigrams": vectorizer.bigrams,
+        "nlist": nlist,
+    }
+    (tmp_dir / "meta.json").write_text(json.dumps(meta, indent=2))
+    swap_into_place(tmp_dir, out_dir)
+    return meta
+
+
+def build_dense_index(
+    records: Iterable[Dict[str, Any]],
+    out_dir: Path,
+    dim: int = DEFAULT_DIM,
+    dtype: str = "float16",
+    nlist: int = 0,
+) -> Dict[str, Any]:
+    """Embed deduplicated `records` and write them as an index in `out_dir`."""
+    papers = dedupe_papers(records)
+    vectorizer = HashingVectorizer(dim)
+    vectors = np.concatenate([
+        vectorizer.transform([paper_text(p) for p in papers[i:i + 4096]])
+        for i in range(0, len(papers), 4096)
+    ])
+    return write_index(out_dir, vectors, papers, dtype=dtype, nlist=nlist, vectorizer=vectorizer)
+
+
+class DenseIndex:
+    """Read-only memory-mapped vector index with batched cosine top-k."""
+
+    def __init__(self, path: Path, nprobe: int = DEFAULT_NPROBE) -> None:
+        self.path = Path(path)
+        self.meta = json.loads((self.path / "meta.json").read_text())
+        if self.meta.get("version") != FORMAT_VERSION:
+            raise ValueError(f"Incompatible dense index at {self.path}; rebuild it")
+        self.vectorizer = HashingVectorizer(self.meta["dim"], self.meta.get("bigrams", True))
+        self.vectors = np.load(self.path / "vectors.npy", mmap_mode="r")
+        self.docs = int(self.meta["docs"])
+        self.nprobe = nprobe
+        self.nlist = int(self.meta.get("nlist") or 0)
+        if self.nlist:
+            self.centroids = np.load(self.path / "ivf_centroids.npy")
+            self.offsets = np.load(self.path / "ivf_offsets.npy")
+        self._docs_off = np.load(self.path / "docs_off.npy", mmap_mode="r")
+        with open(self.path / "docs.bin", "rb") as f:
+            self._docs = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def _doc(self, row: int) -> Paper:
+        return json.loads(self._docs[int(self._docs_off[row]):int(self._docs_off[row + 1])])
+
+    def _scan(self, queries: np.ndarray, start: int, end: int, k: int, best=None):
+        """Merge the top-k of rows [start, end) into `best` for every query."""
+        for i in range(start, end, BLOCK_ROWS):
+            stop = min(end, i + BLOCK_ROWS)
+            block = np.asarray(self.vectors[i:stop], dtype=np.float32)
+            found = _topk(queries @ block.T, np.arange(i, stop), k)
+            best = found if best is None else _merge(best, found, k)
+        return best
+
+    def search_vectors(self, queries: np.ndarray, limit: int = 5) -> List[List[Tuple[float, int]]]:
+        """(cosine, row) top-`limit` per query vector, best first."""
+        k = max(1, min(limit, self.docs))
+        queries = np.asarray(queries, dtype=np.float32)
+        if not self.nlist:
+            scores, ids = self._scan(queries, 0, self.docs, k)
+        else:
+            # Scan each probed list once for every query that probes it
+            scores = np.full((len(queries), k), -np.inf, dtype=np.float32)
+            ids = np.zeros((len(queries), k), dtype=np.int64)
+            probes = min(self.nprobe, self.nlist)
+            nearest = np.argpartition(-(queries @ self.centroids.T), probes - 1, axis=1)[:, :probes]
+            for lst in np.unique(nearest):
+                start, end = int(self.offsets[lst]), int(self.offsets[lst + 1])
+                if end == start:
+                    continue
+                rows = np.flatnonzero((nearest == lst).any(axis=1))
+                scores[rows], ids[rows] = self._scan(queries[rows], start, end, k, (scores[rows], ids[rows]))
+
+        out = []
+        for row_scores, row_ids in zip(scores, ids):
+            ranked = np.argsort(-row_scores)
+            out.append([(float(row_scores[j]), int(row_ids[j])) for j in ranked if np.isfinite(row_scores[j])])
+        return out
+
+    def search_batch(self, queries: Sequence[str], limit: int = 5) -> List[List[Tuple[float, Paper]]]:
+        """Top `limit` (cosine, paper) per query; all queries share each pass over the matrix."""
+        hits = self.search_vectors(self.vectorizer.transform(list(queries)), limit)
+        return [[(score, self._doc(row)) for score, row in row_hits] for row_hits in hits]
+
+    def search(self, query: str, limit: int = 5) -> List[Tuple[float, Paper]]:
+        return self.search_batch([query], limit)[0]
+
+
+class DenseIndexProvider:
+    """LiteratureService provider over a DenseIndex (same `search` contract as OpenAlexProvider).
+
+    Returns [] unless at least 3 hits reach `min_score`, so weak matches fall
+    through to the next provider instead of answering with unrelated papers.
+    """
+
+    def __init__(self, index: DenseIndex, min_score: float = DENSE_MIN_SCORE) -> None:
+        self.index = index
+        self.min_score = min_score
+
+    def search(self, query: str, limit: int = 5) -> List[Paper]:
+        hits = [paper for score, paper in self.index.search(query, limit) if score >= self.min_score]
+        return hits if len(hits) >= min(3, limit) else []
+
+
+def open_dense_provider(path: Optional[str] = None) -> Optional[DenseIndexProvider]:
+    """Provider over the index at `path` (default LS_DENSE_INDEX_DIR), or None if unset or unusable."""
+    path = path or os.getenv("LS_DENSE_INDEX_DIR")
+    if not path:
+        return None
+    try:
+        index = DenseIndex(Path(path), nprobe=int(os.getenv("LS_DENSE_NPROBE", str(DEFAULT_NPROBE))))
+    except Exception as e:
+        logger.warning("Dense literature index at %s unavailable: %s", path, e)
+        return None
+    logger.info("Dense literature index: %d papers, dim %d, nlist %d", index.docs, index.meta["dim"], index.nlist)
+    return DenseIndexProvider(index)
+
+
+def benchmark(docs: int, dim: int, dtype: str, nlist: int, batch: int, queries: int = 64, nprobe: int = DEFAULT_NPROBE) -> float:
+    """Queries per second over `docs` synthetic unit vectors (index built in a temp dir)."""
+    import tempfile
+    import time
+
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        vectors = np.lib.format.open_memmap(Path(tmp) / "src.npy", mode="w+", dtype=np.float32, shape=(docs, dim))
+        for i in range(0, docs, BLOCK_ROWS):
+            block = rng.standard_normal((min(BLOCK_ROWS, docs - i), dim), dtype=np.float32)
+            vectors[i:i + len(block)] = block / np.linalg.norm(block, axis=1, keepdims=True)
+        papers = [{"title": f"p{i}", "summary": "", "year": 2020} for i in range(docs)]
+        write_index(Path(tmp) / "index", vectors, papers, dtype=dtype, nlist=nlist)
+        del vectors
+        index = DenseIndex(Path(tmp) / "index", nprobe=nprobe)
+        q = rng.standard_normal((queries, dim), dtype=np.float32)
+        q /= np.linalg.norm(q, axis=1, keepdims=True)
+        index.search_vectors(q[:batch], 10)  # warm the page cache
+        start = time.perf_counter()
+        for i in range(0, queries, batch):
+            index.search_vectors(q[i:i + batch], 10)
+        return queries / (time.perf_counter() - start)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Build or query the dense literature index")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="embed records into INDEX_DIR")
+    build.add_argument("index_dir", type=Path)
+    build.add_argument("inputs", type=Path, nargs="*", help=".jsonl[.gz], .json or .parquet files")
+    build.add_argument("--from-cache", action="store_true", help="include every paper in the provider response cache")
+    build.add_argument("--dim", type=int, default=DEFAULT_DIM)
+    build.add_argument("--dtype", choices=["float16", "float32"], default="float16")
+    build.add_argument("--nlist", type=int, default=0, help="IVF lists (0 = flat); ~sqrt(papers) is a good start")
+    search = sub.add_parser("search", help="query an index")
+    search.add_argument("index_dir", type=Path)
+    search.add_argument("query")
+    search.add_argument("--limit", type=int, default=5)
+    search.add_argument("--nprobe", type=int, default=DEFAULT_NPROBE)
+    bench = sub.add_parser("bench", help="queries/second on synthetic vectors")
+    bench.add_argument("--docs", type=int, nargs="+", default=[100000, 1000000])
+    bench.add_argument("--dim", type=int, default=DEFAULT_DIM)
+    bench.add_argument("--queries", type=int, default=64)
+    args = parser.parse_args(argv)
+
+    if args.command == "bench":
+        print(f"{'docs':>9} {'dtype':>8} {'layout':>10} {'batch':>5} {'qps':>9}")
+        for docs in args.docs:
+            nlist = int(np.sqrt(docs))
+            for dtype in ("float16", "float32"):
+                for layout, lists in (("flat", 0), (f"ivf{nlist}", nlist)):
+                    for batch in (1, 32):
+                        qps = benchmark(docs, args.dim, dtype, lists, batch, args.queries)
+                        print(f"{docs:>9} {dtype:>8} {layout:>10} {batch:>5} {qps:>9.1f}", flush=True)
+    elif args.command == "build":
+        if not args.inputs and not args.from_cache:
+            parser.error("give record files and/or --from-cache")
+
+        def records() -> Iterator[Dict[str, Any]]:
+            for path in args.inputs:
+                yield from read_records(path)
+            if args.from_cache:
+                yield from cached_provider_records()
+
+        meta = build_dense_index(records(), args.index_dir, dim=args.dim, dtype=args.dtype, nlist=args.nlist)
+        print(f"Embedded {meta['docs']} papers (dim {meta['dim']}, {meta['dtype']}, nlist {meta['nlist']}) into {args.index_dir}")
+    else:
+        index = DenseIndex(args.index_dir, nprobe=args.nprobe)
+        for score, paper in index.search(args.query, args.limit):
+            print(f"{score:6.3f}  {paper['title']} ({paper.get('year')}, {paper.get('source')})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,348 @@
+"""
+Offline BM25 index over harvested paper records.
+
+Lets Phase 4 answer common domains without network calls. The index is a
+directory of flat binary files that are memory-mapped read-only, so every
+worker process on a host shares one copy through the page cache:
+
+  meta.json                 corpus stats (docs, terms, avgdl, BM25 k1 / b)
+  vocab.bin, vocab_off.bin  sorted UTF-8 terms + uint64 offsets (binary-searched)
+  post_off.bin              uint64 start of each term's postings
+  post_doc.bin, post_tf.bin uint32 doc ids / uint16 term frequencies
+  doclen.bin                uint32 token count per document
+  docs.bin, docs_off.bin    stored paper dicts (JSON) + uint64 offsets
+
+Title, summary, venue and year are indexed; title tokens count twice.
+
+Build from harvester output, provider dumps or OpenAlex / Semantic Scholar /
+arXiv records (JSON Lines, optionally gzipped; JSON; Parquet with pyarrow):
+
+    python -m literature.local_index build INDEX_DIR records.jsonl ...
+    python -m literature.local_index search INDEX_DIR "graph neural networks"
+"""
+from __future__ import annotations
+
+import argparse
+import gzip
+import heapq
+import json
+import logging
+import math
+import mmap
+import os
+import re
+import shutil
+import sys
+from array import array
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+if __package__ in (None, ""):
+    sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from util.openalex_works import reconstruct_abstract
+
+logger = logging.getLogger(__name__)
+
+Paper = Dict[str, object]
+
+FORMAT_VERSION = 1
+BM25_K1 = 1.2
+BM25_B = 0.75
+TITLE_WEIGHT = 2
+MAX_TF = 0xFFFF
+
+_TOKEN = re.compile(r"[^\W_]+")
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from in into is it of on or the this to with via using based towards".split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased word tokens without stopwords (shared by build and search)."""
+    return [t for t in _TOKEN.findall((text or "").lower()) if t not in _STOPWORDS]
+
+
+def _first(record: Dict[str, Any], *keys: str) -> Any:
+    for key in keys:
+        value = record.get(key)
+        if value not in (None, ""):
+            return value
+    return None
+
+
+def to_paper(record: Dict[str, Any]) -> Optional[Paper]:
+    """Normalize a provider paper dict, harvester row, or OpenAlex / S2 / arXiv record."""
+    title = _first(record, "title", "Title", "display_name")
+    if not title:
+        return None
+
+    summary = _first(record, "summary", "abstract", "Abstract")
+    if not summary and record.get("abstract_inverted_index"):
+        summary = reconstruct_abstract(record["abstract_inverted_index"])
+
+    source = _first(record, "source", "venue", "Venue")
+    if isinstance(source, dict):
+        source = source.get("display_name") or source.get("name")
+    if not source:
+        loc_source = (record.get("primary_location") or {}).get("source") or {}
+        source = loc_source.get("display_name")
+
+    year = _first(record, "year", "Year", "publication_year")
+    cited = _first(record, "cited_by_count", "citationCount", "Cited By")
+    try:
+        year = int(year) if year is not None else None
+    except (TypeError, ValueError):
+        year = None
+    try:
+        cited = int(cited or 0)
+    except (TypeError, ValueError):
+        cited = 0
+
+    paper: Paper = {
+        "title": " ".join(str(title).split()),
+        "summary": str(summary or "").strip(),
+        "year": year,
+        "source": str(source) if source else "Local index",
+        "cited_by_count": cited,
+    }
+    doi = _first(record, "doi", "DOI")
+    if doi:
+        paper["doi"] = str(doi).replace("https://doi.org/", "")
+    return paper
+
+
+def _document_tokens(paper: Paper) -> List[str]:
+    tokens = tokenize(str(paper["title"])) * TITLE_WEIGHT
+    tokens += tokenize(str(paper.get("summary") or ""))
+    tokens += tokenize(str(paper.get("source") or ""))
+    if paper.get("year"):
+        tokens.append(str(paper["year"]))
+    return tokens
+
+
+def read_records(path: Path) -> Iterator[Dict[str, Any]]:
+    """Records from a .jsonl[.gz], .json or .parquet file."""
+    name = path.name.lower()
+    if name.endswith(".parquet"):
+        import pyarrow.parquet as pq  # optional dependency, only for Parquet inputs
+
+        for batch in pq.ParquetFile(path).iter_batches():
+            yield from batch.to_pylist()
+        return
+
+    opener = gzip.open if name.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        if name.endswith((".json", ".json.gz")):
+            data = json.load(f)
+            yield from data.get("results", []) if isinstance(data, dict) else data
+            return
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def dedupe_papers(records: Iterable[Dict[str, Any]]) -> List[Paper]:
+    """Normalize records with `to_paper`, keeping the most-cited copy of each title."""
+    papers: Dict[str, Paper] = {}
+    for record in records:
+        paper = to_paper(record)
+        if paper is None:
+            continue
+        key = " ".join(tokenize(str(paper["title"])))
+        kept = papers.get(key)
+        if kept is None or int(paper["cited_by_count"]) > int(kept["cited_by_count"]):
+            papers[key] = paper
+    if not papers:
+        raise ValueError("No indexable records (each needs at least a title)")
+    return list(papers.values())
+
+
+def build_index(records: Iterable[Dict[str, Any]], out_dir: Path) -> Dict[str, Any]:
+    """Write an index of `records` to `out_dir` (replacing any existing index)."""
+    papers = dedupe_papers(records)
+
+    postings: Dict[str, Tuple[array, array]] = defaultdict(lambda: (array("I"), array("H")))
+    doclen = array("I")
+    docs_off = array("Q", [0])
+    tmp_dir = out_dir.with_name(out_dir.name + ".building")
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    tmp_dir.mkdir(parents=True)
+
+    with open(tmp_dir / "docs.bin", "wb") as docs_file:
+        for doc_id, paper in enumerate(papers):
+            tokens = _document_tokens(paper)
+            doclen.append(len(tokens))
+            for term, tf in Counter(tokens).items():
+                docs, tfs = postings[term]
+                docs.append(doc_id)
+                tfs.append(min(tf, MAX_TF))
+            blob = json.dumps(paper, ensure_ascii=False).encode("utf-8")
+            docs_file.write(blob)
+            docs_off.append(docs_off[-1] + len(blob))
+
+    vocab_off = array("Q", [0])
+    post_off = array("Q", [0])
+    with open(tmp_dir / "vocab.bin", "wb") as vocab, open(tmp_dir / "post_doc.bin", "wb") as pdoc, open(
+        tmp_dir / "post_tf.bin", "wb"
+    ) as ptf:
+        for term in sorted(postings):
+            raw = term.encode("utf-8")
+            docs, tfs = postings[term]
+            vocab.write(raw)
+            docs.tofile(pdoc)
+            tfs.tofile(ptf)
+            vocab_off.append(vocab_off[-1] + len(raw))
+            post_off.append(post_off[-1] + len(docs))
+
+    for name, arr in (("vocab_off.bin", vocab_off), ("post_off.bin", post_off), ("doclen.bin", doclen), ("docs_off.bin", docs_off)):
+        with open(tmp_dir / name, "wb") as f:
+            arr.tofile(f)
+
+    meta = {
+        "version": FORMAT_VERSION,
+        "byteorder": sys.byteorder,
+        "docs": len(doclen),
+        "terms": len(postings),
+        "postings": post_off[-1],
+        "avgdl": sum(doclen) / len(doclen),
+        "k1": BM25_K1,
+        "b": BM25_B,
+    }
+    (tmp_dir / "meta.json").write_text(json.dumps(meta, indent=2))
+
+    swap_into_place(tmp_dir, out_dir)
+    return meta
+
+
+def swap_into_place(tmp_dir: Path, out_dir: Path) -> None:
+    """Replace `out_dir` with the finished index built in `tmp_dir`."""
+    old_dir = out_dir.with_name(out_dir.name + ".old")
+    shutil.rmtree(old_dir, ignore_errors=True)
+    if out_dir.exists():
+        os.replace(out_dir, old_dir)
+    os.replace(tmp_dir, out_dir)
+    shutil.rmtree(old_dir, ignore_errors=True)
+
+
+class LocalIndex:
+    """Read-only, memory-mapped BM25 index with the `search(query, limit)` provider contract."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self.meta = json.loads((self.path / "meta.json").read_text())
+        if self.meta.get("version") != FORMAT_VERSION or self.meta.get("byteorder") != sys.byteorder:
+            raise ValueError(f"Incompatible local index at {self.path}; rebuild it")
+        self._maps: List[mmap.mmap] = []
+        self._vocab = self._map("vocab.bin")
+        self._vocab_off = self._view("vocab_off.bin", "Q")
+        self._post_off = self._view("post_off.bin", "Q")
+        self._post_doc = self._view("post_doc.bin", "I")
+        self._post_tf = self._view("post_tf.bin", "H")
+        self._doclen = self._view("doclen.bin", "I")
+        self._docs = self._map("docs.bin")
+        self._docs_off = self._view("docs_off.bin", "Q")
+        self.docs = int(self.meta["docs"])
+
+    def _map(self, name: str):
+        with open(self.path / name, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return b""  # mmap cannot map empty files
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._maps.append(mapped)
+        return mapped
+
+    def _view(self, name: str, typecode: str) -> memoryview:
+        return memoryview(self._map(name)).cast(typecode)
+
+    def _term_id(self, term: str) -> Optional[int]:
+        raw = term.encode("utf-8")
+        lo, hi = 0, len(self._vocab_off) - 1
+        while lo < hi:
+            mid = (lo + hi) // 2
+            probe = self._vocab[self._vocab_off[mid]:self._vocab_off[mid + 1]]
+            if probe < raw:
+                lo = mid + 1
+            elif probe > raw:
+                hi = mid
+            else:
+                return mid
+        return None
+
+    def _doc(self, doc_id: int) -> Paper:
+        return json.loads(self._docs[self._docs_off[doc_id]:self._docs_off[doc_id + 1]])
+
+    def search_scored(self, query: str, limit: int = 5) -> List[Tuple[float, float, Paper]]:
+        """Top `limit` matches as (bm25 score, fraction of query terms matched, paper)."""
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return []
+
+        k1, b, avgdl = self.meta["k1"], self.meta["b"], self.meta["avgdl"]
+        scores: Dict[int, float] = defaultdict(float)
+        matched: Dict[int, int] = defaultdict(int)
+        for term in terms:
+            term_id = self._term_id(term)
+            if term_id is None:
+                continue
+            start, end = self._post_off[term_id], self._post_off[term_id + 1]
+            df = end - start
+            idf = math.log(1 + (self.docs - df + 0.5) / (df + 0.5))
+            for doc, tf in zip(self._post_doc[start:end], self._post_tf[start:end]):
+                norm = k1 * (1 - b + b * self._doclen[doc] / avgdl)
+                scores[doc] += idf * tf * (k1 + 1) / (tf + norm)
+                matched[doc] += 1
+
+        top = heapq.nlargest(limit, scores.items(), key=lambda kv: (kv[1], -kv[0]))
+        return [(score, matched[doc] / len(terms), self._doc(doc)) for doc, score in top]
+
+    def search(self, query: str, limit: int = 5) -> List[Paper]:
+        return [paper for _, _, paper in self.search_scored(query, limit)]
+
+    def close(self) -> None:
+        # Release memoryviews before their maps
+        for name in ("_vocab_off", "_post_off", "_post_doc", "_post_tf", "_doclen", "_docs_off"):
+            getattr(self, name).release()
+        for mapped in self._maps:
+            mapped.close()
+
+
+def open_local_index(path: Optional[str] = None) -> Optional[LocalIndex]:
+    """Open the index at `path` (default LS_LOCAL_INDEX_DIR), or None if unset or unusable."""
+    path = path or os.getenv("LS_LOCAL_INDEX_DIR")
+    if not path:
+        return None
+    try:
+        index = LocalIndex(Path(path))
+    except Exception as e:
+        logger.warning("Local literature index at %s unavailable: %s", path, e)
+        return None
+    logger.info("Local literature index: %d papers, %d terms", index.docs, index.meta["terms"])
+    return index
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Build or query the offline literature index")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="index record files into INDEX_DIR")
+    build.add_argument("index_dir", type=Path)
+    build.add_argument("inputs", type=Path, nargs="+", help=".jsonl[.gz], .json or .parquet files")
+    search = sub.add_parser("search", help="query an index")
+    search.add_argument("index_dir", type=Path)
+    search.add_argument("query")
+    search.add_argument("--limit", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        records = (r for path in args.inputs for r in read_records(path))
+        meta = build_index(records, args.index_dir)
+        print(f"Indexed {meta['docs']} papers ({meta['terms']} terms, {meta['postings']} postings) into {args.index_dir}")
+    else:
+        index = LocalIndex(args.index_dir)
+        for score, coverage, paper in index.search_scored(args.query, args.limit):
+            print(f"{score:7.2f}  {coverage:4.0%}  {paper['title']} ({paper.get('year')}, {paper.get('source')})")
+
+
+if __name__ == "__main__":
+    main()
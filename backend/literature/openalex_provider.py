@@ -1,10 +1,12 @@
-import os
-from typing import List, Dict
-import requests
+from typing import Dict, Iterable, List, Optional
 import logging
 from pathlib import Path
 from dotenv import load_dotenv
 
+from util.cache import cached
+from util.http_client import HttpClient, get_http_client
+from util.openalex_works import PAPER_FIELDS, reconstruct_abstract
+
 logger = logging.getLogger(__name__)
 
 # Load backend .env if present (for EMAIL param)
@@ -19,34 +21,54 @@ class OpenAlexProvider:
     """Simple OpenAlex /works provider used for literature retrieval.
 
     Returns a list of paper dicts with keys: title, summary, year, source, cited_by_count
+    and, when OpenAlex knows it, doi (bare, without the https://doi.org/ prefix).
     """
     BASE = "https://api.openalex.org/works"
+    MAX_RESULTS = 100  # above 5 only for LiteratureService large-pool re-ranking
 
-    def __init__(self, timeout_s: int = 10) -> None:
+    def __init__(self, timeout_s: int = 10, client: Optional[HttpClient] = None) -> None:
         self.timeout_s = timeout_s
+        self._client = client
+
+    @property
+    def client(self) -> HttpClient:
+        return self._client or get_http_client()
 
+    @cached("openalex", "works.search")
     def search(self, query: str, limit: int = 5) -> List[Paper]:
         q = (query or "").strip()
         if not q:
             return []
 
-        per_page = max(1, min(int(limit), 5))
-        params = {"search": q, "per_page": per_page, "sort": "cited_by_count:desc"}
-
-        email = os.getenv("EMAIL")
-        if email:
-            params["mailto"] = email
+        per_page = max(1, min(int(limit), self.MAX_RESULTS))
+        # The shared client adds the polite-pool `mailto` and User-Agent
+        params = {"search": q, "per_page": per_page, "sort": "cited_by_count:desc", "select": PAPER_FIELDS}
 
         try:
-            resp = requests.get(self.BASE, params=params, timeout=self.timeout_s)
-            resp.raise_for_status()
-            payload = resp.json()
+            # Works are parsed one at a time as the body streams in
+            works = self.client.stream_json_items(self.BASE, params=params, timeout=self.timeout_s)
+            return self.parse_works(works, per_page)
         except Exception as e:
             logger.debug("OpenAlex search failed: %s", e)
             return []
 
+    def search_from_works(self, works, limit: int = 5) -> List[Paper]:
+        """Select papers from a util.openalex_works.SharedWorksQuery instead of a new request.
+
+        The fused query uses the same `cited_by_count:desc` sort as `search`, so its
+        first `limit` works are exactly what `search` would have returned.
+        """
+        results = works.results()
+        if not results:
+            return []
+        return self.parse_works(results, max(1, min(int(limit), self.MAX_RESULTS)))
+
+    def parse_works(self, results: Iterable[Dict], limit: Optional[int] = None) -> List[Paper]:
+        """Convert OpenAlex work objects (a list or a stream) to paper dicts, keeping at most `limit`."""
         out: List[Paper] = []
-        for item in (payload.get("results") or []):
+        for item in results:
+            if limit is not None and len(out) >= limit:
+                break
             title = (item.get("display_name") or "").strip()
 
             # OpenAlex may provide an abstract string or an inverted index
@@ -54,11 +76,8 @@ class OpenAlexProvider:
             if not abstract:
                 inv = item.get("abstract_inverted_index") or {}
                 if inv:
-                    # Reconstruct roughly (join tokens) — keep short
                     try:
-                        # abstract_inverted_index is {token: [positions]}
-                        tokens = sorted(inv.items(), key=lambda x: x[1][0] if x[1] else 0)
-                        abstract = " ".join(t[0] for t in tokens)[:1000]
+                        abstract = reconstruct_abstract(inv)
                     except Exception:
                         abstract = ""
 
@@ -81,12 +100,17 @@ class OpenAlexProvider:
             if not title:
                 continue
 
-            out.append({
+            paper = {
                 "title": title,
                 "summary": abstract or "",
                 "year": year_int,
                 "source": source or "OpenAlex",
                 "cited_by_count": cited_val,
-            })
+            }
+            # DOI lets citation enrichment use Semantic Scholar's batch endpoint
+            doi = (item.get("doi") or "").strip()
+            if doi:
+                paper["doi"] = doi.replace("https://doi.org/", "")
+            out.append(paper)
 
         return out
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
 import os
-from typing import Dict, List
-import requests
+from typing import Dict, List, Optional
+
+from util.cache import cached
+from util.http_client import HttpClient, get_http_client
 
 Paper = Dict[str, object]  # {"title": str, "summary": str, "year": int}
 
@@ -20,27 +22,39 @@ class SemanticScholarProvider:
       - No PDF downloads
     """
     BASE_URL = "https://api.semanticscholar.org/graph/v1/paper/search"
+    BATCH_URL = "https://api.semanticscholar.org/graph/v1/paper/batch"
+    BATCH_MAX_IDS = 500  # documented limit of the batch endpoint
     FIELDS = "title,abstract,year,venue"
+    MAX_RESULTS = 100  # above 5 only for LiteratureService large-pool re-ranking
 
-    def __init__(self, timeout_s: int = 10) -> None:
+    def __init__(self, timeout_s: int = 10, client: Optional[HttpClient] = None) -> None:
         self.timeout_s = timeout_s
+        self._client = client
+
+    @property
+    def client(self) -> HttpClient:
+        return self._client or get_http_client()
+
+    @staticmethod
+    def _headers() -> Dict[str, str]:
+        headers = {}
+        api_key = os.getenv("SEMANTIC_SCHOLAR_API_KEY")
+        if api_key:
+            headers["x-api-key"] = api_key
+        return headers
 
+    @cached("semantic_scholar", "paper.search")
     def search(self, query: str, limit: int = 5) -> List[Paper]:
         query = (query or "").strip()
         if not query:
             return []
 
-        limit = max(1, min(int(limit), 5))
-
-        headers = {"User-Agent": "literature-surveyor/phase4"}
-        api_key = os.getenv("SEMANTIC_SCHOLAR_API_KEY")
-        if api_key:
-            headers["x-api-key"] = api_key
+        limit = max(1, min(int(limit), self.MAX_RESULTS))
 
         params = {"query": query, "limit": limit, "fields": self.FIELDS}
 
         try:
-            resp = requests.get(self.BASE_URL, params=params, headers=headers, timeout=self.timeout_s)
+            resp = self.client.get(self.BASE_URL, params=params, headers=self._headers(), timeout=self.timeout_s)
             resp.raise_for_status()
             payload = resp.json()
         except Exception:
@@ -66,6 +80,42 @@ class SemanticScholarProvider:
 
         return out
 
+    def get_citation_counts(self, paper_ids: List[str]) -> List[int | None]:
+        """Look up citationCount for many papers in one batch request.
+
+        `paper_ids` use Semantic Scholar's id syntax (e.g. "DOI:10.1145/..."). The
+        result is aligned with the input; unknown papers map to None. Raises on
+        transport or HTTP errors so callers can tell "not found" from "failed".
+        """
+        if not paper_ids:
+            return []
+
+        counts: List[int | None] = []
+        for start in range(0, len(paper_ids), self.BATCH_MAX_IDS):
+            chunk = paper_ids[start:start + self.BATCH_MAX_IDS]
+            resp = self.client.post(
+                self.BATCH_URL,
+                params={"fields": "citationCount"},
+                json={"ids": chunk},
+                headers=self._headers(),
+                timeout=self.timeout_s,
+            )
+            resp.raise_for_status()
+            payload = resp.json() or []
+
+            chunk_counts: List[int | None] = []
+            for item in payload[:len(chunk)]:
+                cit = (item or {}).get("citationCount")
+                try:
+                    chunk_counts.append(int(cit) if cit is not None else None)
+                except Exception:
+                    chunk_counts.append(None)
+            # Keep alignment with the input even if the API returned fewer entries
+            chunk_counts.extend([None] * (len(chunk) - len(chunk_counts)))
+            counts.extend(chunk_counts)
+
+        return counts
+
     def get_citation_count(self, title: str) -> int | None:
         """Best-effort: query Semantic Scholar for a single-paper citationCount by title.
 
@@ -75,13 +125,9 @@ class SemanticScholarProvider:
             return None
 
         params = {"query": title.strip(), "limit": 1, "fields": "title,citationCount"}
-        headers = {"User-Agent": "literature-surveyor/phase4"}
-        api_key = os.getenv("SEMANTIC_SCHOLAR_API_KEY")
-        if api_key:
-            headers["x-api-key"] = api_key
 
         try:
-            resp = requests.get(self.BASE_URL, params=params, headers=headers, timeout=self.timeout_s)
+            resp = self.client.get(self.BASE_URL, params=params, headers=self._headers(), timeout=self.timeout_s)
             resp.raise_for_status()
             payload = resp.json()
             first = (payload.get("data") or [])[:1]
@@ -1,12 +1,44 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Dict, List
+import contextvars
+import logging
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from dataclasses import dataclass, field
+from functools import partial
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
 
 from .openalex_provider import OpenAlexProvider
 from .semantic_scholar import SemanticScholarProvider
 from .arxiv_provider import ArxivProvider
+from .local_index import LocalIndex, open_local_index
 from .mock_papers import get_mock_papers
+from util.concurrency import get_hedge_executor, run_parallel
+from util.deadline import Deadline, current_deadline, deadline_scope
+
+if TYPE_CHECKING:
+    from .dense_index import DenseIndexProvider
+
+logger = logging.getLogger(__name__)
+
+
+def _env_seconds(name: str) -> Optional[float]:
+    value = (os.getenv(name) or "").strip()
+    return float(value) if value else None
+
+
+def _open_dense_provider():
+    """Dense index provider from LS_DENSE_INDEX_DIR; numpy is imported only when it is set."""
+    if not os.getenv("LS_DENSE_INDEX_DIR"):
+        return None
+    try:
+        from .dense_index import open_dense_provider
+    except Exception:
+        logger.exception("Dense literature index unavailable")
+        return None
+    return open_dense_provider()
+
 
 Paper = Dict[str, object]  # {"title": str, "summary": str, "year": int}
 
@@ -28,64 +60,247 @@ class LiteratureService:
     openalex: OpenAlexProvider = OpenAlexProvider()
     semantic: SemanticScholarProvider = SemanticScholarProvider()
     arxiv: ArxivProvider = ArxivProvider()
+    # Overall time allowed for Semantic Scholar citation enrichment; when it
+    # passes, the OpenAlex counts are returned unchanged.
+    enrich_deadline_s: float = float(os.getenv("LS_ENRICH_DEADLINE_S", "3"))
+    # Hedged provider fallback: None keeps the strictly sequential order; 0 runs
+    # all providers at once; > 0 starts the secondaries after that many seconds.
+    hedge_delay_s: Optional[float] = _env_seconds("LS_HEDGE_DELAY_S")
+    # Hedged mode returns the best result available at this deadline
+    hedge_deadline_s: float = float(os.getenv("LS_HEDGE_DEADLINE_S", "12"))
+    # Offline BM25 index (LS_LOCAL_INDEX_DIR) consulted before any live provider
+    local_index: Optional[LocalIndex] = field(default_factory=open_local_index)
+    # Local hits are used only if every returned paper matches at least this
+    # fraction of the query terms; otherwise the live providers are queried
+    local_min_coverage: float = float(os.getenv("LS_LOCAL_INDEX_MIN_COVERAGE", "0.75"))
+    # Semantic search over cached papers (LS_DENSE_INDEX_DIR), tried after OpenAlex
+    dense: Optional["DenseIndexProvider"] = field(default_factory=_open_dense_provider)
+    # Large-pool mode: fetch this many candidates from the providers and return
+    # the best `limit` by domain-aware BM25 (quality_filter.scoring); 0 = off
+    pool_size: int = int(os.getenv("LS_LITERATURE_POOL", "0"))
 
-    def fetch(self, query: str, limit: int = 5) -> List[Paper]:
+    def fetch(self, query: str, limit: int = 5, works=None) -> List[Paper]:
+        """
+        `works` is an optional util.openalex_works.SharedWorksQuery for `query`;
+        when given, OpenAlex papers are taken from the /works response shared with
+        venue discovery instead of a separate request.
+
+        A configured local index answers confident matches without any network
+        call. Otherwise providers are tried in priority order OpenAlex ->
+        dense index (if configured) -> Semantic Scholar -> arXiv. With `hedge_delay_s` set, the lower-priority
+        providers are launched in parallel after that delay instead of waiting
+        for OpenAlex to fail.
+
+        With `pool_size` set, providers return up to that many candidates and
+        the best `limit` for `query` are kept (see `_rerank`). Citation
+        enrichment then runs only for those `limit` papers.
+        """
         query = (query or "").strip()
         limit = max(3, min(int(limit), 5))  # enforce 3–5
 
         if not query:
             return get_mock_papers(limit)
 
-        # 1) Try OpenAlex (prefer OpenAlex for citation counts)
-        papers = []
-        try:
-            papers = self.openalex.search(query=query, limit=limit)
-        except Exception:
-            papers = []
+        if self.local_index is not None:
+            papers = self._fetch_local(query, limit)
+            if papers:
+                return papers
 
-        # If we got OpenAlex results, best-effort enrich their citation counts
-        if papers:
-            enriched = []
-            for p in papers:
-                try:
-                    sem_cit = self.semantic.get_citation_count(p.get("title", ""))
-                    oa_cit = p.get("cited_by_count")
-                    try:
-                        oa_val = int(oa_cit) if oa_cit is not None else 0
-                    except Exception:
-                        oa_val = 0
-                    if sem_cit is not None:
-                        p["cited_by_count"] = max(oa_val, int(sem_cit))
-                except Exception:
-                    # ignore enrichment errors; keep original OA value
-                    pass
-                enriched.append(p)
-            papers = enriched
-
-        papers = self._normalize(papers, limit)
+        providers = self._providers(query, limit, works)
+        if self.hedge_delay_s is None:
+            papers = self._fetch_sequential(providers)
+        else:
+            papers = self._fetch_hedged(providers)
         if papers:
             return papers
 
-        # 2) Try Semantic Scholar
+        # 4) All providers failed -> mocks
+        return get_mock_papers(limit)
+
+    def _fetch_local(self, query: str, limit: int) -> List[Paper]:
+        """Papers from the local index, or [] when its matches are not confident."""
         try:
-            papers = self.semantic.search(query=query, limit=limit)
+            hits = self.local_index.search_scored(query, limit)
         except Exception:
-            papers = []
-        papers = self._normalize(papers, limit)
-        if papers:
-            return papers
+            logger.exception("Local index search failed")
+            return []
+        if len(hits) < limit or min(coverage for _, coverage, _ in hits) < self.local_min_coverage:
+            logger.debug("Local index not confident for '%s'; using live providers", query)
+            return []
+        logger.info("Literature served by local index for '%s'", query)
+        return self._normalize([paper for _, _, paper in hits], limit)
 
-        # 3) Fallback to arXiv
+    def _rerank(self, query: str, papers: List[Paper], limit: int) -> List[Paper]:
+        """Best `limit` of a candidate pool for `query`; provider order fills any shortfall."""
         try:
-            papers = self.arxiv.search(query=query, limit=limit)
+            from quality_filter.scoring import rank_texts
+
+            ranked = rank_texts(query, [f"{p.get('title')} {p.get('title')} {p.get('summary') or ''}" for p in papers], limit)
         except Exception:
-            papers = []
-        papers = self._normalize(papers, limit)
-        if papers:
-            return papers
+            logger.exception("Literature re-ranking failed; keeping provider order")
+            return papers[:limit]
+        chosen = [i for i, _ in ranked]
+        taken = set(chosen)
+        chosen += [i for i in range(len(papers)) if i not in taken][:limit - len(chosen)]
+        return [papers[i] for i in chosen]
 
-        # 4) Both failed -> mocks
-        return get_mock_papers(limit)
+    def _providers(self, query: str, limit: int, works=None) -> List[Tuple[str, Callable[[], List[Paper]]]]:
+        """(name, call) pairs in priority order; each call returns `limit` normalized papers.
+
+        Providers are asked for `pool_size` candidates when that is larger, and
+        the pool is cut to the best `limit` before anything else touches it.
+        """
+        fetch_limit = max(limit, self.pool_size)
+
+        def select(papers: List[Paper]) -> List[Paper]:
+            return self._rerank(query, papers, limit) if papers and len(papers) > limit else papers
+
+        # 1) OpenAlex (prefer OpenAlex for citation counts)
+        def from_openalex() -> List[Paper]:
+            if works is not None:
+                papers = self.openalex.search_from_works(works, limit=fetch_limit)
+            else:
+                papers = self.openalex.search(query=query, limit=fetch_limit)
+            # If we got OpenAlex results, best-effort enrich the survivors' citation counts
+            papers = select(papers)
+            if papers:
+                papers = self._enrich_citations(papers)
+            return self._normalize(papers, limit)
+
+        providers = [("openalex", from_openalex)]
+        # 2) Dense index over cached papers, 3) Semantic Scholar, 4) arXiv
+        if self.dense is not None:
+            providers.append(("dense_index", lambda: self._normalize(select(self.dense.search(query=query, limit=fetch_limit)), limit)))
+        return providers + [
+            ("semantic_scholar", lambda: self._normalize(select(self.semantic.search(query=query, limit=fetch_limit)), limit)),
+            ("arxiv", lambda: self._normalize(select(self.arxiv.search(query=query, limit=fetch_limit)), limit)),
+        ]
+
+    def _fetch_sequential(self, providers: List[Tuple[str, Callable[[], List[Paper]]]]) -> List[Paper]:
+        for name, call in providers:
+            try:
+                papers = call()
+            except Exception:
+                logger.debug("Literature provider %s failed", name, exc_info=True)
+                papers = []
+            if papers:
+                return papers
+        return []
+
+    def _fetch_hedged(self, providers: List[Tuple[str, Callable[[], List[Paper]]]]) -> List[Paper]:
+        """Hedged fallback: return the highest-priority non-empty result.
+
+        The primary starts immediately; the others start after `hedge_delay_s`
+        (or as soon as the primary comes back empty). A lower-priority answer is
+        only used once every provider above it has come back empty, or when
+        `hedge_deadline_s` (or the request budget, if sooner) passes. Providers
+        still queued at that point are cancelled and running ones are abandoned.
+
+        Providers run on the hedge executor, not the fanout pool that their own
+        `run_parallel` calls (citation enrichment) block on.
+        """
+        executor = get_hedge_executor()
+        start = time.monotonic()
+        budget = current_deadline()
+        deadline = start + min(self.hedge_deadline_s, budget.remaining() if budget else self.hedge_deadline_s)
+        launch_at = start + max(0.0, self.hedge_delay_s or 0.0)
+
+        def submit(i: int) -> Future:
+            return executor.submit(contextvars.copy_context().run, providers[i][1])
+
+        futures: Dict[int, Future] = {0: submit(0)}
+        results: Dict[int, List[Paper]] = {}
+
+        try:
+            while True:
+                # Collect finished providers
+                for i, fut in futures.items():
+                    if i not in results and fut.done():
+                        try:
+                            results[i] = fut.result() or []
+                        except Exception:
+                            logger.debug("Literature provider %s failed", providers[i][0], exc_info=True)
+                            results[i] = []
+
+                # Winner: first provider in priority order that is done and
+                # non-empty, with every provider ahead of it done and empty.
+                for i in range(len(providers)):
+                    if i not in results:
+                        break
+                    if results[i]:
+                        logger.info("Literature served by %s after %.2fs", providers[i][0], time.monotonic() - start)
+                        return results[i]
+                else:
+                    return []
+
+                now = time.monotonic()
+                if now >= deadline:
+                    for i in sorted(results):
+                        if results[i]:
+                            logger.info("Literature deadline hit; using %s", providers[i][0])
+                            return results[i]
+                    logger.warning("Literature deadline hit with no provider results")
+                    return []
+
+                if len(futures) < len(providers) and (now >= launch_at or 0 in results):
+                    for i in range(len(providers)):
+                        if i not in futures:
+                            futures[i] = submit(i)
+
+                pending = [f for i, f in futures.items() if i not in results]
+                wake_at = deadline if len(futures) == len(providers) else min(deadline, launch_at)
+                wait(pending, timeout=max(0.0, wake_at - now), return_when=FIRST_COMPLETED)
+        finally:
+            for fut in futures.values():
+                fut.cancel()
+
+    def _enrich_citations(self, papers: List[Paper]) -> List[Paper]:
+        """Raise OpenAlex citation counts to Semantic Scholar's where S2 knows more.
+
+        Papers with a DOI are resolved in one batch request; the rest fall back to
+        per-title searches fanned out concurrently. Everything runs under
+        `enrich_deadline_s`; lookups that miss the deadline leave counts unchanged.
+        The lookups also see it as their request budget, so abandoned ones stop
+        waiting for S2 rate-limit slots (and time out on the wire) at the same
+        point instead of when the whole request's budget runs out.
+        """
+        doi_idx = [i for i, p in enumerate(papers) if p.get("doi")]
+        calls = {}
+        if doi_idx:
+            ids = [f"DOI:{papers[i]['doi']}" for i in doi_idx]
+            calls["batch"] = partial(self.semantic.get_citation_counts, ids)
+        for i, p in enumerate(papers):
+            if not p.get("doi"):
+                calls[f"title:{i}"] = partial(self.semantic.get_citation_count, p.get("title", ""))
+
+        outer = current_deadline()
+        budget = self.enrich_deadline_s if outer is None else min(self.enrich_deadline_s, outer.remaining())
+        with deadline_scope(Deadline(budget)):
+            results = run_parallel(calls, timeout=self.enrich_deadline_s)
+
+        sem_counts: Dict[int, int | None] = {}
+        for i, cit in zip(doi_idx, results.get("batch") or []):
+            sem_counts[i] = cit
+        for key, cit in results.items():
+            if key.startswith("title:"):
+                sem_counts[int(key.split(":", 1)[1])] = cit
+
+        for i, sem_cit in sem_counts.items():
+            if sem_cit is None:
+                continue
+            p = papers[i]
+            try:
+                oa_val = int(p.get("cited_by_count") or 0)
+            except Exception:
+                oa_val = 0
+            try:
+                p["cited_by_count"] = max(oa_val, int(sem_cit))
+            except Exception:
+                # ignore enrichment errors; keep original OA value
+                pass
+
+        logger.debug("Enriched %d/%d citation counts", len(sem_counts), len(papers))
+        return papers
 
     def _normalize(self, papers: List[Paper], limit: int) -> List[Paper]:
         out: List[Paper] = []
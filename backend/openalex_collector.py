@@ -1,10 +1,25 @@
-import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-import requests
+import argparse
+import json
+import os
+import sys
+import threading
 import pandas as pd
 import time
 from dotenv import load_dotenv
 
+from util.http_client import get_http_client
+from util.openalex_works import reconstruct_abstract
+from util.rate_limit import BATCH
+
+# Optional: Parquet output for harvests (JSON Lines otherwise)
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except Exception:
+    pa = pq = None
+
 # --- Configuration & Setup ---
 
 # 1. Locate and Load .env file
@@ -16,71 +31,271 @@ if env_path.exists():
 else:
     print("Warning: .env file not found.")
 
-# 2. Get Environment Variables
-EMAIL = os.getenv("EMAIL")
+# 2. Endpoint (EMAIL from .env is applied as 'mailto' by the shared HTTP client)
 OPENALEX_API_URL = "https://api.openalex.org/works"
 
 # --- Core Functions ---
 
+# Root fields read by process_work (OpenAlex `select` projection)
+WORK_FIELDS = "id,display_name,publication_year,cited_by_count,primary_location,authorships"
+
 def search_openalex(topic, num_results=20):
     print(f"\n Searching OpenAlex for topic: '{topic}'...")
     
+    # The shared client adds 'mailto' (EMAIL) and a consistent User-Agent
     params = {
         'search': topic,
-        'per-page': num_results, 
-        'mailto': EMAIL 
+        'per-page': num_results,
+        'select': WORK_FIELDS,
     }
 
     try:
         start_time = time.time()
-        response = requests.get(OPENALEX_API_URL, params=params)
-        
-        if response.status_code == 200:
-            data = response.json()
-            results = data.get('results', [])
-            elapsed = time.time() - start_time
-            print(f" Found {len(results)} works in {elapsed:.2f} seconds.")
-            return process_results(results)
-        else:
-            print(f"Error: {response.status_code}")
-            return None
-            
+        # Collector runs are batch traffic: /generate requests go first.
+        # Works are streamed and reduced to table rows one at a time, so the
+        # full response is never held in memory.
+        works = get_http_client().stream_json_items(OPENALEX_API_URL, params=params, timeout=30, priority=BATCH)
+        df = process_results(works)
+        elapsed = time.time() - start_time
+        print(f" Found {len(df)} works in {elapsed:.2f} seconds.")
+        return df
+
     except Exception as e:
-        print(f"Connection Error: {e}")
+        print(f"Request Error: {e}")
         return None
 
-def process_results(results):
-    papers = []
+def process_work(work):
+    # Authors
+    authorships = work.get('authorships') or []
+    authors = [a['author']['display_name'] for a in authorships]
+    author_str = ", ".join(authors[:2]) # Keep strictly short
+    if len(authors) > 2:
+        author_str += " et al."
     
-    for work in results:
-        # Authors
-        authorships = work.get('authorships', [])
-        authors = [a['author']['display_name'] for a in authorships]
-        author_str = ", ".join(authors[:2]) # Keep strictly short
-        if len(authors) > 2:
-            author_str += " et al."
-        
-        # Venue extraction (Critical for your requirement)
-        primary_loc = work.get('primary_location') or {}
-        source = primary_loc.get('source') or {}
-        venue = source.get('display_name', 'Unknown Venue')
-        
-        # Type (Journal, Conference, etc.)
-        venue_type = source.get('type', 'Unknown').title()
-        
-        papers.append({
-            'Title': work.get('display_name', 'No Title'),
-            'Venue': venue,             # <--- The Focus
-            'Type': venue_type,         # <--- Helpful metadata
-            'Year': work.get('publication_year', 'N/A'),
-            'Cited By': work.get('cited_by_count', 0),
-            'Authors': author_str
-        })
-        
-    return pd.DataFrame(papers)
+    # Venue extraction (Critical for your requirement)
+    primary_loc = work.get('primary_location') or {}
+    source = primary_loc.get('source') or {}
+    venue = source.get('display_name', 'Unknown Venue')
+    
+    # Type (Journal, Conference, etc.)
+    venue_type = (source.get('type') or 'Unknown').title()
+    
+    return {
+        'Title': work.get('display_name', 'No Title'),
+        'Venue': venue,             # <--- The Focus
+        'Type': venue_type,         # <--- Helpful metadata
+        'Year': work.get('publication_year', 'N/A'),
+        'Cited By': work.get('cited_by_count', 0),
+        'Authors': author_str
+    }
+
+def process_results(results):
+    # `results` may be a list or a stream of works
+    return pd.DataFrame([process_work(work) for work in results])
+
+# --- Harvest Mode ---
+
+HARVEST_PER_PAGE = 200        # OpenAlex maximum page size
+HARVEST_ROWS_PER_FILE = 10000  # rows buffered per shard before a part file is written
+HARVEST_PAGE_RETRIES = 3
+# Harvest rows also keep abstract and DOI, for literature/local_index.py
+HARVEST_FIELDS = WORK_FIELDS + ",doi,abstract_inverted_index"
+
+class Harvester:
+    """
+    Walks OpenAlex cursor pagination for a topic, for tens of thousands of works.
+
+    A cursor chain is inherently sequential, so the query is sharded by
+    publication year and up to `workers` shards are paged concurrently, all as
+    BATCH traffic under the shared per-host rate limiter (interactive requests
+    keep priority). Records stream into part files of `rows_per_file` rows
+    (Parquet when pyarrow is installed, JSON Lines otherwise), each written
+    atomically; the checkpoint then records the shard's cursor, so an
+    interrupted harvest resumes exactly where its last part file ended.
+    """
+
+    def __init__(self, topic, out_dir, years=None, max_works=None, workers=4, rows_per_file=HARVEST_ROWS_PER_FILE, client=None):
+        self.topic = topic
+        self.out_dir = Path(out_dir)
+        self.years = list(years) if years else [None]
+        self.max_works = max_works
+        self.workers = max(1, workers)
+        self.rows_per_file = rows_per_file
+        self.client = client or get_http_client()
+        self.format = "parquet" if pq is not None else "jsonl"
+        self.checkpoint_path = self.out_dir / "checkpoint.json"
+
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._works = 0
+        self._started = time.time()
+        self._state = self._load_checkpoint()
+
+    def _load_checkpoint(self):
+        shards = {str(y) if y else "all": {"cursor": "*", "files": 0, "works": 0, "done": False} for y in self.years}
+        if self.checkpoint_path.exists():
+            state = json.loads(self.checkpoint_path.read_text())
+            if state.get("topic") != self.topic:
+                raise ValueError(f"{self.checkpoint_path} belongs to a harvest of '{state.get('topic')}'")
+            self.format = state.get("format", self.format)
+            # New shards (a wider year range) start from scratch
+            for key, shard in shards.items():
+                state["shards"].setdefault(key, shard)
+            return state
+        return {"topic": self.topic, "format": self.format, "shards": shards}
+
+    def _save_checkpoint(self):
+        tmp = self.checkpoint_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self._state, indent=2))
+        os.replace(tmp, self.checkpoint_path)
+
+    def _write_part(self, key, seq, rows):
+        path = self.out_dir / f"works-{key}-{seq:05d}.{self.format}"
+        tmp = path.with_suffix(".tmp")
+        if self.format == "parquet":
+            pq.write_table(pa.Table.from_pylist(rows), tmp)
+        else:
+            with open(tmp, "w", encoding="utf-8") as f:
+                for row in rows:
+                    f.write(json.dumps(row, ensure_ascii=False) + "\n")
+        os.replace(tmp, path)
+
+    def _commit(self, key, rows, cursor, done):
+        """Persist buffered rows, then advance the shard's checkpoint past them."""
+        with self._lock:
+            shard = self._state["shards"][key]
+        if rows:
+            self._write_part(key, shard["files"], rows)
+        with self._lock:
+            shard["files"] += 1 if rows else 0
+            shard["works"] += len(rows)
+            shard["cursor"] = cursor
+            shard["done"] = done
+            self._save_checkpoint()
+
+    def _progress(self, n):
+        with self._lock:
+            self._works += n
+            total = self._works
+            if self.max_works and total >= self.max_works:
+                self._stop.set()
+        elapsed = time.time() - self._started
+        print(f" [harvest] {total:,} works | {total / elapsed if elapsed else 0:,.1f} works/s")
+
+    def _fetch_page(self, year, cursor):
+        params = {
+            'search': self.topic,
+            'per-page': HARVEST_PER_PAGE,
+            'cursor': cursor,
+            'select': HARVEST_FIELDS,
+        }
+        if year:
+            params['filter'] = f"publication_year:{year}"
+        for attempt in range(HARVEST_PAGE_RETRIES):
+            try:
+                preceding = {}
+                # Rows are built as works stream in; the raw page is never held
+                rows = [
+                    {
+                        'OpenAlex ID': work.get('id'),
+                        'DOI': work.get('doi'),
+                        **process_work(work),
+                        'Abstract': reconstruct_abstract(work.get('abstract_inverted_index') or {}, max_chars=None),
+                    }
+                    for work in self.client.stream_json_items(
+                        OPENALEX_API_URL, params=params, timeout=60, priority=BATCH, preceding=preceding
+                    )
+                ]
+                return rows, (preceding.get("meta") or {}).get("next_cursor")
+            except Exception as e:
+                if attempt == HARVEST_PAGE_RETRIES - 1:
+                    raise
+                print(f" [harvest] page failed ({e}); retrying")
+                time.sleep(2 ** attempt)
+
+    def _harvest_shard(self, year):
+        key = str(year) if year else "all"
+        with self._lock:
+            cursor = self._state["shards"][key]["cursor"]
+        rows = []
+        done = False
+        try:
+            while not done and not self._stop.is_set():
+                page, next_cursor = self._fetch_page(year, cursor)
+                rows.extend(page)
+                cursor = next_cursor
+                done = not page or not cursor
+                self._progress(len(page))
+                if len(rows) >= self.rows_per_file:
+                    self._commit(key, rows, cursor, done)
+                    rows = []
+        finally:
+            # Also on errors / stop: keep what was fetched, resume from `cursor`
+            self._commit(key, rows, cursor, done)
+
+    def run(self):
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        pending = [y for y in self.years if not self._state["shards"][str(y) if y else "all"]["done"]]
+        print(f" Harvesting '{self.topic}' into {self.out_dir} ({self.format}, {len(pending)} shards, {self.workers} workers)")
+
+        self._started = time.time()
+        pool = ThreadPoolExecutor(max_workers=self.workers)
+        interrupted = False
+        try:
+            for future in [pool.submit(self._harvest_shard, y) for y in pending]:
+                try:
+                    future.result()
+                except Exception as e:
+                    print(f" [harvest] shard failed, resume to retry: {e}")
+        except KeyboardInterrupt:
+            # Stop before joining: running shards finish their current page and
+            # commit it; shards that have not started are dropped
+            interrupted = True
+            self._stop.set()
+            print(" [harvest] interrupted; saving checkpoint...")
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+        if interrupted:
+            print(" [harvest] checkpoint saved, rerun to resume")
+
+        elapsed = time.time() - self._started
+        summary = {
+            "works": self._works,
+            "seconds": round(elapsed, 1),
+            "works_per_s": round(self._works / elapsed, 1) if elapsed else None,
+            "total_works": sum(s["works"] for s in self._state["shards"].values()),
+            "complete": all(s["done"] for s in self._state["shards"].values()),
+        }
+        print(f" Harvest finished: {summary}")
+        return summary
+
+
+def _harvest_cli(argv):
+    parser = argparse.ArgumentParser(prog="openalex_collector.py harvest", description="Cursor-paginated OpenAlex harvest")
+    parser.add_argument("topic")
+    parser.add_argument("--out", default=None, help="output directory (default: harvest_<topic>)")
+    parser.add_argument("--from-year", type=int, help="shard by publication year from this year...")
+    parser.add_argument("--to-year", type=int, help="...up to this year (inclusive)")
+    parser.add_argument("--max-works", type=int, default=None, help="stop after roughly this many works")
+    parser.add_argument("--workers", type=int, default=4, help="shards paged concurrently")
+    args = parser.parse_args(argv)
+
+    years = None
+    if args.from_year or args.to_year:
+        to_year = args.to_year or time.localtime().tm_year
+        years = range(args.from_year or to_year, to_year + 1)
+    safe_topic = "".join([c for c in args.topic if c.isalnum()]).strip()
+    out_dir = Path(args.out) if args.out else script_dir / f"harvest_{safe_topic}"
+    Harvester(args.topic, out_dir, years=years, max_works=args.max_works, workers=args.workers).run()
+
 
 # --- Main Execution ---
 if __name__ == "__main__":
+    # python openalex_collector.py harvest "<topic>" [--from-year Y --to-year Y --max-works N]
+    if len(sys.argv) > 1 and sys.argv[1] == "harvest":
+        _harvest_cli(sys.argv[2:])
+        sys.exit(0)
+
     # Settings to de-clutter the output
     pd.set_option('display.max_colwidth', 30) # Cut off long titles
     pd.set_option('display.expand_frame_repr', False) # Don't wrap rows
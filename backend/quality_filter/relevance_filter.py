@@ -1,8 +1,14 @@
 from typing import List, Dict
+import functools
 import logging
+import os
+
+from .matcher import get_matcher
+
 logger = logging.getLogger(__name__)
 
 
+# Fallback relevance keywords, used when the domain gives nothing to score against
 KEYWORDS = [
     "llm",
     "language model",
@@ -13,20 +19,42 @@ KEYWORDS = [
     "generative"
 ]
 
+# Match keywords only as whole words / phrases ("gpt" no longer hits "chatgpt")
+WORD_BOUNDARY = os.getenv("LS_QUALITY_WORD_BOUNDARY", "").strip().lower() in {"1", "true", "yes"}
+
 
 def _count_keyword_hits(text: str) -> int:
-    text = text.lower()
-    return sum(1 for kw in KEYWORDS if kw in text)
+    return get_matcher(tuple(KEYWORDS), WORD_BOUNDARY).count(text)
 
 
-def filter_venues(domain: str, venues: List[Dict]) -> List[Dict]:
-    filtered = []
+@functools.lru_cache(maxsize=1)
+def _import_scoring():
+    # numpy-backed, so imported on first use to keep it off the app startup
+    # path; without it only the fixed keyword list is available
+    try:
+        from . import scoring
+    except Exception:
+        return None
+    return scoring
+
 
-    for venue in venues:
-        combined_text = f"{venue.get('name', '')} {venue.get('description', '')}"
-        score = _count_keyword_hits(combined_text)
+def _domain_scoring(domain: str):
+    """The scoring module when the domain has usable terms (and numpy is available), else None."""
+    scoring = _import_scoring()
+    return scoring if scoring is not None and scoring.tokenize(domain) else None
 
-        if score >= 1:
+
+def filter_venues(domain: str, venues: List[Dict]) -> List[Dict]:
+    filtered = []
+    texts = [f"{venue.get('name', '')} {venue.get('description', '')}" for venue in venues]
+    scoring = _domain_scoring(domain)
+    if scoring is not None:
+        scores = [round(s, 3) for s in scoring.score_texts(domain, texts).tolist()]
+    else:
+        scores = get_matcher(tuple(KEYWORDS), WORD_BOUNDARY).count_many(texts)
+
+    for venue, score in zip(venues, scores):
+        if score > 0:
             venue["relevance_score"] = score
             filtered.append(venue)
 
@@ -34,12 +62,25 @@ def filter_venues(domain: str, venues: List[Dict]) -> List[Dict]:
 
 
 def filter_papers(domain: str, papers: List[Dict], max_papers: int = 5) -> List[Dict]:
-    scored = []
+    scoring = _domain_scoring(domain)
+    if scoring is not None:
+        # Title counts twice; /ideas callers send either "abstract" or "summary"
+        texts = [
+            f"{paper.get('title', '')} {paper.get('title', '')} {paper.get('abstract') or paper.get('summary') or ''}"
+            for paper in papers
+        ]
+        ranked = []
+        for i, score in scoring.rank_texts(domain, texts, max_papers):
+            papers[i]["relevance_score"] = round(score, 3)
+            ranked.append(papers[i])
+        return ranked
 
-    for paper in papers:
-        combined_text = f"{paper.get('title', '')} {paper.get('abstract', '')}"
-        score = _count_keyword_hits(combined_text)
+    scored = []
+    scores = get_matcher(tuple(KEYWORDS), WORD_BOUNDARY).count_many(
+        [f"{paper.get('title', '')} {paper.get('abstract', '')}" for paper in papers]
+    )
 
+    for paper, score in zip(papers, scores):
         if score >= 2:
             paper["relevance_score"] = score
             scored.append(paper)
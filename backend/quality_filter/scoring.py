@@ -0,0 +1,160 @@
+"""
+Domain-aware relevance scoring over a candidate pool.
+
+Term weights come from the domain and the pool itself; there is no fixed
+keyword list. The domain's terms form the query, and IDF is computed over
+the candidates being ranked. Pseudo-relevance feedback then adds the most
+characteristic terms of the best first-pass matches, at a lower weight. So
+"protein folding" also picks up "alphafold" or "structure" when the pool
+uses them.
+
+Each pool is tokenized once into a CSR term-count matrix: numpy `indptr`,
+`indices` and `data` arrays. Every candidate is scored in one vectorized
+pass over the matrix entries, either BM25 or cosine TF-IDF. `top_k` selects
+the winners with `argpartition` and sorts only those k.
+
+    scores = score_texts("graph neural networks", texts)
+    best = top_k(scores, 5)          # indices, best first, score > 0 only
+"""
+from __future__ import annotations
+
+import re
+from itertools import chain
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+# Pseudo-relevance feedback: terms taken from the best first-pass candidates
+FEEDBACK_DOCS = 10
+EXPANSION_TERMS = 8
+EXPANSION_WEIGHT = 0.3
+
+_TOKEN = re.compile(r"[^\W_]+")
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from in into is it of on or the this to with via using based towards "
+    "we our paper study approach method methods results propose proposed new".split()
+)
+
+
+def _normalize(token: str) -> str:
+    """Stopwords -> "", simple plurals folded ("models" -> "model")."""
+    if token in _STOPWORDS:
+        return ""
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        return token[:-1]
+    return token
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased, normalized word tokens without stopwords."""
+    return [t for t in map(_normalize, _TOKEN.findall((text or "").lower())) if t]
+
+
+class TermMatrix:
+    """Sparse (CSR) term counts for a candidate pool, plus its vocabulary."""
+
+    def __init__(self, texts: Sequence[str]) -> None:
+        self.n_docs = len(texts)
+        tokens = list(map(_TOKEN.findall, map(str.lower, texts)))
+        lengths = np.fromiter(map(len, tokens), dtype=np.int64, count=self.n_docs)
+        flat = list(chain.from_iterable(tokens))
+        # Factorize surface forms by hash in C, then normalize each distinct form once
+        hashes = np.fromiter(map(hash, flat), dtype=np.int64, count=len(flat))
+        _, first, inverse = np.unique(hashes, return_index=True, return_inverse=True)
+        self.vocab: Dict[str, int] = {}
+        form_ids = np.array(
+            [self.vocab.setdefault(t, len(self.vocab)) if t else -1 for t in map(_normalize, (flat[i] for i in first))],
+            dtype=np.int64,
+        )
+        self.n_terms = len(self.vocab)
+        term_ids = form_ids[inverse.reshape(-1)] if len(flat) else np.zeros(0, dtype=np.int64)
+        rows = np.repeat(np.arange(self.n_docs, dtype=np.int64), lengths)
+        keep = term_ids >= 0
+        rows, term_ids = rows[keep], term_ids[keep]
+
+        # One (row, term) key per token; unique() both counts and sorts into CSR order
+        width = max(self.n_terms, 1)
+        keys, counts = np.unique(rows * width + term_ids, return_counts=True)
+        self.rows = keys // width
+        self.indices = keys % width
+        self.data = counts.astype(np.float32)
+        self.indptr = np.concatenate([[0], np.cumsum(np.bincount(self.rows, minlength=self.n_docs))])
+        self.doc_len = np.bincount(rows, minlength=self.n_docs).astype(np.float32)
+        self.df = np.bincount(self.indices, minlength=self.n_terms).astype(np.float32)
+
+    def query_vector(self, terms: Sequence[str]) -> np.ndarray:
+        """Dense query weights over the vocabulary (1 per occurrence); unknown terms are dropped."""
+        q = np.zeros(self.n_terms, dtype=np.float32)
+        for t in terms:
+            i = self.vocab.get(t)
+            if i is not None:
+                q[i] += 1.0
+        return q
+
+    def entry_weights(self, method: str = "bm25") -> np.ndarray:
+        """Per-entry document term weight (aligned with `indices` / `data`)."""
+        n = max(self.n_docs, 1)
+        tf = self.data
+        if method == "bm25":
+            idf = np.log1p((n - self.df + 0.5) / (self.df + 0.5))
+            avgdl = max(float(self.doc_len.mean()) if self.n_docs else 0.0, 1.0)
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * self.doc_len[self.rows] / avgdl)
+            return idf[self.indices] * tf * (BM25_K1 + 1) / (tf + norm)
+        if method == "tfidf":
+            idf = np.log((1 + n) / (1 + self.df)) + 1
+            w = (1 + np.log(tf)) * idf[self.indices]
+            norms = np.sqrt(np.bincount(self.rows, weights=w * w, minlength=self.n_docs))
+            return w / np.maximum(norms[self.rows], 1e-12)
+        raise ValueError(f"Unknown scoring method: {method!r}")
+
+    def score(self, query: np.ndarray, weights: np.ndarray) -> np.ndarray:
+        """Score of every document against `query` in one pass over the entries."""
+        return np.bincount(self.rows, weights=weights * query[self.indices], minlength=self.n_docs)
+
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the `k` highest positive scores, best first (argpartition, then sort k)."""
+    positive = np.flatnonzero(scores > 0)
+    if len(positive) > k:
+        positive = positive[np.argpartition(-scores[positive], k - 1)[:k]]
+    return positive[np.argsort(-scores[positive], kind="stable")]
+
+
+def score_texts(
+    domain: str,
+    texts: Sequence[str],
+    method: str = "bm25",
+    expansion_terms: int = EXPANSION_TERMS,
+) -> np.ndarray:
+    """Relevance of each text to `domain`, with weights derived from the pool; 0 = unrelated."""
+    if not texts:
+        return np.zeros(0, dtype=np.float64)
+    matrix = TermMatrix(texts)
+    query = matrix.query_vector(tokenize(domain))
+    if not query.any():
+        return np.zeros(len(texts), dtype=np.float64)
+    weights = matrix.entry_weights(method)
+    scores = matrix.score(query, weights)
+
+    feedback = top_k(scores, FEEDBACK_DOCS)
+    if expansion_terms and len(feedback) > 1:
+        # Terms carrying the most weight across the best matches, excluding the domain's own
+        in_feedback = np.isin(matrix.rows, feedback)
+        mass = np.bincount(matrix.indices[in_feedback], weights=weights[in_feedback], minlength=matrix.n_terms)
+        mass[query > 0] = 0
+        # Only terms shared by several feedback docs, so one outlier can't steer the ranking
+        support = np.bincount(matrix.indices[in_feedback], minlength=matrix.n_terms)
+        mass[support < 2] = 0
+        expand = top_k(mass, expansion_terms)
+        if len(expand):
+            query[expand] += EXPANSION_WEIGHT * mass[expand] / mass[expand[0]]
+            scores = matrix.score(query, weights)
+    return scores
+
+
+def rank_texts(domain: str, texts: Sequence[str], k: int, method: str = "bm25") -> List[Tuple[int, float]]:
+    """(index, score) of the `k` most relevant texts with a positive score, best first."""
+    scores = score_texts(domain, texts, method)
+    return [(int(i), float(scores[i])) for i in top_k(scores, k)]
@@ -1,5 +1,6 @@
-from util.llm_factory import get_llm
+from util.llm_factory import deadline_kwargs, get_llm
 from util.system_prompt import LITERATURE_SYSTEM_PROMPT
+from util.llm_cache import invoke_cached
 
 from typing import Optional, Dict
 import os
@@ -23,9 +24,22 @@ def _compose_message(system_prompt: str, user_question: str) -> str:
     return system
 
 
-def generate_summary(text: str, local_llm: bool = False, provider: str | None = None, temperature: float = 0.7) -> Optional[Dict[str, str]]:
+def _extract_text(response) -> Optional[str]:
+    """Extract textual content from the common response shapes of vendor wrappers."""
+    if response is None:
+        return None
+    if isinstance(response, str):
+        return response
+    if isinstance(response, dict):
+        return response.get("content") or response.get("answer") or response.get("text") or response.get("data")
+    # vendor wrappers commonly return an object with .content or .text
+    return getattr(response, "content", None) or getattr(response, "text", None) or str(response)
+
+
+def generate_summary(text: str, local_llm: bool = False, provider: str | None = None, temperature: float = 0.7, use_cache: bool = True) -> Optional[Dict[str, str]]:
     """
     Generates a summary of the given text using the configured LLM.
+    Repeated prompts are served from the LLM result cache unless `use_cache` is False.
 
     Returns:
       dict with {"provider": "<provider>", "answer": "<text>"} on success
@@ -50,31 +64,20 @@ def generate_summary(text: str, local_llm: bool = False, provider: str | None =
     try:
         # Try invoking. Some wrappers accept formatted messages, some accept raw text.
         # We'll first try to pass the combined text as-is and fall back to .invoke([messages]) if needed.
-        response = None
-        try:
-            response = llm_or_error.invoke(combined)
-        except TypeError:
-            # Some wrappers expect a list of messages or formatted object. Try raw string as fallback
-            response = llm_or_error.invoke(combined)
-        except Exception as inner_e:
-            # In case the wrapper uses .invoke with ChatPromptTemplate earlier, try to extract .content from the response
-            logger.debug("Primary invoke raised: %s", inner_e)
+        # Each attempt is capped to the request's remaining budget (deadline_kwargs).
+        def _invoke():
             try:
-                response = llm_or_error.invoke(combined)
-            except Exception:
-                raise
-
-        # Extract textual content from common shapes
-        summary_text = None
-        if response is None:
-            summary_text = None
-        elif isinstance(response, str):
-            summary_text = response
-        elif isinstance(response, dict):
-            summary_text = response.get("content") or response.get("answer") or response.get("text") or response.get("data")
-        else:
-            # vendor wrappers commonly return an object with .content or .text
-            summary_text = getattr(response, "content", None) or getattr(response, "text", None) or str(response)
+                return llm_or_error.invoke(combined, **deadline_kwargs(llm_or_error))
+            except TypeError:
+                # Some wrappers expect a list of messages or formatted object. Try raw string as fallback
+                return llm_or_error.invoke(combined, **deadline_kwargs(llm_or_error))
+            except Exception as inner_e:
+                # In case the wrapper uses .invoke with ChatPromptTemplate earlier, try to extract .content from the response
+                logger.debug("Primary invoke raised: %s", inner_e)
+                return llm_or_error.invoke(combined, **deadline_kwargs(llm_or_error))
+
+        # Extract textual content from common shapes (cached per provider/model/temperature/prompt)
+        summary_text = invoke_cached(llm_or_error, combined, extract=_extract_text, use_cache=use_cache, invoke=_invoke)
 
         if not summary_text:
             logger.error("LLM returned no textual content.")
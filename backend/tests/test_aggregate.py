@@ -0,0 +1,42 @@
+from venue_discovery.aggregate import VenueAggregator, variant_key
+
+
+def test_variant_key_merges_spellings():
+    assert variant_key("Proc. of the ICML 2024") == variant_key("ICML") == "icml"
+
+
+def _sample(*stats):
+    return {"conferences": [], "journals": [], "stats": [dict(s) for s in stats]}
+
+
+def test_samples_are_summed_across_providers():
+    agg = VenueAggregator("citations")
+    agg.add_result(_sample({"name": "ICML 2023", "kind": "conferences", "papers": 2, "citations": 10}), "openalex")
+    agg.add_result(_sample({"name": "Proceedings of ICML", "kind": "conferences", "papers": 1, "citations": 30},
+                           {"name": "AAAI", "kind": "conferences", "papers": 5, "citations": 20}), "semantic_scholar")
+    ranked = agg.ranked(5)["conferences"]
+    assert [v.name for v in ranked] == ["ICML 2023", "AAAI"]
+    assert (ranked[0].papers, ranked[0].citations, ranked[0].providers) == (3, 40, {"openalex", "semantic_scholar"})
+
+
+def test_ranked_provider_order_beats_sample_counts():
+    agg = VenueAggregator("citations")
+    grouped = _sample(
+        {"name": "NeurIPS", "kind": "conferences", "id": "S1", "papers": 4000, "citations": 900000, "h_index": 400},
+        {"name": "ICML", "kind": "conferences", "id": "S2", "papers": 3000, "citations": 800000, "h_index": 300},
+    )
+    grouped["ranked"] = True
+    agg.add_result(grouped, "openalex")
+    agg.add_result(_sample({"name": "Tiny Workshop on X", "kind": "conferences", "papers": 1, "citations": 1},
+                           {"name": "NeurIPS 2023", "kind": "conferences", "papers": 3, "citations": 50}), "semantic_scholar")
+    assert agg.top(5)["conferences"] == ["NeurIPS", "ICML", "Tiny Workshop on X"]
+    neurips = agg.ranked(1)["conferences"][0]
+    # Source-level totals are never added to the sample sums
+    assert (neurips.papers, neurips.citations, neurips.h_index) == (3, 50, 400)
+
+
+def test_legacy_results_count_one_paper_per_name():
+    agg = VenueAggregator()
+    agg.add_result({"conferences": ["CVPR"], "journals": ["TPAMI", "JMLR"]})
+    agg.add_result({"conferences": [], "journals": ["JMLR"]})
+    assert agg.top(5) == {"conferences": ["CVPR"], "journals": ["JMLR", "TPAMI"]}
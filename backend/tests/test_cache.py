@@ -0,0 +1,61 @@
+import time
+
+from util import cache as cache_module
+from util.cache import DiskCache, LRUCache, TieredCache, cache_key, cached
+
+
+def test_cache_key_ignores_case_whitespace_and_dict_order():
+    a = cache_key("openalex", "works", {"search": "Graph  Neural", "opts": {"b": 1, "a": 2}})
+    b = cache_key("openalex", "works", {"opts": {"a": 2, "b": 1}, "search": " graph neural"})
+    assert a == b
+    assert a != cache_key("s2", "works", {"search": "graph neural", "opts": {"a": 2, "b": 1}})
+
+
+def test_lru_evicts_least_recent_by_bytes():
+    lru = LRUCache(max_bytes=10)
+    far = time.time() + 60
+    lru.set("a", b"1234", far)
+    lru.set("b", b"1234", far)
+    assert lru.get("a") == b"1234"  # "a" is now most recent
+    lru.set("c", b"1234", far)
+    assert lru.get("b") is None
+    assert lru.get("a") == b"1234" and lru.get("c") == b"1234"
+    assert lru.size_bytes == 8 and lru.evictions == 1
+    lru.set("huge", b"x" * 11, far)
+    assert lru.get("huge") is None
+
+
+def test_lru_expires_entries():
+    lru = LRUCache(max_bytes=100)
+    lru.set("a", b"1", time.time() - 1)
+    assert lru.get("a") is None
+    assert lru.size_bytes == 0
+
+
+def test_disk_tier_refills_memory(tmp_path):
+    disk = DiskCache(tmp_path / "cache.sqlite3")
+    TieredCache(LRUCache(1024), disk).set("k", {"v": [1, 2]}, ttl_s=60)
+    fresh = TieredCache(LRUCache(1024), disk)
+    assert fresh.get("k") == (True, {"v": [1, 2]})
+    assert fresh.get("k") == (True, {"v": [1, 2]})
+    stats = fresh.stats()
+    assert (stats["disk_hits"], stats["memory_hits"], stats["misses"]) == (1, 1, 0)
+    assert fresh.get("missing") == (False, None)
+
+
+def test_cached_decorator_skips_client_and_empty_results(monkeypatch):
+    monkeypatch.setattr(cache_module, "_cache", TieredCache(LRUCache(1 << 20)))
+    monkeypatch.setattr(cache_module, "CACHE_DISABLED", False)
+    calls = []
+
+    @cached("openalex", "test")
+    def fetch(query, limit=5, client=None):
+        calls.append((query, limit))
+        return [query] if query != "empty" else []
+
+    assert fetch("Graph", client=object()) == ["Graph"]
+    assert fetch("graph ", client=object()) == ["Graph"]
+    assert fetch("graph", limit=3) == ["graph"]
+    fetch("empty")
+    fetch("empty")
+    assert calls == [("Graph", 5), ("graph", 3), ("empty", 5), ("empty", 5)]
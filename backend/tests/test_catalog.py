@@ -0,0 +1,64 @@
+import gzip
+
+from venue_discovery.catalog import (
+    VenueCatalog,
+    build_catalog,
+    dblp_venues,
+    heuristic_kind,
+    merge_venues,
+    normalize_venue_name,
+    openalex_venues,
+    strip_year,
+)
+
+SOURCES = [
+    {"id": "https://openalex.org/S1", "display_name": "Neural Information Processing Systems", "type": "journal",
+     "alternate_titles": ["NeurIPS"], "works_count": 20000, "cited_by_count": 900000, "summary_stats": {"h_index": 400}},
+    {"id": "https://openalex.org/S2", "display_name": "Journal of Machine Learning Research", "type": "journal",
+     "abbreviated_title": "JMLR", "works_count": 3000, "summary_stats": {"h_index": 250}},
+]
+
+DBLP = b"""<?xml version="1.0" encoding="ISO-8859-1"?>
+<!DOCTYPE dblp SYSTEM "dblp.dtd">
+<dblp>
+<inproceedings key="conf/nips/A21"><title>A</title><booktitle>NeurIPS</booktitle></inproceedings>
+<inproceedings key="conf/nips/B21"><title>B</title><booktitle>NeurIPS</booktitle></inproceedings>
+<inproceedings key="conf/iccv/C21"><title>C&ouml;</title><booktitle>ICCV</booktitle></inproceedings>
+<article key="journals/tmlr/D22"><title>D</title><journal>Trans. Mach. Learn. Res.</journal></article>
+</dblp>
+"""
+
+
+def test_normalization():
+    assert normalize_venue_name("Proc. of the ACL '24") == "proc of the acl 24"
+    assert normalize_venue_name("Señal & Ruido") == "senal and ruido"
+    assert strip_year("neurips 2023") == "neurips"
+    assert heuristic_kind("Proceedings of Foo") == "conferences"
+    assert heuristic_kind("Foo", "journal") == "journals"
+
+
+def test_dblp_import_and_merge(tmp_path):
+    path = tmp_path / "dblp.xml.gz"
+    path.write_bytes(gzip.compress(DBLP))
+    dblp = {v["id"]: v for v in dblp_venues(path)}
+    assert dblp["dblp:conf/nips"]["works_count"] == 2
+    assert dblp["dblp:journals/tmlr"]["kind"] == "journals"
+
+    venues = merge_venues(openalex_venues(SOURCES), dblp.values())
+    neurips = venues[0]
+    # DBLP decides the kind for matched venues
+    assert neurips["kind"] == "conferences"
+    assert {v["id"] for v in venues} == {"S1", "S2", "dblp:conf/iccv", "dblp:journals/tmlr"}
+
+
+def test_catalog_lookup(tmp_path):
+    build_catalog(openalex_venues(SOURCES), tmp_path / "catalog")
+    catalog = VenueCatalog(tmp_path / "catalog")
+    try:
+        assert catalog.lookup(source_id="https://openalex.org/S2")["name"] == "Journal of Machine Learning Research"
+        assert catalog.lookup("neurips")["h_index"] == 400
+        assert catalog.lookup("NeurIPS 2023")["id"] == "S1"
+        assert catalog.lookup("jmlr")["id"] == "S2"
+        assert catalog.lookup("Unknown Venue") is None
+    finally:
+        catalog.close()
@@ -0,0 +1,46 @@
+import pytest
+
+from ideas.combined import CombinedParser, parse_combined
+
+RESPONSE = (
+    '```json\n{"ideas": ["First  idea about graphs", {"title": "Second idea", "why": "x"}, '
+    '{"rationale": "no idea field"}, 42, {"score": 1, "text": "Third \\"quoted\\" idea"}, '
+    '"Fourth idea", ["nested"]], "overview": " A short overview. "}\n```'
+)
+IDEAS = ["First idea about graphs", "Second idea", 'Third "quoted" idea', "Fourth idea"]
+
+
+def _stream(text, size):
+    parser = CombinedParser()
+    emitted = []
+    for i in range(0, len(text), size):
+        emitted += parser.feed(text[i:i + size])
+    return parser, emitted
+
+
+def test_parse_combined_reads_strings_and_idea_objects():
+    assert parse_combined(RESPONSE) == (IDEAS, "A short overview.")
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 5, 8, 13, 1000])
+def test_stream_matches_final_parse(size):
+    parser, emitted = _stream(RESPONSE, size)
+    assert emitted == IDEAS
+    assert parser.ideas == IDEAS
+    assert parser.overview == "A short overview."
+
+
+def test_object_without_idea_field_is_unreadable():
+    assert parse_combined('{"ideas": [{"title": 1}, {"name": "x"}], "overview": "o"}') == ([], "o")
+    assert _stream('{"ideas": [{"title": 1}, {"name": "x"}]}', 4)[1] == []
+
+
+def test_truncated_json_keeps_completed_strings():
+    ideas, overview = parse_combined('{"ideas": ["One idea", {"title": "Two"}, "Thr')
+    assert ideas == ["One idea", "Two"]
+    assert overview == ""
+
+
+@pytest.mark.parametrize("text", ["", "no json here", "1. plain\n2. list"])
+def test_unreadable_text_is_left_to_fallback(text):
+    assert parse_combined(text) == ([], "")
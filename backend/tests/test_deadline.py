@@ -0,0 +1,70 @@
+import time
+
+import pytest
+
+from util.concurrency import run_parallel
+from util.deadline import Deadline, DeadlineExceeded, cap_timeout, current_deadline, deadline_scope
+from util.llm_factory import LLM_TIMEOUT_S, deadline_kwargs
+
+
+def test_cap_timeout_without_budget_is_unchanged():
+    assert cap_timeout(None) is None
+    assert cap_timeout(7.0) == 7.0
+
+
+def test_cap_timeout_clamps_to_remaining_budget():
+    with deadline_scope(Deadline(2.0)):
+        assert cap_timeout(10.0) <= 2.0
+        assert cap_timeout(0.5) == 0.5
+        assert 1.9 < cap_timeout(None) <= 2.0
+
+
+def test_spent_budget_raises():
+    with deadline_scope(Deadline(0.0)):
+        with pytest.raises(DeadlineExceeded):
+            cap_timeout(5.0)
+
+
+def test_deadline_scope_restores_outer_budget():
+    outer = Deadline(30.0)
+    with deadline_scope(outer):
+        with deadline_scope(Deadline(1.0)) as inner:
+            assert current_deadline() is inner
+        assert current_deadline() is outer
+    assert current_deadline() is None
+
+
+def test_run_parallel_sees_budget_and_drops_late_calls():
+    def slow():
+        time.sleep(0.5)
+        return "late"
+
+    with deadline_scope(Deadline(0.2)):
+        start = time.monotonic()
+        results = run_parallel({"fast": lambda: current_deadline().budget_s, "slow": slow}, timeout=10)
+    assert time.monotonic() - start < 0.45
+    assert results == {"fast": 0.2}
+
+
+def test_run_parallel_skips_when_budget_spent():
+    with deadline_scope(Deadline(0.0)):
+        assert run_parallel({"call": lambda: 1}) == {}
+
+
+class ChatOpenAI:  # stands in for the OpenAI-compatible wrapper by class name
+    pass
+
+
+class ChatMistralAI:
+    pass
+
+
+def test_llm_calls_capped_to_remaining_budget():
+    assert deadline_kwargs(ChatOpenAI()) == {"timeout": LLM_TIMEOUT_S}
+    with deadline_scope(Deadline(3.0)):
+        assert 2.9 < deadline_kwargs(ChatOpenAI())["timeout"] <= 3.0
+        # Wrappers without a per-call timeout rely on the construction-time LLM_TIMEOUT_S
+        assert deadline_kwargs(ChatMistralAI()) == {}
+    with deadline_scope(Deadline(0.0)):
+        with pytest.raises(DeadlineExceeded):
+            deadline_kwargs(ChatOpenAI())
@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from literature.dense_index import DenseIndex, DenseIndexProvider, HashingVectorizer, build_dense_index, write_index
+
+TOPICS = ["graph neural networks", "protein folding", "reinforcement learning robots", "galaxy formation"]
+
+
+def _records(per_topic=30):
+    return [
+        {"title": f"{topic} study {i}", "summary": f"we examine {topic} in setting {i}", "year": 2020}
+        for topic in TOPICS for i in range(per_topic)
+    ]
+
+
+def test_vectorizer_rows_are_unit_length():
+    vectors = HashingVectorizer(256).transform(["graph neural networks", "protein", ""])
+    norms = np.linalg.norm(vectors, axis=1)
+    assert np.allclose(norms[:2], 1.0, atol=1e-5)
+    assert norms[2] == 0
+
+
+@pytest.mark.parametrize("dtype, nlist", [("float32", 0), ("float16", 0), ("float32", 4)])
+def test_search_finds_topic(tmp_path, dtype, nlist):
+    build_dense_index(_records(), tmp_path / "dense", dim=512, dtype=dtype, nlist=nlist)
+    index = DenseIndex(tmp_path / "dense", nprobe=2)
+    hits = index.search("protein folding", 5)
+    assert len(hits) == 5
+    assert all("protein folding" in paper["title"] for _, paper in hits)
+    assert [s for s, _ in hits] == sorted((s for s, _ in hits), reverse=True)
+
+
+def test_ivf_matches_exact_scan_when_probing_every_list(tmp_path):
+    rng = np.random.default_rng(1)
+    vectors = rng.normal(size=(400, 32)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    papers = [{"title": f"p{i}"} for i in range(400)]
+    write_index(tmp_path / "flat", vectors, papers, dtype="float32", vectorizer=HashingVectorizer(32))
+    write_index(tmp_path / "ivf", vectors, papers, dtype="float32", nlist=8, vectorizer=HashingVectorizer(32))
+    flat = DenseIndex(tmp_path / "flat")
+    ivf = DenseIndex(tmp_path / "ivf", nprobe=8)
+    queries = vectors[:10]
+    flat_titles = [[flat._doc(r)["title"] for _, r in hits] for hits in flat.search_vectors(queries, 5)]
+    ivf_titles = [[ivf._doc(r)["title"] for _, r in hits] for hits in ivf.search_vectors(queries, 5)]
+    assert flat_titles == ivf_titles
+    assert [t[0] for t in flat_titles] == [f"p{i}" for i in range(10)]
+
+
+def test_provider_needs_three_confident_hits(tmp_path):
+    build_dense_index(_records(), tmp_path / "dense", dim=512)
+    index = DenseIndex(tmp_path / "dense")
+    assert len(DenseIndexProvider(index, min_score=0.1).search("protein folding", 5)) == 5
+    assert DenseIndexProvider(index, min_score=0.99).search("quantum chromodynamics", 5) == []
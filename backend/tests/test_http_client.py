@@ -0,0 +1,49 @@
+import socket
+
+from util import http_client
+from util.http_client import _DnsCache
+
+
+def _fake_getaddrinfo(calls):
+    def getaddrinfo(host, port, family=0, type=0):
+        calls.append(host)
+        return [(socket.AF_INET, socket.SOCK_STREAM, 6, "", ("127.0.0.1", port))]
+    return getaddrinfo
+
+
+def test_dns_cache_hits_and_invalidates(monkeypatch):
+    calls = []
+    monkeypatch.setattr(socket, "getaddrinfo", _fake_getaddrinfo(calls))
+    cache = _DnsCache(ttl_s=60)
+    for _ in range(3):
+        cache.resolve("a.example", 443)
+    assert calls == ["a.example"]
+    cache.invalidate("a.example")
+    cache.resolve("a.example", 443)
+    assert calls == ["a.example", "a.example"]
+    assert cache.stats()["hits"] == 2
+
+
+def test_dns_cache_is_bounded_and_expires(monkeypatch):
+    calls = []
+    monkeypatch.setattr(socket, "getaddrinfo", _fake_getaddrinfo(calls))
+    cache = _DnsCache(ttl_s=60, max_entries=3)
+    for i in range(10):
+        cache.resolve(f"h{i}.example", 443)
+    assert cache.stats()["entries"] == 3
+
+    expired = _DnsCache(ttl_s=0)
+    expired.resolve("a.example", 443)
+    expired.resolve("a.example", 443)
+    assert calls.count("a.example") == 2
+
+
+def test_mailto_only_for_polite_pool_hosts(monkeypatch):
+    monkeypatch.setenv("EMAIL", "me@example.org")
+    client = http_client.HttpClient(http2=False)
+    _, params, headers = client._prepare("https://api.openalex.org/works", None, None)
+    assert params["mailto"] == "me@example.org"
+    assert "me@example.org" in headers["User-Agent"]
+    _, params, headers = client._prepare("https://api.semanticscholar.org/graph/v1/paper/search", None, None)
+    assert "mailto" not in params
+    assert headers["User-Agent"] == http_client.USER_AGENT
@@ -0,0 +1,47 @@
+import json
+
+import pytest
+
+from util.json_stream import iter_json_array
+
+DOC = (
+    '{"meta": {"count": 3, "next_cursor": "IlsxLjVlMyJd", "ratio": -12.5E-3}, '
+    '"results": [1.5e3, 2, -0.25, 0, 10000000000, "caf\\u00e9 \\"quoted\\" ü€", '
+    '{"id": "W1", "nested": [1, {"deep": null}, [true, false]], "score": 3.25e-2}, [], {}, null]}'
+)
+
+
+def _chunks(data: bytes, size: int):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+@pytest.mark.parametrize("size", list(range(1, 17)) + [64, 4096])
+def test_matches_json_loads_at_every_chunk_size(size):
+    expected = json.loads(DOC)
+    preceding = {}
+    got = list(iter_json_array(_chunks(DOC.encode("utf-8"), size), preceding=preceding))
+    assert got == expected["results"]
+    assert preceding == {"meta": expected["meta"]}
+
+
+@pytest.mark.parametrize("size", range(1, 9))
+def test_numbers_split_inside_exponent_and_fraction(size):
+    body = b'{"results":[1.5e3, 2, 7.25, -1E+2]}'
+    assert list(iter_json_array(_chunks(body, size))) == [1500.0, 2, 7.25, -100.0]
+
+
+@pytest.mark.parametrize("body", [b'{}', b'{"results": []}', b'{"results": null}', b'{"meta": {}}'])
+def test_empty_or_missing_array(body):
+    assert list(iter_json_array([body])) == []
+
+
+def test_stops_at_closing_bracket():
+    # Nothing after the array is read, so trailing members do not matter
+    body = b'{"results": [1, 2], "trailing": '
+    assert list(iter_json_array([body])) == [1, 2]
+
+
+@pytest.mark.parametrize("body", [b'[1, 2]', b'{"results": [1 2]}', b'{"results": [1,'])
+def test_malformed_input_raises(body):
+    with pytest.raises(ValueError):
+        list(iter_json_array(_chunks(body, 3)))
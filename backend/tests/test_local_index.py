@@ -0,0 +1,50 @@
+from literature.local_index import LocalIndex, build_index, dedupe_papers, to_paper
+
+RECORDS = [
+    {"title": "Graph Neural Networks for Molecules", "abstract": "message passing on molecular graphs", "year": 2021, "cited_by_count": 10},
+    {"title": "graph neural networks for molecules", "summary": "duplicate copy", "year": 2021, "cited_by_count": 50},
+    {"Title": "Protein Folding with Deep Learning", "Abstract": "structure prediction", "Year": "2020", "Venue": "Nature"},
+    {"display_name": "Reinforcement Learning for Robotics", "publication_year": 2019,
+     "abstract_inverted_index": {"robot": [0], "control": [1]}, "primary_location": {"source": {"display_name": "ICRA"}}},
+    {"title": ""},
+]
+
+
+def test_to_paper_normalizes_record_shapes():
+    paper = to_paper(RECORDS[3])
+    assert paper["title"] == "Reinforcement Learning for Robotics"
+    assert paper["summary"] == "robot control"
+    assert (paper["year"], paper["source"]) == (2019, "ICRA")
+    assert to_paper(RECORDS[2])["year"] == 2020
+    assert to_paper(RECORDS[4]) is None
+
+
+def test_dedupe_keeps_most_cited_copy():
+    papers = dedupe_papers(RECORDS)
+    assert len(papers) == 3
+    assert papers[0]["cited_by_count"] == 50
+
+
+def test_build_and_search(tmp_path):
+    meta = build_index(RECORDS, tmp_path / "index")
+    assert meta["docs"] == 3
+    index = LocalIndex(tmp_path / "index")
+    try:
+        hits = index.search_scored("graph neural molecules", 5)
+        # The more-cited duplicate is the one indexed
+        assert hits[0][2]["cited_by_count"] == 50
+        assert hits[0][1] == 1.0  # every query term matched
+        assert [p["title"] for p in index.search("protein structure")] == ["Protein Folding with Deep Learning"]
+        assert index.search("astronomy") == []
+    finally:
+        index.close()
+
+
+def test_rebuild_replaces_index(tmp_path):
+    build_index(RECORDS, tmp_path / "index")
+    build_index(RECORDS[2:3], tmp_path / "index")
+    index = LocalIndex(tmp_path / "index")
+    try:
+        assert index.docs == 1
+    finally:
+        index.close()
@@ -0,0 +1,27 @@
+from quality_filter.matcher import KeywordMatcher, get_matcher
+
+
+def test_counts_distinct_keywords_case_insensitively():
+    matcher = KeywordMatcher(["LLM", "gpt", "llm", " ", "Attention"])
+    assert matcher.keywords == ("llm", "gpt", "attention")
+    assert matcher.count("LLM attention over GPT-4 and more LLM") == 3
+    assert matcher.hits("ChatGPT") == {"gpt"}
+
+
+def test_word_boundary_mode():
+    matcher = KeywordMatcher(["gpt", "language model"], word_boundary=True)
+    assert matcher.count("ChatGPT is a large language model") == 1
+    assert matcher.hits("GPT-4, a language-model") == {"gpt"}
+    assert matcher.count("gpt") == 1
+
+
+def test_count_many_matches_count():
+    texts = ["GPT and LLM", "", None, "nothing here", "chatgpt llms"]
+    for boundary in (False, True):
+        matcher = KeywordMatcher(["gpt", "llm"], word_boundary=boundary)
+        assert matcher.count_many(texts) == [matcher.count(t) for t in texts]
+
+
+def test_get_matcher_is_cached_per_keyword_set():
+    assert get_matcher(("a", "b")) is get_matcher(("a", "b"))
+    assert get_matcher(("a", "b")) is not get_matcher(("a", "b"), True)
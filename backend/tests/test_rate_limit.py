@@ -0,0 +1,113 @@
+import threading
+import time
+
+import pytest
+
+from util import http_client
+from util.rate_limit import BATCH, INTERACTIVE, RateLimitScheduler, RateLimitTimeout, parse_retry_after
+
+HOST = "api.example.org"
+
+
+def test_unlimited_host_never_waits():
+    scheduler = RateLimitScheduler({})
+    start = time.monotonic()
+    for _ in range(100):
+        scheduler.acquire("other.example.org")
+    assert time.monotonic() - start < 0.1
+
+
+def test_burst_then_rate_spacing():
+    scheduler = RateLimitScheduler({HOST: (20.0, 2)})
+    start = time.monotonic()
+    for _ in range(4):
+        scheduler.acquire(HOST)
+    # Two tokens up front, then one every 50 ms
+    assert 0.08 <= time.monotonic() - start < 0.5
+
+
+def test_acquire_times_out():
+    scheduler = RateLimitScheduler({HOST: (1.0, 1)})
+    scheduler.acquire(HOST)
+    start = time.monotonic()
+    with pytest.raises(RateLimitTimeout):
+        scheduler.acquire(HOST, timeout=0.1)
+    assert time.monotonic() - start < 0.5
+
+
+def test_penalize_pauses_host():
+    scheduler = RateLimitScheduler({HOST: (1000.0, 10)})
+    scheduler.penalize(HOST, 0.2)
+    start = time.monotonic()
+    scheduler.acquire(HOST)
+    assert time.monotonic() - start >= 0.15
+    assert scheduler.stats()[HOST]["throttled"] == 1
+
+
+def test_interactive_served_before_batch():
+    scheduler = RateLimitScheduler({HOST: (10.0, 1)})
+    scheduler.acquire(HOST)  # drain the bucket
+    order = []
+
+    def take(level, name):
+        scheduler.acquire(HOST, level)
+        order.append(name)
+
+    batch = threading.Thread(target=take, args=(BATCH, "batch"))
+    batch.start()
+    time.sleep(0.02)
+    interactive = threading.Thread(target=take, args=(INTERACTIVE, "interactive"))
+    interactive.start()
+    batch.join(2)
+    interactive.join(2)
+    assert order == ["interactive", "batch"]
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [(None, None), ("", None), ("3", 3.0), (" 1.5 ", 1.5), ("-4", 0.0), ("not a date", None)],
+)
+def test_parse_retry_after(value, expected):
+    assert parse_retry_after(value) == expected
+
+
+def test_parse_retry_after_http_date():
+    assert parse_retry_after("Thu, 01 Jan 1970 00:00:00 GMT") == 0.0
+
+
+class _FakeResponse:
+    status_code = 200
+    headers = {}
+
+
+class _RecordingSession:
+    def __init__(self):
+        self.timeouts = []
+
+    def request(self, method, url, timeout=None, **kwargs):
+        self.timeouts.append(timeout)
+        return _FakeResponse()
+
+
+@pytest.fixture
+def client(monkeypatch):
+    scheduler = RateLimitScheduler({HOST: (5.0, 1)})
+    monkeypatch.setattr(http_client, "get_scheduler", lambda: scheduler)
+    client = http_client.HttpClient(http2=False)
+    client._session = _RecordingSession()
+    return client
+
+
+def test_slot_wait_counts_against_request_timeout(client):
+    client.get(f"https://{HOST}/a", timeout=1.0)
+    client.get(f"https://{HOST}/b", timeout=1.0)  # waits ~0.2 s for a token
+    first, second = client._session.timeouts
+    assert first == pytest.approx(1.0, abs=0.05)
+    assert 0.6 < second < 0.9
+
+
+def test_no_time_left_after_slot_wait_fails_fast(client):
+    client.get(f"https://{HOST}/a", timeout=1.0)
+    with pytest.raises(RateLimitTimeout):
+        client.get(f"https://{HOST}/b", timeout=0.2)
+    assert len(client._session.timeouts) == 1
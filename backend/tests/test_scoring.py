@@ -0,0 +1,40 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+
+from quality_filter.scoring import rank_texts, score_texts, tokenize, top_k
+
+BACKEND = Path(__file__).resolve().parent.parent
+
+
+def test_tokenize_drops_stopwords_and_folds_plurals():
+    assert tokenize("Graph Neural Networks for the Models") == ["graph", "neural", "network", "model"]
+
+
+def test_top_k_returns_positive_scores_best_first():
+    scores = np.array([0.0, 3.0, 1.0, 5.0, -1.0, 2.0])
+    assert top_k(scores, 3).tolist() == [3, 1, 5]
+    assert top_k(scores, 10).tolist() == [3, 1, 5, 2]
+
+
+def test_rank_texts_prefers_domain_matches():
+    texts = [
+        "Cooking with seasonal vegetables",
+        "Graph neural networks for molecule property prediction",
+        "A survey of graph neural network architectures",
+        "Stock market volatility forecasting",
+    ]
+    ranked = [i for i, _ in rank_texts("graph neural networks", texts, 5)]
+    assert set(ranked) == {1, 2}
+
+
+def test_unrelated_domain_scores_zero():
+    assert not score_texts("quantum chromodynamics", ["cats and dogs", "tea"]).any()
+
+
+def test_relevance_filter_import_does_not_load_numpy():
+    code = "import sys, quality_filter.relevance_filter; print('numpy' in sys.modules)"
+    out = subprocess.run([sys.executable, "-c", code], cwd=BACKEND, capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "False"
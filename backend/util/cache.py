@@ -0,0 +1,259 @@
+"""
+Two-tier response cache for scholarly provider queries.
+
+Tier 1 is an in-process LRU bounded by total payload bytes. Tier 2 is an
+on-disk SQLite store with zlib-compressed JSON values, shared by every worker
+process on the host and surviving restarts. Entries are keyed on provider,
+endpoint and normalized call parameters, and expire after a per-provider TTL.
+
+Wrap a provider call with `@cached("openalex", "works.search")`. Empty / None
+results are never stored, since providers use them to signal failures.
+"""
+from __future__ import annotations
+
+import functools
+import hashlib
+import inspect
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+CACHE_DISABLED = os.getenv("LS_CACHE_DISABLED", "").strip().lower() in {"1", "true", "yes"}
+CACHE_DISK_ENABLED = os.getenv("LS_CACHE_DISK", "1").strip().lower() not in {"0", "false", "no"}
+CACHE_DIR = Path(os.getenv("LS_CACHE_DIR") or Path(__file__).resolve().parent.parent / ".cache")
+MEMORY_MAX_BYTES = int(os.getenv("LS_CACHE_MEMORY_MAX_BYTES", str(64 * 1024 * 1024)))
+
+# Seconds each provider's answers stay fresh
+PROVIDER_TTLS: Dict[str, float] = {
+    "openalex": 24 * 3600,
+    "semantic_scholar": 24 * 3600,
+    "arxiv": 12 * 3600,
+}
+DEFAULT_TTL_S = 6 * 3600
+
+# Call arguments that never change the upstream answer
+_IGNORED_ARGS = {"self", "client"}
+
+
+def _normalize(value: Any) -> Any:
+    if isinstance(value, str):
+        return " ".join(value.lower().split())
+    if isinstance(value, dict):
+        return {str(k): _normalize(v) for k, v in sorted(value.items())}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    return value
+
+
+def cache_key(provider: str, endpoint: str, params: Dict[str, Any]) -> str:
+    """Stable key for a provider call: case/whitespace-insensitive on strings."""
+    raw = json.dumps([provider, endpoint, _normalize(params)], sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class LRUCache:
+    """Thread-safe LRU of serialized values, evicting once `max_bytes` is exceeded."""
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self.size_bytes = 0
+        self.evictions = 0
+        self._data: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.time():
+                del self._data[key]
+                self.size_bytes -= len(value)
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes, expires_at: float) -> None:
+        if len(value) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self.size_bytes -= len(old[1])
+            self._data[key] = (expires_at, value)
+            self.size_bytes += len(value)
+            while self.size_bytes > self.max_bytes and self._data:
+                _, (_, evicted) = self._data.popitem(last=False)
+                self.size_bytes -= len(evicted)
+                self.evictions += 1
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class DiskCache:
+    """SQLite-backed store of zlib-compressed values, safe across threads and processes."""
+
+    PURGE_EVERY = 200  # writes between expired-row purges
+
+    def __init__(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._conn = sqlite3.connect(str(path), check_same_thread=False, timeout=5)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, expires_at REAL NOT NULL, value BLOB NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[Tuple[float, bytes]]:
+        """Return (expires_at, value) for a live entry, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT expires_at, value FROM cache WHERE key = ? AND expires_at > ?", (key, time.time())
+            ).fetchone()
+        return (row[0], zlib.decompress(row[1])) if row else None
+
+    def set(self, key: str, value: bytes, expires_at: float) -> None:
+        blob = zlib.compress(value, 6)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, expires_at, value) VALUES (?, ?, ?)", (key, expires_at, blob)
+            )
+            self._writes += 1
+            if self._writes % self.PURGE_EVERY == 0:
+                self._conn.execute("DELETE FROM cache WHERE expires_at <= ?", (time.time(),))
+            self._conn.commit()
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+
+
+class TieredCache:
+    """Memory LRU in front of an optional disk store, with hit/miss/eviction counters."""
+
+    def __init__(self, memory: LRUCache, disk: Optional[DiskCache] = None) -> None:
+        self.memory = memory
+        self.disk = disk
+        self._counters = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "stores": 0, "errors": 0}
+        self._lock = threading.Lock()
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._counters[name] += 1
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """Return (found, value)."""
+        raw = self.memory.get(key)
+        if raw is not None:
+            self._count("memory_hits")
+            return True, json.loads(raw)
+
+        if self.disk is not None:
+            try:
+                stored = self.disk.get(key)
+            except Exception:
+                logger.exception("Disk cache read failed")
+                self._count("errors")
+                stored = None
+            if stored is not None:
+                self._count("disk_hits")
+                expires_at, raw = stored
+                self.memory.set(key, raw, expires_at)
+                return True, json.loads(raw)
+
+        self._count("misses")
+        return False, None
+
+    def set(self, key: str, value: Any, ttl_s: float) -> None:
+        raw = json.dumps(value, default=str).encode("utf-8")
+        expires_at = time.time() + ttl_s
+        self.memory.set(key, raw, expires_at)
+        if self.disk is not None:
+            try:
+                self.disk.set(key, raw, expires_at)
+            except Exception:
+                logger.exception("Disk cache write failed")
+                self._count("errors")
+        self._count("stores")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            out: Dict[str, Any] = dict(self._counters)
+        lookups = out["memory_hits"] + out["disk_hits"] + out["misses"]
+        out["hit_ratio"] = round((out["memory_hits"] + out["disk_hits"]) / lookups, 3) if lookups else None
+        out["memory_entries"] = len(self.memory)
+        out["memory_bytes"] = self.memory.size_bytes
+        out["memory_max_bytes"] = self.memory.max_bytes
+        out["memory_evictions"] = self.memory.evictions
+        out["disk_entries"] = self.disk.count() if self.disk is not None else None
+        return out
+
+
+_cache: Optional[TieredCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_cache() -> TieredCache:
+    """Return the process-wide provider cache, creating it on first use."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                disk = None
+                if CACHE_DISK_ENABLED:
+                    try:
+                        disk = DiskCache(CACHE_DIR / "provider_cache.sqlite3")
+                    except Exception:
+                        logger.exception("Could not open disk cache in %s; using memory only", CACHE_DIR)
+                _cache = TieredCache(LRUCache(MEMORY_MAX_BYTES), disk)
+    return _cache
+
+
+def cached(provider: str, endpoint: str) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """Cache a provider function or method on its normalized arguments.
+
+    `self` and an injected `client` are not part of the key. Results that are
+    empty or None are passed through without being stored.
+    """
+    ttl_s = PROVIDER_TTLS.get(provider, DEFAULT_TTL_S)
+
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if CACHE_DISABLED:
+                return func(*args, **kwargs)
+
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            params = {k: v for k, v in bound.arguments.items() if k not in _IGNORED_ARGS}
+            key = cache_key(provider, endpoint, params)
+
+            cache = get_cache()
+            found, value = cache.get(key)
+            if found:
+                return value
+
+            value = func(*args, **kwargs)
+            if value:
+                cache.set(key, value, ttl_s)
+            return value
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,157 @@
+"""
+Helpers for running blocking provider / LLM calls without stalling the event loop.
+
+The providers in `literature/` and `venue_discovery/` use blocking HTTP and the
+LLM wrappers expose a blocking `.invoke()`. Async endpoints hand that work to a
+bounded thread pool via `run_blocking` so the uvicorn loop stays free to serve
+other requests while upstream APIs are slow.
+"""
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import functools
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+from util.deadline import DeadlineExceeded, cap_timeout
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Upper bound on blocking pipeline calls in flight at once (per worker process).
+PIPELINE_MAX_WORKERS = int(os.getenv("LS_PIPELINE_MAX_WORKERS", "32"))
+# Upper bound on provider calls fanned out from inside a pipeline phase. Kept
+# separate from the pipeline pool so a phase waiting on its own fan-out can
+# never starve itself of workers.
+FANOUT_MAX_WORKERS = int(os.getenv("LS_FANOUT_MAX_WORKERS", "32"))
+# Upper bound on hedged literature provider calls. Those calls fan out again
+# (citation enrichment uses `run_parallel`), so they get their own pool too.
+HEDGE_MAX_WORKERS = int(os.getenv("LS_HEDGE_MAX_WORKERS", "16"))
+
+_executor: Optional[ThreadPoolExecutor] = None
+_fanout_executor: Optional[ThreadPoolExecutor] = None
+_hedge_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Return the process-wide executor used to offload blocking pipeline work."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=PIPELINE_MAX_WORKERS,
+                    thread_name_prefix="ls-pipeline",
+                )
+    return _executor
+
+
+def get_fanout_executor() -> ThreadPoolExecutor:
+    """Return the process-wide executor used by `run_parallel`."""
+    global _fanout_executor
+    if _fanout_executor is None:
+        with _executor_lock:
+            if _fanout_executor is None:
+                _fanout_executor = ThreadPoolExecutor(
+                    max_workers=FANOUT_MAX_WORKERS,
+                    thread_name_prefix="ls-fanout",
+                )
+    return _fanout_executor
+
+
+def get_hedge_executor() -> ThreadPoolExecutor:
+    """Return the process-wide executor for hedged literature provider calls."""
+    global _hedge_executor
+    if _hedge_executor is None:
+        with _executor_lock:
+            if _hedge_executor is None:
+                _hedge_executor = ThreadPoolExecutor(
+                    max_workers=HEDGE_MAX_WORKERS,
+                    thread_name_prefix="ls-hedge",
+                )
+    return _hedge_executor
+
+
+async def run_blocking(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run `func(*args, **kwargs)` on the pipeline executor and await its result.
+
+    The caller's context variables are copied into the worker thread so
+    request-scoped state (logging context, deadlines) follows the call.
+    """
+    loop = asyncio.get_running_loop()
+    ctx = contextvars.copy_context()
+    call = functools.partial(ctx.run, func, *args, **kwargs)
+    return await loop.run_in_executor(get_executor(), call)
+
+
+def run_parallel(
+    calls: Dict[str, Callable[[], T]],
+    timeout: Optional[float] = None,
+    timings: Optional[Dict[str, float]] = None,
+) -> Dict[str, T]:
+    """Run independent blocking calls concurrently and return their results by name.
+
+    Wall-clock cost is the slowest call rather than the sum. Calls that raise
+    are logged and left out of the result, as are calls still running when
+    `timeout` seconds have passed. The timeout is capped to the current request
+    budget (util.deadline). When `timings` is given, each finished call records
+    its elapsed milliseconds under its name.
+    """
+    if not calls:
+        return {}
+    try:
+        timeout = cap_timeout(timeout)
+    except DeadlineExceeded:
+        logger.warning("Skipping parallel calls %s: request budget spent", list(calls))
+        return {}
+
+    executor = get_fanout_executor()
+
+    def _timed(name: str, func: Callable[[], T]) -> T:
+        start = time.perf_counter()
+        try:
+            return func()
+        finally:
+            if timings is not None:
+                timings[name] = round((time.perf_counter() - start) * 1000, 1)
+
+    futures = {
+        executor.submit(contextvars.copy_context().run, _timed, name, func): name
+        for name, func in calls.items()
+    }
+    done, not_done = wait(futures, timeout=timeout)
+
+    results: Dict[str, T] = {}
+    for fut in done:
+        name = futures[fut]
+        try:
+            results[name] = fut.result()
+        except Exception:
+            logger.exception("Parallel call '%s' failed", name)
+    for fut in not_done:
+        fut.cancel()
+        logger.warning("Parallel call '%s' did not finish within %.1fs", futures[fut], timeout or 0)
+    return results
+
+
+def shutdown_executor() -> None:
+    """Stop the pipeline executors (called on application shutdown)."""
+    global _executor, _fanout_executor, _hedge_executor
+    with _executor_lock:
+        if _executor is not None:
+            logger.info("Shutting down pipeline executor")
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+        if _fanout_executor is not None:
+            _fanout_executor.shutdown(wait=False, cancel_futures=True)
+            _fanout_executor = None
+        if _hedge_executor is not None:
+            _hedge_executor.shutdown(wait=False, cancel_futures=True)
+            _hedge_executor = None
@@ -0,0 +1,77 @@
+"""
+Request-level latency budgets.
+
+`generate_content` opens a `deadline_scope` for each request. The deadline lives
+in a context variable, which `run_blocking`, `run_parallel` and the hedged
+literature fallback copy into their worker threads, so every phase sees it:
+the shared HTTP client caps each timeout to the time left and refuses to start
+requests once the budget is spent.
+"""
+from __future__ import annotations
+
+import contextlib
+import contextvars
+import time
+from typing import Iterator, Optional
+
+# Smallest socket timeout worth handing to an HTTP call
+MIN_TIMEOUT_S = 0.05
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when work would start after the request's latency budget is spent."""
+
+
+class Deadline:
+    def __init__(self, budget_s: float) -> None:
+        self.budget_s = budget_s
+        self.expires_at = time.monotonic() + budget_s
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def elapsed(self) -> float:
+        return self.budget_s - (self.expires_at - time.monotonic())
+
+
+_current: contextvars.ContextVar[Optional[Deadline]] = contextvars.ContextVar("ls_deadline", default=None)
+
+
+def current_deadline() -> Optional[Deadline]:
+    return _current.get()
+
+
+def set_deadline(deadline: Optional[Deadline]) -> contextvars.Token:
+    """Make `deadline` the current budget; pass the token to `reset_deadline`."""
+    return _current.set(deadline)
+
+
+def reset_deadline(token: contextvars.Token) -> None:
+    _current.reset(token)
+
+
+@contextlib.contextmanager
+def deadline_scope(deadline: Optional[Deadline]) -> Iterator[Optional[Deadline]]:
+    """Make `deadline` the budget for everything started inside the block."""
+    token = set_deadline(deadline)
+    try:
+        yield deadline
+    finally:
+        reset_deadline(token)
+
+
+def cap_timeout(timeout: Optional[float]) -> Optional[float]:
+    """Clamp `timeout` (None = unbounded) to the current request's remaining budget.
+
+    Raises DeadlineExceeded when the budget is already spent.
+    """
+    deadline = current_deadline()
+    if deadline is None:
+        return timeout
+    remaining = deadline.remaining()
+    if remaining <= MIN_TIMEOUT_S:
+        raise DeadlineExceeded(f"Request budget of {deadline.budget_s:.1f}s is spent")
+    return remaining if timeout is None else min(timeout, remaining)
@@ -0,0 +1,385 @@
+"""
+Process-wide pooled HTTP client shared by every academic provider.
+
+Providers used to call bare `requests.get`, paying a DNS lookup and a fresh
+TCP+TLS handshake per call. `get_http_client()` returns one client per process
+that keeps connections alive per host, caches DNS answers, and applies a
+consistent User-Agent / OpenAlex `mailto` so we stay in the polite pool.
+
+Optional HTTP/2 is used when LS_HTTP2=1 and `httpx[http2]` is installed;
+otherwise the client is a `requests.Session` with sized urllib3 pools. The DNS
+cache belongs to those pools; httpx resolves on its own.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import socket
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, Iterator, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+import urllib3
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import ConnectTimeoutError
+from urllib3.util.connection import allowed_gai_family
+
+# The DNS cache hooks urllib3 2.x connection internals; with 1.26 (still
+# accepted by `requests`) connections resolve normally
+try:
+    from urllib3.exceptions import NameResolutionError
+except ImportError:
+    NameResolutionError = None
+DNS_CACHE_SUPPORTED = NameResolutionError is not None and int(urllib3.__version__.split(".")[0]) >= 2
+
+from util.deadline import MIN_TIMEOUT_S, cap_timeout
+from util.json_stream import iter_json_array
+from util.rate_limit import RateLimitTimeout, get_scheduler, parse_retry_after
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT = "literature-surveyor/1.0"
+# Hosts that accept the `mailto` parameter for their polite pool
+MAILTO_HOSTS = {"api.openalex.org"}
+
+POOL_MAXSIZE = int(os.getenv("LS_HTTP_POOL_MAXSIZE", "32"))
+DNS_CACHE_TTL_S = float(os.getenv("LS_DNS_CACHE_TTL_S", "300"))
+# Cached (host, port, family) answers; the client talks to a handful of hosts
+DNS_CACHE_MAX_ENTRIES = 256
+HTTP2_ENABLED = os.getenv("LS_HTTP2", "").strip().lower() in {"1", "true", "yes"}
+# Read size for incrementally parsed (streamed) JSON bodies
+STREAM_CHUNK_BYTES = 64 * 1024
+
+
+class _DnsCache:
+    """Bounded TTL cache of `getaddrinfo` answers for the pooled client's connections.
+
+    Kept connections rarely need DNS, but new pool connections (and every
+    reconnect after an idle close) would otherwise resolve the host again.
+    Only this client's connection classes resolve through it; the process-wide
+    `socket.getaddrinfo` is left alone. Expired answers are evicted, and a host
+    whose cached addresses all fail to connect is dropped so the next connect
+    resolves it afresh.
+    """
+
+    def __init__(self, ttl_s: float, max_entries: int = DNS_CACHE_MAX_ENTRIES) -> None:
+        self.ttl_s = ttl_s
+        self.max_entries = max(1, max_entries)
+        self.hits = 0
+        self.misses = 0
+        self._entries: Dict[Tuple[str, int, int], Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+
+    def resolve(self, host: str, port: int, family: int = socket.AF_UNSPEC):
+        key = (host, port, family)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > now:
+                self.hits += 1
+                return entry[1]
+        result = socket.getaddrinfo(host, port, family, socket.SOCK_STREAM)
+        with self._lock:
+            self.misses += 1
+            self._entries.pop(key, None)
+            if len(self._entries) >= self.max_entries:
+                self._evict(now)
+            self._entries[key] = (now + self.ttl_s, result)
+        return result
+
+    def _evict(self, now: float) -> None:
+        """Drop expired answers, then the oldest ones, until there is room for one more."""
+        for key in [k for k, (expires, _) in self._entries.items() if expires <= now]:
+            del self._entries[key]
+        while len(self._entries) >= self.max_entries:
+            del self._entries[next(iter(self._entries))]
+
+    def invalidate(self, host: str) -> None:
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == host]:
+                del self._entries[key]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "ttl_s": self.ttl_s,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+_connects_by_host: Counter = Counter()
+_connects_lock = threading.Lock()
+
+
+def _record_connect(host: str) -> None:
+    with _connects_lock:
+        _connects_by_host[host] += 1
+
+
+class _CachedDnsMixin:
+    """Opens the socket to the host's cached addresses, tried in order like `create_connection`.
+
+    TLS still uses the host name (SNI, certificate check); only the TCP
+    connect goes to the resolved address.
+
+    Relies on private urllib3 2.x internals: `HTTPConnection._new_conn` and
+    the `_dns_host` attribute it connects to. It is only mixed in when
+    DNS_CACHE_SUPPORTED; re-check both on urllib3 upgrades.
+    """
+
+    def _new_conn(self):
+        cache = _dns_cache
+        if cache is None:
+            return super()._new_conn()
+        host = self._dns_host
+        try:
+            addresses = cache.resolve(host, self.port, allowed_gai_family())
+        except socket.gaierror as e:
+            raise NameResolutionError(self.host, self, e) from e
+
+        error: Optional[Exception] = None
+        try:
+            for *_, sockaddr in addresses:
+                self._dns_host = sockaddr[0]
+                try:
+                    return super()._new_conn()
+                except ConnectTimeoutError as e:  # also NewConnectionError
+                    error = e
+        finally:
+            self._dns_host = host
+        # Possibly a stale answer: resolve again on the next connect
+        cache.invalidate(host)
+        if error is None:
+            raise NameResolutionError(self.host, self, socket.gaierror(f"no addresses for {host}"))
+        raise error
+
+
+_DNS_MIXINS = (_CachedDnsMixin,) if DNS_CACHE_SUPPORTED else ()
+
+
+class _CountingHTTPConnection(*_DNS_MIXINS, HTTPConnection):
+    def connect(self) -> None:
+        _record_connect(self.host)
+        super().connect()
+
+
+class _CountingHTTPSConnection(*_DNS_MIXINS, HTTPSConnection):
+    def connect(self) -> None:
+        _record_connect(self.host)
+        super().connect()
+
+
+class _CountingHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _CountingHTTPConnection
+
+
+class _CountingHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _CountingHTTPSConnection
+
+
+class _CountingAdapter(HTTPAdapter):
+    """HTTPAdapter whose pools count every TCP (+TLS) connect, including reconnects,
+    and resolve hosts through the DNS cache."""
+
+    def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _CountingHTTPConnectionPool,
+            "https": _CountingHTTPSConnectionPool,
+        }
+
+
+def _import_httpx():
+    # Only imported when HTTP/2 is requested, keeping it off the default startup path
+    try:
+        import httpx
+    except Exception:
+        return None
+    return httpx
+
+
+class HttpClient:
+    """Thin pooled client exposing `get` / `post` with `requests`-like responses."""
+
+    def __init__(self, pool_maxsize: int = POOL_MAXSIZE, http2: bool = HTTP2_ENABLED) -> None:
+        self.pool_maxsize = pool_maxsize
+        httpx = _import_httpx() if http2 else None
+        self.http2 = httpx is not None
+        if http2 and httpx is None:
+            logger.warning("LS_HTTP2 requested but httpx is not installed; using HTTP/1.1 pools.")
+
+        self._requests_by_host: Counter = Counter()
+        self._http_versions: Counter = Counter()
+        self._lock = threading.Lock()
+
+        if self.http2:
+            try:
+                self._httpx = httpx.Client(
+                    http2=True,
+                    limits=httpx.Limits(max_connections=pool_maxsize, max_keepalive_connections=pool_maxsize),
+                )
+            except Exception as e:
+                # httpx without the `h2` extra refuses http2=True
+                logger.warning("HTTP/2 client unavailable (%s); using HTTP/1.1 pools.", e)
+                self.http2 = False
+
+        if not self.http2:
+            self._session = requests.Session()
+            adapter = _CountingAdapter(pool_connections=16, pool_maxsize=pool_maxsize, max_retries=0)
+            self._session.mount("https://", adapter)
+            self._session.mount("http://", adapter)
+
+        if not os.getenv("EMAIL"):
+            logger.warning("HTTP client: No EMAIL found in .env. OpenAlex will run in slow mode.")
+
+    def _prepare(self, url: str, params: Optional[Dict[str, Any]], headers: Optional[Dict[str, str]]):
+        host = urlsplit(url).hostname or ""
+        email = os.getenv("EMAIL")
+
+        params = dict(params or {})
+        if email and host in MAILTO_HOSTS:
+            params.setdefault("mailto", email)
+
+        # The contact email goes only to hosts with a polite pool
+        merged = {"User-Agent": f"{USER_AGENT} (mailto:{email})" if email and host in MAILTO_HOSTS else USER_AGENT}
+        merged.update(headers or {})
+
+        with self._lock:
+            self._requests_by_host[host] += 1
+        return host, params, merged
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: float = 10,
+        priority: Optional[int] = None,
+        **kwargs: Any,
+    ):
+        """Send a request once the host's rate limiter grants a slot.
+
+        `priority` (util.rate_limit.INTERACTIVE / BATCH) defaults to the class of
+        the calling context. Waiting for a slot counts against `timeout`, which is
+        also capped to the remaining request budget (util.deadline).
+        """
+        start = time.monotonic()
+        timeout = cap_timeout(timeout)
+        host, params, headers = self._prepare(url, params, headers)
+        scheduler = get_scheduler()
+        scheduler.acquire(host, priority, timeout=timeout)
+        if timeout is not None:
+            # The slot wait is spent; the request gets what is left of `timeout`
+            remaining = timeout - (time.monotonic() - start)
+            if remaining <= MIN_TIMEOUT_S:
+                raise RateLimitTimeout(f"No time left for {host} after waiting {timeout:.1f}s for a request slot")
+            timeout = cap_timeout(remaining)
+
+        if self.http2:
+            if kwargs.pop("stream", False):
+                req = self._httpx.build_request(method, url, params=params, headers=headers, timeout=timeout, **kwargs)
+                resp = self._httpx.send(req, stream=True)
+            else:
+                resp = self._httpx.request(method, url, params=params, headers=headers, timeout=timeout, **kwargs)
+            with self._lock:
+                self._http_versions[resp.http_version] += 1
+        else:
+            resp = self._session.request(method, url, params=params, headers=headers, timeout=timeout, **kwargs)
+
+        if resp.status_code in (429, 503):
+            scheduler.penalize(host, parse_retry_after(resp.headers.get("Retry-After")))
+        return resp
+
+    def get(self, url: str, **kwargs: Any):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs: Any):
+        return self.request("POST", url, **kwargs)
+
+    def stream_json_items(
+        self,
+        url: str,
+        key: str = "results",
+        chunk_size: int = STREAM_CHUNK_BYTES,
+        preceding: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> Iterator[Any]:
+        """GET `url` and yield the elements of the top-level `key` array one at a time.
+
+        The body is parsed incrementally (util.json_stream), so memory stays
+        bounded by one chunk plus one record however large the page is. Members
+        before the array are stored in `preceding` if given. Raises for HTTP
+        errors on first iteration, like `raise_for_status()`.
+        """
+        resp = self.request("GET", url, stream=True, **kwargs)
+        try:
+            resp.raise_for_status()
+            chunks = resp.iter_bytes(chunk_size) if self.http2 else resp.iter_content(chunk_size)
+            yield from iter_json_array(chunks, key, preceding)
+            # Drain the (small) remainder so the connection returns to the pool
+            for _ in chunks:
+                pass
+        finally:
+            resp.close()
+
+    def stats(self) -> Dict[str, Any]:
+        """Connection reuse statistics, to verify handshakes are being amortized."""
+        with self._lock:
+            requests_by_host = dict(self._requests_by_host)
+            http_versions = dict(self._http_versions)
+
+        out: Dict[str, Any] = {
+            "transport": "httpx-h2" if self.http2 else "requests",
+            "pool_maxsize": self.pool_maxsize,
+            "requests_by_host": requests_by_host,
+            "dns_cache": _dns_cache.stats() if _dns_cache else None,
+        }
+        if self.http2:
+            out["http_versions"] = http_versions
+            return out
+
+        # Every TCP (+TLS) handshake goes through a counting connection class, so
+        # requests per connect shows how well keep-alive amortizes handshakes.
+        with _connects_lock:
+            connects = dict(_connects_by_host)
+        out["pools"] = {
+            host: {
+                "connects": connects.get(host, 0),
+                "requests": served,
+                "requests_per_connect": round(served / connects[host], 2) if connects.get(host) else None,
+            }
+            for host, served in requests_by_host.items()
+        }
+        return out
+
+    def close(self) -> None:
+        if self.http2:
+            self._httpx.close()
+        else:
+            self._session.close()
+
+
+_client: Optional[HttpClient] = None
+_dns_cache: Optional[_DnsCache] = None
+_client_lock = threading.Lock()
+
+
+def get_http_client() -> HttpClient:
+    """Return the process-wide HTTP client, creating it on first use."""
+    global _client, _dns_cache
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                if DNS_CACHE_SUPPORTED and DNS_CACHE_TTL_S > 0 and _dns_cache is None:
+                    _dns_cache = _DnsCache(DNS_CACHE_TTL_S)
+                _client = HttpClient()
+    return _client
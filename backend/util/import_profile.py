@@ -0,0 +1,128 @@
+"""
+Startup import-cost report.
+
+With LS_IMPORT_PROFILE=1, `start()` installs a meta-path finder that times
+every module executed while the app boots. `report()` then lists the modules
+and top-level packages with the largest self time (time spent executing the
+module body, excluding its own imports), which is where cold-start time goes.
+Without the variable only the total boot time is measured.
+"""
+from __future__ import annotations
+
+import importlib.machinery
+import os
+import sys
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+PROFILE_ENABLED = os.getenv("LS_IMPORT_PROFILE", "").strip().lower() in {"1", "true", "yes"}
+
+# Loaders created per module, so wrapping `exec_module` on the instance is safe
+_TIMED_LOADERS = (
+    importlib.machinery.SourceFileLoader,
+    importlib.machinery.SourcelessFileLoader,
+    importlib.machinery.ExtensionFileLoader,
+)
+
+
+class _ImportTimer:
+    """Meta-path finder that delegates lookup and times each module's execution."""
+
+    def __init__(self) -> None:
+        self.self_s: Dict[str, float] = {}
+        self.total_s: Dict[str, float] = {}
+        self._stack = threading.local()
+        self._finding = threading.local()
+
+    def find_spec(self, fullname, path, target=None):
+        if getattr(self._finding, "active", False):
+            return None
+        self._finding.active = True
+        try:
+            spec = None
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, "find_spec"):
+                    continue
+                spec = finder.find_spec(fullname, path, target)
+                if spec is not None:
+                    break
+        finally:
+            self._finding.active = False
+
+        if spec is not None and isinstance(spec.loader, _TIMED_LOADERS):
+            self._wrap(spec.loader, fullname)
+        return spec
+
+    def _wrap(self, loader, fullname: str) -> None:
+        exec_module = loader.exec_module
+
+        def timed_exec_module(module):
+            stack: List[List[float]] = self._stack.__dict__.setdefault("frames", [])
+            # [start, time spent in nested imports]
+            stack.append([time.perf_counter(), 0.0])
+            try:
+                exec_module(module)
+            finally:
+                start, children = stack.pop()
+                total = time.perf_counter() - start
+                self.total_s[fullname] = total
+                self.self_s[fullname] = total - children
+                if stack:
+                    stack[-1][1] += total
+
+        loader.exec_module = timed_exec_module
+
+
+_timer: Optional[_ImportTimer] = None
+_boot_started = time.perf_counter()
+_boot_s: Optional[float] = None
+
+
+def start() -> None:
+    """Begin timing the boot; installs the per-module finder if profiling is enabled."""
+    global _timer, _boot_started
+    _boot_started = time.perf_counter()
+    if PROFILE_ENABLED and _timer is None:
+        _timer = _ImportTimer()
+        sys.meta_path.insert(0, _timer)
+
+
+def stop() -> float:
+    """Stop timing and return the boot duration in seconds."""
+    global _timer, _boot_s
+    _boot_s = time.perf_counter() - _boot_started
+    if _timer is not None and _timer in sys.meta_path:
+        sys.meta_path.remove(_timer)
+    return _boot_s
+
+
+def report(top: int = 15) -> Dict[str, object]:
+    """Boot time plus the slowest modules and packages by self time."""
+    out: Dict[str, object] = {"boot_ms": round(_boot_s * 1000, 1) if _boot_s is not None else None}
+    if _timer is None:
+        return out
+
+    by_package: Dict[str, float] = defaultdict(float)
+    for name, seconds in _timer.self_s.items():
+        by_package[name.partition(".")[0]] += seconds
+
+    def ranked(items: Dict[str, float]) -> List[Tuple[str, float]]:
+        return [(name, round(s * 1000, 1)) for name, s in sorted(items.items(), key=lambda kv: -kv[1])[:top]]
+
+    out["modules_imported"] = len(_timer.self_s)
+    out["import_ms"] = round(sum(_timer.self_s.values()) * 1000, 1)
+    out["slowest_packages_ms"] = ranked(by_package)
+    out["slowest_modules_ms"] = ranked(_timer.self_s)
+    return out
+
+
+def format_report(data: Dict[str, object]) -> str:
+    lines = [f"Backend boot took {data['boot_ms']} ms"]
+    if "slowest_packages_ms" in data:
+        lines.append(f"Imported {data['modules_imported']} modules in {data['import_ms']} ms; slowest packages:")
+        lines.extend(f"  {ms:>8.1f} ms  {name}" for name, ms in data["slowest_packages_ms"])
+        lines.append("Slowest modules (self time):")
+        lines.extend(f"  {ms:>8.1f} ms  {name}" for name, ms in data["slowest_modules_ms"])
+    return "\n".join(lines)
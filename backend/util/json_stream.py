@@ -0,0 +1,121 @@
+"""
+Incremental JSON parsing for large list responses.
+
+`resp.json()` buffers the whole body and builds every record before callers
+read a handful of fields from each. `iter_json_array` instead consumes the body
+chunk by chunk and yields the elements of one top-level array (OpenAlex's
+"results") as soon as each is complete, so peak memory is one chunk plus one
+record regardless of page size. Elements are decoded with the C-accelerated
+`json` decoder; only the scanning between them is done here.
+"""
+from __future__ import annotations
+
+import codecs
+import json
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+_DECODER = json.JSONDecoder()
+_WHITESPACE = " \t\n\r"
+# Characters that can continue a JSON number
+_NUMBER_CHARS = frozenset("0123456789.eE+-")
+
+
+def _is_number(obj: Any) -> bool:
+    return isinstance(obj, (int, float)) and not isinstance(obj, bool)
+
+
+class _Reader:
+    """Text buffer over an iterable of byte chunks, compacted as it is consumed."""
+
+    def __init__(self, chunks: Iterable[bytes]) -> None:
+        self._chunks = iter(chunks)
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self) -> bool:
+        """Append the next decoded chunk; False once the body is exhausted."""
+        if self.eof:
+            return False
+        if self.pos:
+            self.buf = self.buf[self.pos:]
+            self.pos = 0
+        for chunk in self._chunks:
+            text = self._utf8.decode(chunk)
+            if text:
+                self.buf += text
+                return True
+        self.buf += self._utf8.decode(b"", final=True)
+        self.eof = True
+        return False
+
+    def peek(self) -> str:
+        """Next non-whitespace character without consuming it ("" at end of body)."""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self.fill():
+                return ""
+
+    def expect(self, chars: str) -> str:
+        ch = self.peek()
+        if not ch or ch not in chars:
+            raise ValueError(f"Expected one of {chars!r} at offset {self.pos}, got {ch!r}")
+        self.pos += 1
+        return ch
+
+    def value(self) -> Any:
+        """Decode the next complete JSON value."""
+        self.peek()
+        while True:
+            try:
+                obj, end = _DECODER.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if self.fill():
+                    continue
+                raise
+            # A scalar ending exactly at the buffer edge may continue in the next
+            # chunk, and a number cut inside ("1." or "1.5e") decodes as its prefix
+            if not self.eof and (end == len(self.buf) or (_is_number(obj) and self.buf[end] in _NUMBER_CHARS)):
+                if self.fill():
+                    continue
+            self.pos = end
+            return obj
+
+
+def iter_json_array(chunks: Iterable[bytes], key: str = "results", preceding: Optional[Dict[str, Any]] = None) -> Iterator[Any]:
+    """Yield each element of the array under top-level `key` of a streamed JSON object.
+
+    Top-level members before the array (e.g. OpenAlex's "meta" with the next
+    cursor) are stored in `preceding` when a dict is given, else skipped;
+    nothing is read past the array's closing bracket. Raises ValueError on
+    malformed input.
+    """
+    reader = _Reader(chunks)
+    reader.expect("{")
+    if reader.peek() == "}":
+        return
+    while True:
+        name = reader.value()
+        reader.expect(":")
+        if name == key:
+            break
+        value = reader.value()
+        if preceding is not None:
+            preceding[name] = value
+        if reader.expect(",}") == "}":
+            return
+
+    if reader.peek() == "n":
+        reader.value()  # "results": null
+        return
+    reader.expect("[")
+    if reader.peek() == "]":
+        return
+    while True:
+        yield reader.value()
+        if reader.expect(",]") == "]":
+            return
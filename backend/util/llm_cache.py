@@ -0,0 +1,148 @@
+"""
+Result cache for LLM completions.
+
+Idea generation and the overview call the LLM on every /generate, even when
+the domain, venues and papers (and therefore the prompt) are identical to an
+earlier request. Completions are cached in a TTL + LRU store keyed on the
+provider, model, temperature and a hash of the fully built prompt.
+
+Each entry remembers how long the original call took and how many tokens it
+used, so hits report the latency and tokens saved.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from util.cache import LRUCache
+from util.llm_factory import deadline_kwargs
+
+logger = logging.getLogger(__name__)
+
+LLM_CACHE_DISABLED = os.getenv("LS_LLM_CACHE_DISABLED", "").strip().lower() in {"1", "true", "yes"}
+LLM_CACHE_TTL_S = float(os.getenv("LS_LLM_CACHE_TTL_S", "3600"))
+LLM_CACHE_MAX_BYTES = int(os.getenv("LS_LLM_CACHE_MAX_BYTES", str(16 * 1024 * 1024)))
+
+
+def describe_llm(llm: Any) -> Tuple[str, str, Optional[float]]:
+    """(provider, model, temperature) of a LangChain chat model instance."""
+    provider = type(llm).__name__
+    model = getattr(llm, "model", None) or getattr(llm, "model_name", None) or ""
+    temperature = getattr(llm, "temperature", None)
+    return provider, str(model), temperature
+
+
+def llm_cache_key(provider: str, model: str, temperature: Optional[float], prompt: str) -> str:
+    prompt_hash = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+    raw = json.dumps([provider, model, temperature, prompt_hash])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _token_count(response: Any, prompt: str, text: str) -> int:
+    """Tokens used by a completion, from provider usage metadata or a ~4 chars/token estimate."""
+    usage = getattr(response, "usage_metadata", None) or {}
+    if isinstance(usage, dict) and usage.get("total_tokens"):
+        return int(usage["total_tokens"])
+    meta = getattr(response, "response_metadata", None) or {}
+    token_usage = meta.get("token_usage") if isinstance(meta, dict) else None
+    if isinstance(token_usage, dict) and token_usage.get("total_tokens"):
+        return int(token_usage["total_tokens"])
+    return (len(prompt) + len(text)) // 4
+
+
+class LLMCache:
+    def __init__(self, ttl_s: float = LLM_CACHE_TTL_S, max_bytes: int = LLM_CACHE_MAX_BYTES) -> None:
+        self.ttl_s = ttl_s
+        self._store = LRUCache(max_bytes)
+        self._lock = threading.Lock()
+        self._counters: Dict[str, float] = {
+            "hits": 0, "misses": 0, "bypassed": 0, "stores": 0, "time_saved_s": 0.0, "tokens_saved": 0,
+        }
+
+    def get(self, key: str) -> Optional[str]:
+        raw = self._store.get(key)
+        if raw is None:
+            with self._lock:
+                self._counters["misses"] += 1
+            return None
+        entry = json.loads(raw)
+        with self._lock:
+            self._counters["hits"] += 1
+            self._counters["time_saved_s"] += entry["elapsed_s"]
+            self._counters["tokens_saved"] += entry["tokens"]
+        return entry["text"]
+
+    def put(self, key: str, text: str, elapsed_s: float, tokens: int) -> None:
+        raw = json.dumps({"text": text, "elapsed_s": elapsed_s, "tokens": tokens}).encode("utf-8")
+        self._store.set(key, raw, time.time() + self.ttl_s)
+        with self._lock:
+            self._counters["stores"] += 1
+
+    def note_bypass(self) -> None:
+        with self._lock:
+            self._counters["bypassed"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            out: Dict[str, Any] = dict(self._counters)
+        out["time_saved_s"] = round(out["time_saved_s"], 2)
+        lookups = out["hits"] + out["misses"]
+        out["hit_ratio"] = round(out["hits"] / lookups, 3) if lookups else None
+        out["entries"] = len(self._store)
+        out["bytes"] = self._store.size_bytes
+        out["evictions"] = self._store.evictions
+        out["ttl_s"] = self.ttl_s
+        return out
+
+
+_llm_cache: Optional[LLMCache] = None
+_llm_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> LLMCache:
+    global _llm_cache
+    if _llm_cache is None:
+        with _llm_cache_lock:
+            if _llm_cache is None:
+                _llm_cache = LLMCache()
+    return _llm_cache
+
+
+def invoke_cached(
+    llm: Any,
+    prompt: str,
+    extract: Callable[[Any], Optional[str]],
+    use_cache: bool = True,
+    invoke: Optional[Callable[[], Any]] = None,
+) -> Optional[str]:
+    """Return the completion text for `prompt`, serving repeats from the cache.
+
+    `extract` turns the wrapper's response into text; `invoke` overrides the
+    default `llm.invoke(prompt)` call, which is capped to the request's
+    remaining budget. Empty completions are never cached.
+    """
+    cache = get_llm_cache()
+    invoke = invoke or (lambda: llm.invoke(prompt, **deadline_kwargs(llm)))
+
+    if not use_cache or LLM_CACHE_DISABLED:
+        cache.note_bypass()
+        return extract(invoke())
+
+    key = llm_cache_key(*describe_llm(llm), prompt)
+    text = cache.get(key)
+    if text is not None:
+        logger.debug("LLM cache hit for %s", describe_llm(llm))
+        return text
+
+    start = time.perf_counter()
+    response = invoke()
+    elapsed_s = time.perf_counter() - start
+    text = extract(response)
+    if text:
+        cache.put(key, text, elapsed_s, _token_count(response, prompt, text))
+    return text
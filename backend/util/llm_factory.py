@@ -1,5 +1,9 @@
+import functools
+import hashlib
+import importlib
 import os
 import sys
+import threading
 from dotenv import load_dotenv
 
 # ensure project root is on path so relative imports of langchain_* modules work
@@ -9,37 +13,52 @@ sys.path.append(root_dir)
 # load .env once, but DO NOT override already-existing environment variables.
 load_dotenv(override=False)
 
-# Import vendor wrappers (may raise ImportError if not installed — we'll handle gracefully)
-try:
-    from langchain_mistralai import ChatMistralAI
-except Exception:
-    ChatMistralAI = None
-
-try:
-    from langchain_google_genai import ChatGoogleGenerativeAI
-except Exception:
-    ChatGoogleGenerativeAI = None
-
-try:
-    from langchain_openai import ChatOpenAI
-except Exception:
-    ChatOpenAI = None
-
-try:
-    from langchain_groq import ChatGroq
-except Exception:
-    ChatGroq = None
-
-# Ollama local model wrapper
-try:
-    from langchain_ollama import ChatOllama
-except Exception:
-    ChatOllama = None
+# Vendor wrappers are imported lazily on first use: each langchain_* package
+# costs hundreds of milliseconds to import, and a deployment only needs the
+# one provider it is configured for. Missing packages resolve to None.
+_WRAPPERS = {
+    "mistral": ("langchain_mistralai", "ChatMistralAI"),
+    "gemini": ("langchain_google_genai", "ChatGoogleGenerativeAI"),
+    "openai": ("langchain_openai", "ChatOpenAI"),
+    "groq": ("langchain_groq", "ChatGroq"),
+    # Ollama local model wrapper
+    "local": ("langchain_ollama", "ChatOllama"),
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _load_wrapper(provider: str):
+    """Import and return the LangChain chat class for `provider`, or None if unavailable."""
+    module_name, class_name = _WRAPPERS[provider]
+    try:
+        return getattr(importlib.import_module(module_name), class_name)
+    except Exception:
+        return None
+
 
 # Optional prompt helpers — not required for get_llm but kept for parity
-from typing import Optional, Union
+from typing import Any, Dict, Optional, Tuple, Union
 
 import util.constants as constants
+from util.deadline import cap_timeout
+
+# Upper bound on one LLM request. Wrappers get it at construction, so calls
+# abandoned by a timed-out phase end on their own instead of holding a
+# pipeline worker; OpenAI-compatible wrappers are also capped per call to the
+# request's remaining budget (see `deadline_kwargs`).
+LLM_TIMEOUT_S = float(os.getenv("LS_LLM_TIMEOUT_S", "30"))
+# Wrappers that forward an `invoke(..., timeout=)` kwarg to their SDK as a per-request timeout
+_PER_CALL_TIMEOUT = {"ChatOpenAI", "ChatGroq"}
+
+
+def deadline_kwargs(llm: Any) -> Dict[str, Any]:
+    """Extra `invoke` / `stream` kwargs bounding one call by the current request budget.
+
+    Raises util.deadline.DeadlineExceeded when the budget is already spent.
+    Wrappers without a per-call timeout return {} and rely on LLM_TIMEOUT_S.
+    """
+    timeout = cap_timeout(LLM_TIMEOUT_S)
+    return {"timeout": timeout} if type(llm).__name__ in _PER_CALL_TIMEOUT else {}
 
 
 def _get_env_provider() -> str:
@@ -47,7 +66,72 @@ def _get_env_provider() -> str:
     return os.getenv("llm_provider", "").strip().lower()
 
 
+# Registry of constructed LLM clients, reused across requests so each wrapper's
+# underlying HTTP connection pool stays alive. Keyed by provider, model and
+# temperature plus a fingerprint of the env config (API key / base URL) used to
+# build the client, so changed credentials produce a fresh client.
+_llm_registry: Dict[Tuple, object] = {}
+_llm_registry_lock = threading.Lock()
+_llm_registry_stats = {"hits": 0, "builds": 0, "invalidations": 0}
+
+
+def _fingerprint(value: Optional[str]) -> str:
+    return hashlib.sha256((value or "").encode("utf-8")).hexdigest()[:16]
+
+
+def _registry_key(local_llm: bool, provider: Optional[str], temperature: float) -> Tuple:
+    if local_llm:
+        base_url = os.getenv("local_model_url") or "http://localhost:11434"
+        return ("local", getattr(constants, "local_llm", None), temperature, _fingerprint(base_url))
+    chosen = (provider or _get_env_provider() or "").strip().lower()
+    model_name = getattr(constants, f"{chosen}_llm", None)
+    return (chosen, model_name, temperature, _fingerprint(os.getenv(f"{chosen}_api_key")))
+
+
 def get_llm(local_llm: bool = False, provider: Optional[str] = None, temperature: float = 0.3) -> Union[object, str]:
+    """
+    Returns a pooled LLM instance for (provider, model, temperature), building it on first use.
+
+    Arguments and return values are the same as `_build_llm`. Error strings and
+    exceptions are never cached. Call `invalidate_llm_clients()` after changing
+    API keys or env config in-process.
+    """
+    key = _registry_key(local_llm, provider, temperature)
+    with _llm_registry_lock:
+        llm = _llm_registry.get(key)
+        if llm is not None:
+            _llm_registry_stats["hits"] += 1
+            return llm
+
+        llm = _build_llm(local_llm=local_llm, provider=provider, temperature=temperature)
+        if not isinstance(llm, str):
+            # Drop clients built from an older config for the same model slot
+            for stale in [k for k in _llm_registry if k[:3] == key[:3]]:
+                del _llm_registry[stale]
+            _llm_registry[key] = llm
+            _llm_registry_stats["builds"] += 1
+        return llm
+
+
+def invalidate_llm_clients(provider: Optional[str] = None) -> int:
+    """Discard pooled clients (all, or only `provider`'s); returns how many were dropped."""
+    with _llm_registry_lock:
+        doomed = [k for k in _llm_registry if provider is None or k[0] == provider.strip().lower()]
+        for k in doomed:
+            del _llm_registry[k]
+        _llm_registry_stats["invalidations"] += len(doomed)
+        return len(doomed)
+
+
+def llm_registry_stats() -> Dict[str, Any]:
+    with _llm_registry_lock:
+        return {
+            **_llm_registry_stats,
+            "clients": [{"provider": k[0], "model": k[1], "temperature": k[2]} for k in _llm_registry],
+        }
+
+
+def _build_llm(local_llm: bool = False, provider: Optional[str] = None, temperature: float = 0.3) -> Union[object, str]:
     """
     Returns an LLM instance configured according to arguments.
 
@@ -65,6 +149,7 @@ def get_llm(local_llm: bool = False, provider: Optional[str] = None, temperature
     # LOCAL LLM branch
     if local_llm:
         # Check if Ollama wrapper is available
+        ChatOllama = _load_wrapper("local")
         if ChatOllama is None:
             return "Local Ollama model requested but Ollama wrapper (langchain_ollama) is not installed or importable."
 
@@ -74,7 +159,7 @@ def get_llm(local_llm: bool = False, provider: Optional[str] = None, temperature
 
         # If Ollama server likely not reachable, we can't know here — we return the instance and let invocation fail if server unreachable.
         try:
-            return ChatOllama(model=local_model_name, base_url=base_url)
+            return ChatOllama(model=local_model_name, base_url=base_url, client_kwargs={"timeout": LLM_TIMEOUT_S})
         except Exception as e:
             # Return a clear error string as requested
             return f"Local Ollama model configuration failed: {e}. Ensure Ollama server is running at {base_url} and a model named '{local_model_name}' is installed."
@@ -107,25 +192,32 @@ def get_llm(local_llm: bool = False, provider: Optional[str] = None, temperature
 
     # instantiate appropriate wrapper
     if chosen == "mistral":
+        ChatMistralAI = _load_wrapper("mistral")
         if ChatMistralAI is None:
             raise ValueError("Mistral client wrapper (langchain_mistralai) is not installed.")
-        return ChatMistralAI(api_key=api_key, model_name=model_name, temperature=temperature)
+        return ChatMistralAI(api_key=api_key, model_name=model_name, temperature=temperature, timeout=int(LLM_TIMEOUT_S))
 
     if chosen == "openai":
+        ChatOpenAI = _load_wrapper("openai")
         if ChatOpenAI is None:
             raise ValueError("OpenAI client wrapper (langchain_openai) is not installed.")
-        return ChatOpenAI(api_key=api_key, model=model_name, temperature=temperature)
+        return ChatOpenAI(api_key=api_key, model=model_name, temperature=temperature, timeout=LLM_TIMEOUT_S)
 
     if chosen == "gemini":
+        ChatGoogleGenerativeAI = _load_wrapper("gemini")
         if ChatGoogleGenerativeAI is None:
             raise ValueError("Google Generative AI wrapper (langchain_google_genai) is not installed.")
         # Gemini often requires transport selection; use REST by default like earlier code
-        return ChatGoogleGenerativeAI(api_key=api_key, model=model_name, temperature=temperature, transport="rest", max_output_tokens=1024)
+        return ChatGoogleGenerativeAI(
+            api_key=api_key, model=model_name, temperature=temperature, transport="rest", max_output_tokens=1024,
+            timeout=LLM_TIMEOUT_S,
+        )
 
     if chosen == "groq":
+        ChatGroq = _load_wrapper("groq")
         if ChatGroq is None:
             raise ValueError("Groq client wrapper (langchain_groq) is not installed.")
-        return ChatGroq(api_key=api_key, model=model_name, temperature=temperature)
+        return ChatGroq(api_key=api_key, model=model_name, temperature=temperature, timeout=LLM_TIMEOUT_S)
 
     # fallback
     raise ValueError(f"Unsupported provider: {chosen}")
\ No newline at end of file
@@ -0,0 +1,132 @@
+"""
+Query fusion for OpenAlex /works.
+
+Venue discovery (Phase 3) and literature retrieval (Phase 4) both ask OpenAlex
+for the most-cited works matching the domain; they only differ in page size.
+`SharedWorksQuery` issues that request once per /generate and hands the same
+result list to both phases, halving OpenAlex round-trips and quota use.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+from typing import Any, Dict, List, Optional
+
+from util.cache import cached
+from util.http_client import get_http_client
+
+logger = logging.getLogger(__name__)
+
+WORKS_URL = "https://api.openalex.org/works"
+# Page size needed by venue discovery; paper selection reads the top few.
+FUSED_PER_PAGE = 60
+
+# `select` projections: the fields each consumer reads, instead of full work
+# objects with authorships, concepts and referenced works (~10x smaller pages).
+PAPER_FIELDS = "id,display_name,publication_year,cited_by_count,abstract_inverted_index,primary_location,doi"
+VENUE_FIELDS = "id,cited_by_count,primary_location"
+# The fused query feeds both paper selection and venue discovery
+FUSED_FIELDS = PAPER_FIELDS
+
+Work = Dict[str, Any]
+
+# Longest abstract kept in a paper dict
+ABSTRACT_MAX_CHARS = 1000
+
+
+def reconstruct_abstract(inverted_index: Dict[str, List[int]], max_chars: Optional[int] = ABSTRACT_MAX_CHARS) -> str:
+    """Rebuild abstract text from OpenAlex's {token: [positions]} inverted index.
+
+    Every token is placed at each of its positions, so repeated words survive,
+    in a single pass over the index (linear in the number of words).
+    """
+    slots: Dict[int, str] = {}
+    for token, positions in inverted_index.items():
+        for pos in positions or ():
+            slots[pos] = token
+    if not slots:
+        return ""
+    words = [slots.get(i) for i in range(max(slots) + 1)]
+    text = " ".join(w for w in words if w is not None)
+    return text[:max_chars] if max_chars is not None else text
+
+
+def compact_work(item: Work) -> Work:
+    """Keep only what paper selection and venue discovery read from a work.
+
+    The shape stays OpenAlex-compatible (`parse_works` and `extract_venues`
+    accept it), but the bulky inverted index is replaced by the reconstructed
+    abstract, so fused results are small in memory and in the cache.
+    """
+    source = (item.get("primary_location") or {}).get("source") or {}
+    work: Work = {
+        "id": item.get("id"),
+        "display_name": item.get("display_name"),
+        "publication_year": item.get("publication_year"),
+        "cited_by_count": item.get("cited_by_count"),
+        "doi": item.get("doi"),
+        "primary_location": {
+            "source": {k: source.get(k) for k in ("id", "display_name", "type")} if source else None,
+        },
+    }
+    inv = item.get("abstract_inverted_index")
+    if inv:
+        try:
+            work["abstract"] = reconstruct_abstract(inv)
+        except Exception:
+            pass
+    return work
+
+
+@cached("openalex", "works.top_cited")
+def fetch_top_works(
+    search: str,
+    per_page: int = FUSED_PER_PAGE,
+    timeout_s: float = 10,
+    client=None,
+    select: str = FUSED_FIELDS,
+) -> Optional[List[Work]]:
+    """Return OpenAlex works matching `search`, most-cited first, or None on failure.
+
+    Only the comma-separated root fields in `select` are requested, and each
+    work is reduced with `compact_work` while the response streams in.
+    """
+    search = (search or "").strip()
+    if not search:
+        return []
+
+    client = client or get_http_client()
+    params = {"search": search, "per_page": per_page, "sort": "cited_by_count:desc", "select": select}
+    try:
+        # Each work is compacted as soon as it is parsed off the stream
+        return [compact_work(w) for w in client.stream_json_items(WORKS_URL, params=params, timeout=timeout_s)]
+    except Exception as e:
+        logger.error(f"OpenAlex works query failed: {e}")
+        return None
+
+
+class SharedWorksQuery:
+    """Lazily runs one OpenAlex /works query and shares the result between callers.
+
+    The first caller performs the request; concurrent callers block on the same
+    lock and reuse its answer, so each /generate costs a single round-trip.
+    """
+
+    def __init__(self, search: str, per_page: int = FUSED_PER_PAGE, client=None) -> None:
+        self.search = search
+        self.per_page = per_page
+        self.client = client
+        self.consumers = 0
+        self._lock = threading.Lock()
+        self._done = False
+        self._results: Optional[List[Work]] = None
+
+    def results(self) -> Optional[List[Work]]:
+        with self._lock:
+            self.consumers += 1
+            if not self._done:
+                self._results = fetch_top_works(self.search, self.per_page, client=self.client)
+                self._done = True
+            else:
+                logger.debug("Reusing fused OpenAlex works for '%s'", self.search)
+        return self._results
@@ -0,0 +1,205 @@
+"""
+Process-wide outbound rate limiting per upstream host.
+
+Each host gets a token bucket sized from the API's documented limits. Callers
+block in `acquire()` until a token is free, so requests are spaced only when we
+are actually near quota instead of sleeping unconditionally. A 429/503 with
+`Retry-After` pauses the whole host for that long.
+
+Two priority classes share each bucket: INTERACTIVE (/generate and other user
+traffic) is always served before BATCH (harvests, index builds). The current
+class is carried in a context variable so it follows work into executor threads.
+"""
+from __future__ import annotations
+
+import contextlib
+import contextvars
+import logging
+import os
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Iterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+INTERACTIVE = 0
+BATCH = 1
+_PRIORITY_NAMES = {INTERACTIVE: "interactive", BATCH: "batch"}
+
+# (requests per second, burst) from each API's published guidance
+DEFAULT_LIMITS: Dict[str, Tuple[float, int]] = {
+    # Polite pool: max 10 requests/second
+    "api.openalex.org": (10.0, 10),
+    # Unauthenticated and introductory API-key tiers: ~1 request/second
+    "api.semanticscholar.org": (1.0, 1),
+    # arXiv API terms: no more than one request every three seconds
+    "export.arxiv.org": (1 / 3, 1),
+}
+# Pause applied on 429 when the response carries no Retry-After
+DEFAULT_BACKOFF_S = 2.0
+# Longest Retry-After we honour; anything beyond is treated as this
+MAX_BACKOFF_S = 60.0
+
+_current_priority: contextvars.ContextVar[int] = contextvars.ContextVar("ls_request_priority", default=INTERACTIVE)
+
+
+class RateLimitTimeout(RuntimeError):
+    """Raised when no token for a host became available within the caller's timeout."""
+
+
+def current_priority() -> int:
+    return _current_priority.get()
+
+
+@contextlib.contextmanager
+def priority(level: int) -> Iterator[None]:
+    """Run the enclosed outbound calls at `level` (INTERACTIVE or BATCH)."""
+    token = _current_priority.set(level)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+def _limits_from_env() -> Dict[str, Tuple[float, int]]:
+    """Parse LS_RATE_LIMITS="host=rps[:burst],host=rps" overrides."""
+    limits = dict(DEFAULT_LIMITS)
+    for part in (os.getenv("LS_RATE_LIMITS") or "").split(","):
+        if "=" not in part:
+            continue
+        host, spec = part.split("=", 1)
+        rate, _, burst = spec.partition(":")
+        try:
+            limits[host.strip()] = (float(rate), int(burst or 1))
+        except ValueError:
+            logger.warning("Ignoring malformed LS_RATE_LIMITS entry: %s", part)
+    return limits
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP-date)."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except Exception:
+        return None
+
+
+class _HostBucket:
+    def __init__(self, rate: float, burst: int) -> None:
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.waiting = {INTERACTIVE: 0, BATCH: 0}
+        self.granted = {INTERACTIVE: 0, BATCH: 0}
+        self.waited_s = 0.0
+        self.throttled = 0
+
+    def refill(self, now: float) -> None:
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+
+class RateLimitScheduler:
+    """Token buckets per host with strict priority between request classes."""
+
+    def __init__(self, limits: Optional[Dict[str, Tuple[float, int]]] = None) -> None:
+        self._limits = limits if limits is not None else _limits_from_env()
+        self._buckets: Dict[str, _HostBucket] = {}
+        self._cond = threading.Condition()
+
+    def _bucket(self, host: str) -> Optional[_HostBucket]:
+        if host not in self._limits:
+            return None
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            bucket = self._buckets[host] = _HostBucket(*self._limits[host])
+        return bucket
+
+    def acquire(self, host: str, level: Optional[int] = None, timeout: Optional[float] = None) -> None:
+        """Block until a request to `host` may be sent; raise RateLimitTimeout after `timeout` s."""
+        level = current_priority() if level is None else level
+        start = time.monotonic()
+        with self._cond:
+            bucket = self._bucket(host)
+            if bucket is None:
+                return
+            bucket.waiting[level] += 1
+            try:
+                while True:
+                    now = time.monotonic()
+                    bucket.refill(now)
+                    higher_waiting = any(bucket.waiting[p] for p in bucket.waiting if p < level)
+                    if now >= bucket.blocked_until and bucket.tokens >= 1 and not higher_waiting:
+                        bucket.tokens -= 1
+                        bucket.granted[level] += 1
+                        bucket.waited_s += now - start
+                        return
+
+                    if now < bucket.blocked_until:
+                        wait_s = bucket.blocked_until - now
+                    elif bucket.tokens < 1:
+                        wait_s = (1 - bucket.tokens) / bucket.rate
+                    else:
+                        # A higher-priority caller is queued; it will notify us
+                        wait_s = 0.05
+                    if timeout is not None:
+                        remaining = timeout - (now - start)
+                        if remaining <= 0:
+                            raise RateLimitTimeout(f"No request slot for {host} within {timeout:.1f}s")
+                        wait_s = min(wait_s, remaining)
+                    self._cond.wait(wait_s)
+            finally:
+                bucket.waiting[level] -= 1
+                self._cond.notify_all()
+
+    def penalize(self, host: str, retry_after_s: Optional[float]) -> None:
+        """Pause all requests to `host` after the upstream signalled it is throttling us."""
+        delay = min(MAX_BACKOFF_S, retry_after_s if retry_after_s is not None else DEFAULT_BACKOFF_S)
+        with self._cond:
+            bucket = self._bucket(host)
+            if bucket is None:
+                return
+            bucket.throttled += 1
+            bucket.blocked_until = max(bucket.blocked_until, time.monotonic() + delay)
+            bucket.tokens = 0.0
+        logger.warning("Upstream %s is throttling; pausing requests for %.1fs", host, delay)
+
+    def stats(self) -> Dict[str, Dict[str, object]]:
+        with self._cond:
+            now = time.monotonic()
+            return {
+                host: {
+                    "rate_per_s": round(b.rate, 3),
+                    "burst": b.burst,
+                    "granted": {_PRIORITY_NAMES[p]: n for p, n in b.granted.items()},
+                    "waiting": {_PRIORITY_NAMES[p]: n for p, n in b.waiting.items()},
+                    "total_wait_s": round(b.waited_s, 2),
+                    "throttled": b.throttled,
+                    "paused_for_s": round(max(0.0, b.blocked_until - now), 2),
+                }
+                for host, b in self._buckets.items()
+            }
+
+
+_scheduler: Optional[RateLimitScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> RateLimitScheduler:
+    """Return the process-wide rate-limit scheduler."""
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = RateLimitScheduler()
+    return _scheduler
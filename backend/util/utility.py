@@ -6,27 +6,30 @@ import unicodedata
 root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 sys.path.append(root_dir)
 
-from typing import List
+from typing import TYPE_CHECKING, List
 
-from langchain_community.document_loaders import (
-    PyPDFLoader,
-    UnstructuredWordDocumentLoader,
-    TextLoader,
-    CSVLoader,
-    UnstructuredExcelLoader,
-)
-from langchain_core.documents import Document
+if TYPE_CHECKING:
+    from langchain_core.documents import Document
 
 
 class Utility:
     @staticmethod
-    def read_file_content(file_path: str) -> List[Document]:
+    def read_file_content(file_path: str) -> List["Document"]:
         """
         Reads and returns the content of a local file using LangChain loaders.
         If the file exists locally, it is used directly.
 
         Supported file types: .pdf, .docx, .txt, .csv, .xls, .xlsx.
         """
+        # langchain_community is slow to import; load it only when a file is read
+        from langchain_community.document_loaders import (
+            PyPDFLoader,
+            UnstructuredWordDocumentLoader,
+            TextLoader,
+            CSVLoader,
+            UnstructuredExcelLoader,
+        )
+        from langchain_core.documents import Document
 
         if file_path.startswith("/"):
             file_path = file_path.lstrip("/")
@@ -0,0 +1,144 @@
+"""
+Cross-provider venue aggregation for Phase 3.
+
+Providers report per-venue stats: how many of the papers they saw appeared in
+the venue, and those papers' summed citations. `VenueAggregator` merges name
+variants into one venue and accumulates both numbers across providers. A
+known catalog venue is matched by its canonical entry. Any other name is
+matched by its normalized form, with edition years and a leading
+"proceedings of" removed.
+
+Per-paper samples (the works mode, Semantic Scholar) are summed. A provider
+result marked "ranked" (OpenAlex group_by) instead reports source-level
+totals: global matching works, all-time citations, h-index. Those are not
+comparable with a 10-paper sample, so they are never added to the sums; the
+provider's order is kept, and its venues rank ahead of sample-only venues.
+
+`top(k)` picks each category's best k with a bounded heap (`heapq.nlargest`).
+That costs O(n log k), so ranking stays cheap as providers report thousands
+of works. Ties keep provider order: OpenAlex first, then Semantic Scholar.
+"""
+from __future__ import annotations
+
+import heapq
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from .catalog import lookup_venue, normalize_venue_name, strip_year
+
+_PROCEEDINGS = re.compile(r"^(?:proceedings|proc)(?: of)?(?: the)? ")
+
+# Sort keys per ranking mode (LS_VENUE_RANK): matching papers, citations or h-index
+_RANK_KEYS = {
+    "works": lambda v: (v.papers, v.citations),
+    "citations": lambda v: (v.citations, v.papers),
+    "h_index": lambda v: (v.h_index, v.papers, v.citations),
+}
+
+
+def variant_key(name: str) -> str:
+    """Key shared by spelling variants of one venue ("Proc. of the ICML 2024" ~ "ICML")."""
+    return _PROCEEDINGS.sub("", strip_year(normalize_venue_name(name)))
+
+
+@dataclass
+class VenueStats:
+    name: str
+    kind: str  # "conferences" | "journals"
+    papers: int = 0
+    citations: int = 0
+    h_index: int = 0
+    # Best position in a "ranked" provider result; None = only seen in samples
+    rank: Optional[int] = None
+    providers: Set[str] = field(default_factory=set)
+
+
+class VenueAggregator:
+    """Accumulates provider venue stats and ranks venues per category."""
+
+    def __init__(self, rank_by: str = "works") -> None:
+        sample_key = _RANK_KEYS.get(rank_by, _RANK_KEYS["works"])
+        # Provider-ranked venues first, in provider order; then sample counts
+        self.rank_key = lambda v: (v.rank is not None, -(v.rank or 0), sample_key(v))
+        self.venues: Dict[str, VenueStats] = {}
+        self._keys: Dict[Tuple[str, Optional[str]], Tuple[str, Optional[Dict[str, Any]]]] = {}
+
+    def _resolve(self, name: str, source_id: Optional[str]) -> Tuple[str, Optional[Dict[str, Any]]]:
+        """(aggregation key, catalog entry) for a reported venue, memoized per spelling."""
+        cache_key = (name, source_id)
+        resolved = self._keys.get(cache_key)
+        if resolved is None:
+            venue = lookup_venue(name, source_id)
+            key = f"catalog:{venue.get('id') or variant_key(venue['name'])}" if venue else variant_key(name)
+            resolved = self._keys[cache_key] = (key, venue)
+        return resolved
+
+    def add(
+        self,
+        name: str,
+        kind: str,
+        papers: int = 1,
+        citations: int = 0,
+        source_id: Optional[str] = None,
+        provider: Optional[str] = None,
+        rank: Optional[int] = None,
+        h_index: int = 0,
+    ) -> None:
+        """Count `papers` papers with `citations` summed citations for a venue.
+
+        With `rank` the venue is placed at that position of a provider's own
+        ranking instead; `papers` and `citations` are then not summed.
+        """
+        if not name:
+            return
+        key, venue = self._resolve(name, source_id)
+        if not key:
+            return
+        stats = self.venues.get(key)
+        if stats is None:
+            if venue is not None:
+                stats = VenueStats(venue["name"], venue["kind"], h_index=int(venue.get("h_index") or 0))
+            else:
+                stats = VenueStats(name, kind)
+            self.venues[key] = stats
+        if rank is not None:
+            stats.rank = rank if stats.rank is None else min(stats.rank, rank)
+        else:
+            stats.papers += int(papers or 0)
+            stats.citations += int(citations or 0)
+        stats.h_index = max(stats.h_index, int(h_index or 0))
+        if provider:
+            stats.providers.add(provider)
+
+    def add_result(self, result: Dict[str, Any], provider: Optional[str] = None) -> None:
+        """Add a provider's venue result.
+
+        Results carrying a "stats" list are added as-is, or by position when
+        the result is "ranked". Older cached results only have the ranked name
+        lists, so each name counts as one paper.
+        """
+        stats = result.get("stats")
+        if stats is not None:
+            ranked = bool(result.get("ranked"))
+            for i, s in enumerate(stats):
+                self.add(
+                    s.get("name"), s.get("kind"), s.get("papers", 1), s.get("citations", 0), s.get("id"), provider,
+                    rank=i if ranked else None, h_index=s.get("h_index", 0),
+                )
+            return
+        for kind in ("conferences", "journals"):
+            for name in result.get(kind) or []:
+                self.add(name, kind, provider=provider)
+
+    def ranked(self, k: int = 5) -> Dict[str, List[VenueStats]]:
+        """Top `k` venues per category, best first."""
+        by_kind: Dict[str, List[VenueStats]] = {"conferences": [], "journals": []}
+        for stats in self.venues.values():
+            by_kind.setdefault(stats.kind, []).append(stats)
+        return {kind: heapq.nlargest(k, venues, key=self.rank_key) for kind, venues in by_kind.items()}
+
+    def top(self, k: int = 5) -> Dict[str, List[str]]:
+        """Top `k` venue names per category: {"conferences": [...], "journals": [...]}."""
+        ranked = self.ranked(k)
+        return {"conferences": [v.name for v in ranked["conferences"]], "journals": [v.name for v in ranked["journals"]]}
@@ -0,0 +1,396 @@
+"""
+Persistent venue catalog: O(1) classification and ranking signals for venues.
+
+Venues are keyed by OpenAlex source id and by normalized name and aliases.
+Each entry carries a type, a conferences/journals kind, works count, h-index
+and citation count. The catalog is imported once from an OpenAlex `/sources`
+snapshot and/or the DBLP XML dump. It is stored as flat files that every
+worker memory-maps read-only:
+
+  meta.json                 counts, table size, format version
+  records.bin, records_off  venue records (JSON) + uint64 offsets
+  table_keys.bin            open-addressing hash table: uint64 key hashes
+  table_recs.bin            record number + 1 per slot (0 = empty)
+
+A lookup hashes the key, probes a few slots and decodes one record. Keys are
+64-bit BLAKE2b digests, which are stable across processes (unlike `hash()`).
+
+    python -m venue_discovery.catalog build CATALOG_DIR --openalex sources/ --dblp dblp.xml.gz
+    python -m venue_discovery.catalog lookup CATALOG_DIR "NeurIPS"
+"""
+from __future__ import annotations
+
+import argparse
+import functools
+import gzip
+import hashlib
+import html.entities
+import json
+import logging
+import mmap
+import os
+import re
+import sys
+import unicodedata
+import xml.etree.ElementTree as ET
+from array import array
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+if __package__ in (None, ""):
+    sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from literature.local_index import read_records, swap_into_place
+
+logger = logging.getLogger(__name__)
+
+Venue = Dict[str, Any]
+
+FORMAT_VERSION = 1
+_EMPTY = 0  # empty hash-table slot; tables are sized to stay at most half full
+
+_CONFERENCE_HINTS = ("conf", "proc", "symposium", "workshop", "icml", "neurips", "cvpr", "aaai")
+_PUNCT = re.compile(r"[^\w\s]")
+_YEAR = re.compile(r"\b(19|20)\d{2}\b")
+
+
+def normalize_venue_name(name: str) -> str:
+    """Case-, accent- and punctuation-insensitive venue key ("Proc. of the ACL '24" ~ "proc of the acl 24")."""
+    text = unicodedata.normalize("NFKD", name or "")
+    text = "".join(ch for ch in text if not unicodedata.combining(ch)).lower().replace("&", " and ")
+    text = _PUNCT.sub(" ", text)
+    return " ".join(text.split())
+
+
+def strip_year(key: str) -> str:
+    """Normalized name without edition years ("neurips 2023" -> "neurips")."""
+    return " ".join(_YEAR.sub("", key).split())
+
+
+def _key_hash(key: str) -> int:
+    # 0 marks empty slots, so it is remapped
+    return int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "little") or 1
+
+
+def _source_id(value: Any) -> str:
+    """Bare OpenAlex source id ("S4306420609") from an id or URL."""
+    return str(value or "").rsplit("/", 1)[-1]
+
+
+def heuristic_kind(name: str, source_type: Optional[str] = None) -> str:
+    """"conferences" or "journals" from an OpenAlex-style type and the name alone."""
+    v_type = (source_type or "").lower()
+    if "conference" in v_type or "proceeding" in v_type:
+        return "conferences"
+    if "journal" in v_type:
+        return "journals"
+    name_lower = (name or "").lower()
+    if any(x in name_lower for x in _CONFERENCE_HINTS):
+        return "conferences"
+    return "journals"
+
+
+# ---------- Import ----------
+
+def openalex_venues(records: Iterable[Dict[str, Any]]) -> Iterator[Venue]:
+    """Catalog entries from OpenAlex /sources objects (API pages or snapshot lines)."""
+    for source in records:
+        name = source.get("display_name")
+        if not name:
+            continue
+        stats = source.get("summary_stats") or {}
+        aliases = list(source.get("alternate_titles") or [])
+        if source.get("abbreviated_title"):
+            aliases.append(source["abbreviated_title"])
+        yield {
+            "id": _source_id(source.get("id")),
+            "name": name,
+            "type": source.get("type") or "",
+            "kind": heuristic_kind(name, source.get("type")),
+            "aliases": aliases,
+            "works_count": int(source.get("works_count") or 0),
+            "h_index": int(stats.get("h_index") or 0),
+            "cited_by_count": int(source.get("cited_by_count") or 0),
+        }
+
+
+def _openalex_files(path: Path) -> Iterator[Path]:
+    if path.is_dir():
+        yield from sorted(p for p in path.rglob("*") if p.is_file() and p.suffix in (".gz", ".jsonl", ".json"))
+    else:
+        yield path
+
+
+class _DblpTarget:
+    """ElementTree parser target counting DBLP venue streams without building the tree."""
+
+    _RECORDS = {"article": "journal", "inproceedings": "booktitle", "proceedings": "booktitle"}
+
+    def __init__(self) -> None:
+        self.names: Dict[str, Counter] = defaultdict(Counter)
+        self.works: Counter = Counter()
+        self._record: Optional[str] = None
+        self._stream: Optional[str] = None
+        self._field: Optional[str] = None
+        self._text: List[str] = []
+
+    def start(self, tag: str, attrs: Dict[str, str]) -> None:
+        if tag in self._RECORDS:
+            key = attrs.get("key", "")
+            parts = key.split("/")
+            # Streams are "conf/<venue>" and "journals/<venue>"
+            if len(parts) >= 3 and parts[0] in ("conf", "journals"):
+                self._record, self._stream = tag, "/".join(parts[:2])
+        elif self._record and tag == self._RECORDS[self._record]:
+            self._field, self._text = tag, []
+
+    def data(self, text: str) -> None:
+        if self._field:
+            self._text.append(text)
+
+    def end(self, tag: str) -> None:
+        if self._field == tag:
+            name = " ".join("".join(self._text).split())
+            if name:
+                self.names[self._stream][name] += 1
+            self._field = None
+        elif tag == self._record:
+            if tag != "proceedings":
+                self.works[self._stream] += 1
+            self._record = self._stream = None
+
+    def close(self) -> "_DblpTarget":
+        return self
+
+
+def dblp_venues(path: Path) -> Iterator[Venue]:
+    """Catalog entries from the DBLP XML dump (dblp.xml or dblp.xml.gz), streamed.
+
+    One entry per DBLP stream (conf/icml, journals/jmlr, ...), named after its
+    most common booktitle / journal, with the other spellings as aliases and
+    the number of papers as works_count. DBLP has no citation data.
+    """
+    target = _DblpTarget()
+    parser = ET.XMLParser(target=target)
+    # dblp.xml declares its character entities (&ouml; ...) in dblp.dtd, which
+    # expat does not load; undefined entities are resolved from this table
+    parser.entity.update({name: chr(cp) for name, cp in html.entities.name2codepoint.items()})
+    opener = gzip.open if path.name.endswith(".gz") else open
+    with opener(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            parser.feed(chunk)
+    parser.close()
+
+    for stream, names in target.names.items():
+        (name, _), *others = names.most_common()
+        yield {
+            "id": f"dblp:{stream}",
+            "name": name,
+            "type": "conference" if stream.startswith("conf/") else "journal",
+            "kind": "conferences" if stream.startswith("conf/") else "journals",
+            "aliases": [n for n, _ in others[:20]] + [strip_year(name)],
+            "works_count": target.works[stream],
+            "h_index": 0,
+            "cited_by_count": 0,
+        }
+
+
+def merge_venues(openalex: Iterable[Venue], dblp: Iterable[Venue]) -> List[Venue]:
+    """OpenAlex entries, with DBLP streams folded into the OpenAlex venue of the same name.
+
+    DBLP decides conference vs journal for matched venues, since OpenAlex
+    types many proceedings as "journal" or "book series".
+    """
+    venues: List[Venue] = []
+    by_name: Dict[str, int] = {}
+    for venue in openalex:
+        venues.append(venue)
+        for name in [venue["name"], *venue["aliases"]]:
+            by_name.setdefault(normalize_venue_name(name), len(venues) - 1)
+
+    for venue in dblp:
+        names = [venue["name"], *venue["aliases"]]
+        match = next((by_name[n] for n in map(normalize_venue_name, names) if n in by_name), None)
+        if match is None:
+            venues.append(venue)
+            continue
+        kept = venues[match]
+        kept["kind"] = venue["kind"]
+        kept["aliases"] = list(dict.fromkeys(kept["aliases"] + names))
+        kept["works_count"] = max(kept["works_count"], venue["works_count"])
+    return venues
+
+
+def build_catalog(venues: Iterable[Venue], out_dir: Path) -> Dict[str, Any]:
+    """Write `venues` as a memory-mappable catalog in `out_dir` (replaced atomically)."""
+    out_dir = Path(out_dir)
+    tmp_dir = out_dir.with_name(out_dir.name + ".building")
+    if tmp_dir.exists():
+        import shutil
+
+        shutil.rmtree(tmp_dir)
+    tmp_dir.mkdir(parents=True)
+
+    keys: Dict[int, int] = {}
+    offsets = array("Q", [0])
+    count = 0
+    with open(tmp_dir / "records.bin", "wb") as f:
+        for venue in venues:
+            names = [venue["name"], *venue.get("aliases", [])]
+            venue_keys = [f"id:{venue['id']}"] if venue.get("id") else []
+            venue_keys += [f"name:{n}" for n in dict.fromkeys(map(normalize_venue_name, names)) if n]
+            for key in venue_keys:
+                # First writer wins: OpenAlex entries come first and are the better-attested ones
+                keys.setdefault(_key_hash(key), count)
+            blob = json.dumps(venue, ensure_ascii=False).encode("utf-8")
+            f.write(blob)
+            offsets.append(offsets[-1] + len(blob))
+            count += 1
+    if not count:
+        raise ValueError("No venues to catalog")
+
+    slots = 1 << max(4, (2 * len(keys) - 1).bit_length())
+    table_keys = array("Q", bytes(8 * slots))
+    table_recs = array("I", bytes(4 * slots))
+    mask = slots - 1
+    for h, rec in keys.items():
+        slot = h & mask
+        while table_keys[slot] != _EMPTY:
+            slot = (slot + 1) & mask
+        table_keys[slot] = h
+        table_recs[slot] = rec + 1
+
+    for name, data in (("records_off.bin", offsets), ("table_keys.bin", table_keys), ("table_recs.bin", table_recs)):
+        with open(tmp_dir / name, "wb") as f:
+            data.tofile(f)
+    meta = {"version": FORMAT_VERSION, "byteorder": sys.byteorder, "venues": count, "keys": len(keys), "slots": slots}
+    (tmp_dir / "meta.json").write_text(json.dumps(meta, indent=2))
+    swap_into_place(tmp_dir, out_dir)
+    return meta
+
+
+# ---------- Lookup ----------
+
+class VenueCatalog:
+    """Read-only memory-mapped venue catalog."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self.meta = json.loads((self.path / "meta.json").read_text())
+        if self.meta.get("version") != FORMAT_VERSION or self.meta.get("byteorder") != sys.byteorder:
+            raise ValueError(f"Incompatible venue catalog at {self.path}; rebuild it")
+        self._maps: List[mmap.mmap] = []
+        self._records = self._map("records.bin")
+        self._records_off = memoryview(self._map("records_off.bin")).cast("Q")
+        self._keys = memoryview(self._map("table_keys.bin")).cast("Q")
+        self._recs = memoryview(self._map("table_recs.bin")).cast("I")
+        self._mask = int(self.meta["slots"]) - 1
+        self.venues = int(self.meta["venues"])
+
+    def _map(self, name: str) -> mmap.mmap:
+        with open(self.path / name, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._maps.append(mapped)
+        return mapped
+
+    def _get(self, key: str) -> Optional[Venue]:
+        h = _key_hash(key)
+        slot = h & self._mask
+        while True:
+            probe = self._keys[slot]
+            if probe == _EMPTY:
+                return None
+            if probe == h:
+                rec = self._recs[slot] - 1
+                return json.loads(self._records[self._records_off[rec]:self._records_off[rec + 1]])
+            slot = (slot + 1) & self._mask
+
+    def lookup(self, name: Optional[str] = None, source_id: Optional[str] = None) -> Optional[Venue]:
+        """Venue by OpenAlex source id (preferred) or by any normalized name / alias."""
+        if source_id:
+            venue = self._get(f"id:{_source_id(source_id)}")
+            if venue is not None:
+                return venue
+        if name:
+            key = normalize_venue_name(name)
+            venue = self._get(f"name:{key}")
+            if venue is None and _YEAR.search(key):
+                # "NeurIPS 2023" -> "NeurIPS"
+                venue = self._get(f"name:{strip_year(key)}")
+            return venue
+        return None
+
+    def close(self) -> None:
+        # Release memoryviews before their maps
+        for view in (self._records_off, self._keys, self._recs):
+            view.release()
+        for mapped in self._maps:
+            mapped.close()
+        self._maps.clear()
+
+
+@functools.lru_cache(maxsize=1)
+def get_catalog() -> Optional[VenueCatalog]:
+    """The catalog at LS_VENUE_CATALOG_DIR, opened once per process; None if unset or unusable."""
+    path = os.getenv("LS_VENUE_CATALOG_DIR")
+    if not path:
+        return None
+    try:
+        catalog = VenueCatalog(Path(path))
+    except Exception as e:
+        logger.warning("Venue catalog at %s unavailable: %s", path, e)
+        return None
+    logger.info("Venue catalog: %d venues", catalog.venues)
+    return catalog
+
+
+def lookup_venue(name: Optional[str] = None, source_id: Optional[str] = None) -> Optional[Venue]:
+    """Catalog entry for a venue, or None (also when no catalog is configured)."""
+    catalog = get_catalog()
+    return catalog.lookup(name, source_id) if catalog is not None else None
+
+
+def classify_venue(name: str, source_type: Optional[str] = None, source_id: Optional[str] = None) -> str:
+    """Return "conferences" or "journals": the catalog's answer when it knows the venue, else heuristics."""
+    venue = lookup_venue(name, source_id)
+    if venue is not None:
+        return venue["kind"]
+    return heuristic_kind(name, source_type)
+
+
+def venue_h_index(name: str, source_id: Optional[str] = None) -> int:
+    """Catalog h-index of a venue (0 when unknown)."""
+    venue = lookup_venue(name, source_id)
+    return int(venue.get("h_index") or 0) if venue is not None else 0
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Build or query the venue catalog")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="import OpenAlex sources and/or DBLP into CATALOG_DIR")
+    build.add_argument("catalog_dir", type=Path)
+    build.add_argument("--openalex", type=Path, nargs="*", default=[], help="/sources snapshot dirs or .jsonl[.gz] files")
+    build.add_argument("--dblp", type=Path, help="dblp.xml or dblp.xml.gz")
+    lookup = sub.add_parser("lookup", help="look a venue up by name or OpenAlex source id")
+    lookup.add_argument("catalog_dir", type=Path)
+    lookup.add_argument("name")
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        if not args.openalex and not args.dblp:
+            parser.error("give --openalex and/or --dblp")
+        openalex = openalex_venues(
+            record for path in args.openalex for file in _openalex_files(path) for record in read_records(file)
+        )
+        dblp = dblp_venues(args.dblp) if args.dblp else []
+        meta = build_catalog(merge_venues(openalex, dblp), args.catalog_dir)
+        print(f"Cataloged {meta['venues']} venues under {meta['keys']} keys into {args.catalog_dir}")
+    else:
+        catalog = VenueCatalog(args.catalog_dir)
+        venue = catalog.lookup(args.name, args.name if re.fullmatch(r"S\d+", args.name) else None)
+        print(json.dumps(venue, indent=2, ensure_ascii=False) if venue else "Not found")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,27 @@
-import requests
-import os
 import logging
+import os
 from pathlib import Path
+from typing import Dict, List, Optional
 from dotenv import load_dotenv
 
+from util.cache import cached
+from .catalog import classify_venue, get_catalog, venue_h_index
+from util.http_client import get_http_client
+from util.openalex_works import FUSED_PER_PAGE, VENUE_FIELDS, WORKS_URL, fetch_top_works
+
 # Setup Logging
 logger = logging.getLogger(__name__)
 
+SOURCES_URL = "https://api.openalex.org/sources"
+# "works": classify sources of the top-cited works (shares the fused /works query);
+# "group_by": let OpenAlex count matching works per source
+VENUE_MODE = os.getenv("LS_VENUE_MODE", "works").strip().lower()
+# group_by ranking: "works" (matching works per source), "citations" (source total)
+# or "h_index" (source h-index)
+VENUE_RANK = os.getenv("LS_VENUE_RANK", "works").strip().lower()
+# Sources with the most matching works looked up in /sources (one batched request)
+GROUP_CANDIDATES = 40
+
 # --- Load Environment Variables ---
 # Explicitly look for the .env file in the backend folder
 # (Assuming this file is in backend/venue_discovery/)
@@ -16,86 +31,160 @@ if env_path.exists():
     load_dotenv(dotenv_path=env_path)
     # logger.info("OpenAlex Provider: .env loaded successfully.")
 
-def search_venues_openalex(domain: str):
+def search_venues_openalex(domain: str, client=None, works=None, mode: Optional[str] = None, rank_by: Optional[str] = None):
     """
     Fetches venues from OpenAlex by searching for WORKS (Papers) first,
     then extracting the journals/conferences they appear in.
+
+    `works` is an optional util.openalex_works.SharedWorksQuery; when given, the
+    /works response it already fetched for this request is reused instead of
+    issuing a second, near-identical query. `client` defaults to the shared
+    pooled HTTP client (util.http_client).
+
+    `mode="group_by"` (default from LS_VENUE_MODE) lets OpenAlex aggregate
+    sources server-side instead (see `search_venues_grouped`), ranked by
+    `rank_by` ("works" or "citations", default from LS_VENUE_RANK).
     """
-    # Use /works to find papers about the topic
-    url = "https://api.openalex.org/works"
-    
-    # 1. Get Email from loaded .env
-    email = os.getenv("EMAIL")
-    
-    # 2. Prepare Parameters
-    params = {
-        "search": domain,
-        "per_page": 60, # Fetch 60 impactful papers to get a good mix of venues
-        "sort": "cited_by_count:desc" # Sort by impact to get top-tier venues
-    }
-    
-    # 3. Add Email for Polite Pool (Speed Boost) if it exists
-    if email:
-        params["mailto"] = email
+    if (mode or VENUE_MODE) == "group_by":
+        return search_venues_grouped(domain, rank_by=rank_by or VENUE_RANK, client=client)
+
+    # Use /works to find papers about the topic: 60 impactful papers (sorted by
+    # impact to get top-tier venues) give a good mix of venues. The shared client
+    # adds the polite-pool 'mailto' param from EMAIL in .env (Speed Boost).
+    if works is not None:
+        results = works.results()
     else:
-        logger.warning("OpenAlex: No EMAIL found in .env. Running in slow mode.")
-    
-    # Header user-agent is good practice, but 'mailto' param is the critical one for OpenAlex
-    headers = {}
-    if email:
-        headers["User-Agent"] = f"LiteratureSurveyor/1.0 (mailto:{email})"
-    
-    venues = {"conferences": [], "journals": []}
-    seen_names = set()
-    
-    try:
-        response = requests.get(url, params=params, headers=headers, timeout=10)
-        response.raise_for_status()
-        data = response.json()
-        
-        results = data.get("results", [])
-        
-        for item in results:
-            # Extract the Venue (Source) from the paper metadata
-            primary_loc = item.get("primary_location") or {}
-            source = primary_loc.get("source")
-            
-            if not source:
-                continue
-                
-            name = source.get("display_name")
-            
-            # Deduplicate
-            if not name or name in seen_names: 
-                continue
-                
-            seen_names.add(name)
-            
-            # Classify as Conference or Journal
-            v_type = (source.get("type") or "").lower()
-            
-            if "conference" in v_type or "proceeding" in v_type:
-                venues["conferences"].append(name)
-            elif "journal" in v_type:
-                venues["journals"].append(name)
-            else:
-                # Fallback heuristics based on name
-                name_lower = name.lower()
-                if any(x in name_lower for x in ["conf", "proc", "symposium", "workshop", "icml", "neurips", "cvpr"]):
-                    venues["conferences"].append(name)
-                else:
-                    # Default others to journals
-                    venues["journals"].append(name)
-        
-        # Limit to top 5 unique results per category
-        venues["conferences"] = venues["conferences"][:5]
-        venues["journals"] = venues["journals"][:5]
-                    
-        return venues
+        # Venue classification only reads primary_location
+        results = fetch_top_works(domain, per_page=FUSED_PER_PAGE, client=client, select=VENUE_FIELDS)
 
+    if results is None:
+        return None
+
+    try:
+        return extract_venues(results)
     except Exception as e:
         logger.error(f"OpenAlex Venue Error: {e}")
         return None
+
+
+@cached("openalex", "works.group_by.source.ranked")
+def search_venues_grouped(domain: str, rank_by: str = "works", client=None) -> Optional[Dict[str, List[str]]]:
+    """
+    Venue discovery with the aggregation done by OpenAlex: one
+    /works?search=...&group_by=primary_location.source.id request returns each
+    source's number of matching works, and one batched /sources lookup supplies
+    their names, types and citation totals.
+
+    Venues are ranked by matching works (`rank_by="works"`), the source's total
+    citations (`rank_by="citations"`) or its h-index (`rank_by="h_index"`)
+    among the GROUP_CANDIDATES sources with the most matching works. "stats"
+    carries each source's matching works, total citations and h-index in that
+    order. Returns None on failure.
+    """
+    domain = (domain or "").strip()
+    if not domain:
+        return {"conferences": [], "journals": []}
+
+    client = client or get_http_client()
+    try:
+        resp = client.get(WORKS_URL, params={"search": domain, "group_by": "primary_location.source.id"}, timeout=10)
+        resp.raise_for_status()
+        groups = resp.json().get("group_by") or []
+
+        counts: Dict[str, int] = {}
+        for group in groups:
+            key = (group.get("key") or "").rsplit("/", 1)[-1]
+            # Works without a source are grouped under "unknown"
+            if key.startswith("S"):
+                counts[key] = int(group.get("count") or 0)
+            if len(counts) >= GROUP_CANDIDATES:
+                break
+        if not counts:
+            return {"conferences": [], "journals": []}
+
+        resp = client.get(
+            SOURCES_URL,
+            params={
+                "filter": "openalex_id:" + "|".join(counts),
+                "per_page": len(counts),
+                "select": "id,display_name,type,cited_by_count,summary_stats",
+            },
+            timeout=10,
+        )
+        resp.raise_for_status()
+        sources = resp.json().get("results") or []
+    except Exception as e:
+        logger.error(f"OpenAlex grouped venue query failed: {e}")
+        return None
+
+    def score(source) -> int:
+        if rank_by == "citations":
+            return int(source.get("cited_by_count") or 0)
+        if rank_by == "h_index":
+            return int((source.get("summary_stats") or {}).get("h_index") or 0)
+        return counts.get((source.get("id") or "").rsplit("/", 1)[-1], 0)
+
+    # "ranked": the stats are source-level totals in this ranking's order, not
+    # per-paper samples, so the aggregator keeps the order instead of summing them
+    venues = {"conferences": [], "journals": [], "stats": [], "ranked": True}
+    for source in sorted(sources, key=score, reverse=True):
+        name = source.get("display_name")
+        if name and name not in venues["conferences"] and name not in venues["journals"]:
+            kind = classify_venue(name, source.get("type"), source.get("id"))
+            venues[kind].append(name)
+            venues["stats"].append({
+                "name": name, "kind": kind, "id": source.get("id"),
+                "papers": counts.get((source.get("id") or "").rsplit("/", 1)[-1], 0),
+                "citations": int(source.get("cited_by_count") or 0),
+                "h_index": int((source.get("summary_stats") or {}).get("h_index") or 0),
+            })
+
+    venues["conferences"] = venues["conferences"][:5]
+    venues["journals"] = venues["journals"][:5]
+    return venues
+
+
+def extract_venues(results):
+    """Classify the primary-location sources of OpenAlex works into conferences / journals.
+
+    Venues keep the order of the (citation-sorted) works; with a venue catalog
+    configured they are ranked by catalog h-index instead, unknown venues last.
+    "stats" has every venue's paper count and summed citations for
+    venue_discovery.aggregate.
+    """
+    venues = {"conferences": [], "journals": []}
+    stats = {}
+
+    for item in results:
+        # Extract the Venue (Source) from the paper metadata
+        primary_loc = item.get("primary_location") or {}
+        source = primary_loc.get("source")
+        
+        if not source:
+            continue
+            
+        name = source.get("display_name")
+        if not name:
+            continue
+
+        entry = stats.get(name)
+        if entry is None:
+            # Classify as Conference or Journal (venue catalog first, then heuristics)
+            kind = classify_venue(name, source.get("type"), source.get("id"))
+            entry = stats[name] = {"name": name, "kind": kind, "id": source.get("id"), "papers": 0, "citations": 0}
+            venues[kind].append(name)
+        entry["papers"] += 1
+        entry["citations"] += int(item.get("cited_by_count") or 0)
+
+    if get_catalog() is not None:
+        for kind in venues:
+            venues[kind].sort(key=lambda n: venue_h_index(n, stats[n]["id"]), reverse=True)
+    
+    # Limit to top 5 unique results per category
+    venues["conferences"] = venues["conferences"][:5]
+    venues["journals"] = venues["journals"][:5]
+    venues["stats"] = list(stats.values())
+    return venues
     
     # --- TEST BLOCK (Add this to the end of the file) ---
 if __name__ == "__main__":
@@ -1,30 +1,37 @@
-import requests
-import time
 import logging
 
+from util.cache import cached
+from util.http_client import get_http_client
+from .catalog import classify_venue
+
 logger = logging.getLogger(__name__)
 
-def search_venues_s2(domain: str):
+@cached("semantic_scholar", "paper.search.venues")
+def search_venues_s2(domain: str, client=None):
     """
     Fetches venues by searching recent papers in Semantic Scholar.
-    Returns: {"conferences": [], "journals": []} or None on error.
+    Returns: {"conferences": [], "journals": [], "stats": [...]} or None on error,
+    where "stats" has each venue's paper count and summed citations.
+
+    `client` defaults to the shared pooled HTTP client (util.http_client).
     """
+    client = client or get_http_client()
     # S2 doesn't have a direct venue search, so we search papers and extract venues
     url = "https://api.semanticscholar.org/graph/v1/paper/search"
     params = {
         "query": domain,
         "limit": 10,
-        "fields": "venue,publicationVenue"
+        "fields": "venue,publicationVenue,citationCount"
     }
     
-    venues = {"conferences": [], "journals": []}
+    venues = {"conferences": [], "journals": [], "stats": []}
     
     try:
-        # 1-second delay to respect unauthenticated rate limits
-        time.sleep(1) 
-        
-        response = requests.get(url, params=params, timeout=5)
+        # Pacing against S2's rate limit is handled by the shared client's
+        # per-host scheduler (util.rate_limit), coordinated with literature/ calls
+        response = client.get(url, params=params, timeout=5)
         if response.status_code == 429:
+            # The scheduler has already paused S2 traffic per Retry-After
             logger.warning("Semantic Scholar Rate Limit hit.")
             return None
             
@@ -32,7 +39,7 @@ def search_venues_s2(domain: str):
         data = response.json()
         
         paper_list = data.get("data", [])
-        seen_names = set()
+        stats = {}
 
         for paper in paper_list:
             # Try to get the full venue object first, then the simple string
@@ -42,19 +49,20 @@ def search_venues_s2(domain: str):
             # Prefer the detailed object name
             final_name = pub_venue.get("name") if pub_venue else venue_name
             
-            if not final_name or final_name in seen_names:
+            if not final_name:
                 continue
-                
-            seen_names.add(final_name)
-            
-            # Simple heuristic to classify
-            name_lower = final_name.lower()
-            if any(x in name_lower for x in ["conference", "symposium", "workshop", "proc", "cvpr", "icml", "neurips", "aaai"]):
-                venues["conferences"].append(final_name)
-            else:
-                # Default to journal/other
-                venues["journals"].append(final_name)
 
+            entry = stats.get(final_name)
+            if entry is None:
+                # Venue catalog first, then S2's venue type / name heuristics
+                venue_type = pub_venue.get("type") if pub_venue else None
+                kind = classify_venue(final_name, venue_type)
+                entry = stats[final_name] = {"name": final_name, "kind": kind, "papers": 0, "citations": 0}
+                venues[kind].append(final_name)
+            entry["papers"] += 1
+            entry["citations"] += int(paper.get("citationCount") or 0)
+
+        venues["stats"] = list(stats.values())
         return venues
 
     except Exception as e:
@@ -1,55 +1,56 @@
 from .mock_data import get_mock_venues
-from .openalex_provider import search_venues_openalex
+from .aggregate import VenueAggregator
+from .openalex_provider import VENUE_RANK, search_venues_openalex
 from .semantic_scholar import search_venues_s2
+from util.concurrency import run_parallel
 import logging
 
 logger = logging.getLogger(__name__)
 
-def discover_venues(domain: str):
+def discover_venues(domain: str, works=None, mode=None, rank_by=None):
     """
-    Phase 3 Main Logic:
-    1. Query OpenAlex
-    2. Query Semantic Scholar
-    3. Merge & Deduplicate
-    4. Fallback to Mock Data if needed
+    Phase 3 Main Logic (`works`: optional util.openalex_works.SharedWorksQuery
+    whose OpenAlex response is shared with literature retrieval; `mode` /
+    `rank_by` select OpenAlex's venue strategy, see search_venues_openalex):
+    1. Query OpenAlex and Semantic Scholar concurrently
+    2. Aggregate per-venue paper counts and citations across providers, merging
+       name variants, and keep the top 5 per category (see aggregate.py;
+       ranked by `rank_by`, default LS_VENUE_RANK)
+    3. Fallback to Mock Data if needed
     """
     logger.info(f" Phase 3: Discovering venues for '{domain}'...")
-    
-    combined_venues = {
-        "conferences": set(),
-        "journals": set()
-    }
-    
+
+    aggregator = VenueAggregator(rank_by or VENUE_RANK)
     providers_successful = False
 
-    # --- Step 1: Query OpenAlex ---
-    oa_data = search_venues_openalex(domain)
-    if oa_data:
-        # Check if we actually got results
-        if oa_data["conferences"] or oa_data["journals"]:
-            providers_successful = True
-            combined_venues["conferences"].update(oa_data["conferences"])
-            combined_venues["journals"].update(oa_data["journals"])
+    # --- Step 1: Query OpenAlex and Semantic Scholar in parallel ---
+    # The two lookups are independent, so latency is the slower of the two.
+    timings = {}
+    results = run_parallel(
+        {
+            "openalex": lambda: search_venues_openalex(domain, works=works, mode=mode, rank_by=rank_by),
+            "semantic_scholar": lambda: search_venues_s2(domain),
+        },
+        timings=timings,
+    )
+    logger.info(f" Phase 3 provider timings (ms): {timings}")
 
-    # --- Step 2: Query Semantic Scholar ---
-    s2_data = search_venues_s2(domain)
-    if s2_data:
-        if s2_data["conferences"] or s2_data["journals"]:
+    # OpenAlex first, so it wins ties
+    for provider in ("openalex", "semantic_scholar"):
+        data = results.get(provider)
+        # Check if we actually got results
+        if data and (data["conferences"] or data["journals"]):
             providers_successful = True
-            combined_venues["conferences"].update(s2_data["conferences"])
-            combined_venues["journals"].update(s2_data["journals"])
+            aggregator.add_result(data, provider)
 
-    # --- Step 3: Merge & Format ---
-    final_result = {
-        "conferences": sorted(list(combined_venues["conferences"]))[:5], # Top 5
-        "journals": sorted(list(combined_venues["journals"]))[:5]        # Top 5
-    }
+    # --- Step 2: Rank & Format ---
+    final_result = aggregator.top(5)
 
-    # --- Step 4: Fallback ---
+    # --- Step 3: Fallback ---
     # If no APIs worked or results are empty, use mock data
     if not providers_successful or (not final_result["conferences"] and not final_result["journals"]):
         logger.warning(" APIs failed or returned no venues. Using Mock Data.")
         return get_mock_venues(domain)
 
     logger.info(f" Found {len(final_result['conferences'])} conferences and {len(final_result['journals'])} journals.")
-    return final_result
\ No newline at end of file
+    return final_result